@@ -1,49 +1,28 @@
 from fastapi import FastAPI, UploadFile, Form
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import Response, StreamingResponse, JSONResponse
 from typing import Optional
 from io import BytesIO
 from datetime import datetime, timezone
-import hashlib
-import json
 import mimetypes
 
-from pypdf import PdfReader, PdfWriter
-from PIL import Image, PngImagePlugin
+from digitalmeve.canonical import canonical_bytes
+from digitalmeve.embedding_pdf import embed_proof_pdf_bytes
+from digitalmeve.embedding_png import embed_proof_png_bytes
+from digitalmeve.hashing import DEFAULT_ALGORITHM, algorithms, new_hasher
 
 app = FastAPI()
 
 # ---------- Helpers ----------
 
 
-def sha256_hex(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
+def digest_hex(b: bytes, alg: str = DEFAULT_ALGORITHM) -> str:
+    return new_hasher(alg, b).hexdigest()
 
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def stringify_canonical(obj) -> str:
-    # JSON canonique simple (clés triées)
-    def _canon(o):
-        if o is None or isinstance(o, (int, float, bool, str)):
-            return json.dumps(o, separators=(",", ":"), ensure_ascii=False)
-        if isinstance(o, list):
-            return "[" + ",".join(_canon(x) for x in o) + "]"
-        if isinstance(o, dict):
-            keys = sorted(o.keys())
-            return (
-                "{"
-                + ",".join(
-                    json.dumps(k, ensure_ascii=False) + ":" + _canon(o[k]) for k in keys
-                )
-                + "}"
-            )
-        raise TypeError("Unsupported type")
-
-    return _canon(obj)
-
-
 def clean_none(d):
     if isinstance(d, dict):
         return {k: clean_none(v) for k, v in d.items() if v is not None}
@@ -56,19 +35,25 @@ def build_proof(
     name: Optional[str],
     mime: Optional[str],
     size: int,
-    sha256: str,
+    digest: str,
     issuer_identity: Optional[str],
+    hash_alg: str = DEFAULT_ALGORITHM,
 ):
+    doc = {
+        "name": name or None,
+        "mime": mime or None,
+        "size": size,
+        # "preview_b64": "...",  # optionnel
+    }
+    if hash_alg == DEFAULT_ALGORITHM:
+        doc["sha256"] = digest
+    else:
+        doc["hash_alg"] = hash_alg
+        doc["digest"] = digest
     proof = {
         "version": "meve/1",
         "created_at": now_iso(),
-        "doc": {
-            "name": name or None,
-            "mime": mime or None,
-            "size": size,
-            "sha256": sha256,
-            # "preview_b64": "...",  # optionnel
-        },
+        "doc": doc,
         "issuer": {
             "name": "DigitalMeve",
             "identity": issuer_identity or None,
@@ -99,30 +84,13 @@ def infer_ext_and_mime(
 # ---------- Embedding ----------
 
 
-def embed_in_pdf(src: bytes, proof_json: str) -> bytes:
-    reader = PdfReader(BytesIO(src))
-    writer = PdfWriter()
-    for page in reader.pages:
-        writer.add_page(page)
-    # métadonnée personnalisée /MeveProof
-    meta = reader.metadata or {}
-    meta = {
-        **{k: v for k, v in meta.items() if isinstance(k, str)},
-        "/MeveProof": proof_json,
-    }
-    writer.add_metadata(meta)
-    out = BytesIO()
-    writer.write(out)
-    return out.getvalue()
+def embed_in_pdf(src: bytes, proof: dict) -> bytes:
+    # mise à jour incrémentale /MeveProof (moteur de la bibliothèque)
+    return embed_proof_pdf_bytes(src, proof)
 
 
-def embed_in_png(src: bytes, proof_json: str) -> bytes:
-    with Image.open(BytesIO(src)) as im:
-        meta = PngImagePlugin.PngInfo()
-        meta.add_itxt("meve_proof", proof_json, lang="", tkey="meve_proof")
-        out = BytesIO()
-        im.save(out, format="PNG", pnginfo=meta)
-        return out.getvalue()
+def embed_in_png(src: bytes, proof: dict) -> bytes:
+    return embed_proof_png_bytes(src, proof)
 
 
 # ---------- Endpoints ----------
@@ -140,19 +108,25 @@ async def generate(
     also_json: Optional[str] = Form(
         None
     ),  # "1" si l'appelant veut explicitement un sidecar
+    hash_alg: Optional[str] = Form(None),
 ):
+    alg = hash_alg or DEFAULT_ALGORITHM
+    if alg not in algorithms():
+        return JSONResponse(
+            status_code=400,
+            content={"ok": False, "error": "Unsupported hash algorithm"},
+        )
     src_bytes = await file.read()
     size = len(src_bytes)
     ext, mime0 = infer_ext_and_mime(file.filename, file.content_type)
-    sha = sha256_hex(src_bytes)
+    digest = digest_hex(src_bytes, alg)
 
-    proof_obj = build_proof(file.filename, mime0, size, sha, issuer)
-    proof_json = stringify_canonical(proof_obj)
+    proof_obj = build_proof(file.filename, mime0, size, digest, issuer, alg)
 
     # 1) Si output "binaire intégré" possible -> renvoyer name.meve.ext
     try:
         if ext == "pdf" or mime0 == "application/pdf":
-            out_bytes = embed_in_pdf(src_bytes, proof_json)
+            out_bytes = embed_in_pdf(src_bytes, proof_obj)
             out_mime = "application/pdf"
             out_name = f"{file.filename.rsplit('.',1)[0]}.meve.pdf"
             return StreamingResponse(
@@ -161,7 +135,7 @@ async def generate(
                 headers={"Content-Disposition": f'attachment; filename="{out_name}"'},
             )
         if ext == "png" or mime0 == "image/png":
-            out_bytes = embed_in_png(src_bytes, proof_json)
+            out_bytes = embed_in_png(src_bytes, proof_obj)
             out_mime = "image/png"
             out_name = f"{file.filename.rsplit('.',1)[0]}.meve.png"
             return StreamingResponse(
@@ -174,4 +148,8 @@ async def generate(
         pass
 
     # 2) Fallback / ou output sidecar explicite : renvoie le JSON de preuve
-    return JSONResponse(content={"ok": True, "proof": json.loads(proof_json)})
+    # (JSON canonique encodé une seule fois, sans aller-retour loads/dumps)
+    return Response(
+        content=canonical_bytes({"ok": True, "proof": proof_obj}),
+        media_type="application/json",
+    )
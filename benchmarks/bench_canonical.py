@@ -0,0 +1,66 @@
+"""
+Micro-benchmark : encodeur canonique partagé vs ancienne version récursive
+de `api/app.py:stringify_canonical` (un `json.dumps` par clé et par scalaire).
+
+    python benchmarks/bench_canonical.py [--number N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+from digitalmeve.canonical import canonical_json
+
+
+def recursive_canonical(obj) -> str:
+    # Copie de l'implémentation historique, pour comparaison
+    def _canon(o):
+        if o is None or isinstance(o, (int, float, bool, str)):
+            return json.dumps(o, separators=(",", ":"), ensure_ascii=False)
+        if isinstance(o, list):
+            return "[" + ",".join(_canon(x) for x in o) + "]"
+        if isinstance(o, dict):
+            keys = sorted(o.keys())
+            items = (
+                json.dumps(k, ensure_ascii=False) + ":" + _canon(o[k]) for k in keys
+            )
+            return "{" + ",".join(items) + "}"
+        raise TypeError("Unsupported type")
+
+    return _canon(obj)
+
+
+SAMPLE = {
+    "meve_version": "1.0",
+    "issuer": "Société Générale — Back-office",
+    "issued_at": "2025-01-01T12:00:00Z",
+    "timestamp": "2025-01-01T12:00:00Z",
+    "metadata": {"tags": ["contrat", "signé", "2025"], "pages": 12, "ratio": 0.75},
+    "subject": {
+        "filename": "contrat-été.pdf",
+        "size": 1234567,
+        "hash_sha256": "ab" * 32,
+    },
+    "hash": "ab" * 32,
+    "preview_b64": "JVBERi0xLjcKJeLjz9MK" * 8,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    assert canonical_json(SAMPLE) == recursive_canonical(SAMPLE)
+    old = timeit.timeit(lambda: recursive_canonical(SAMPLE), number=args.number)
+    new = timeit.timeit(lambda: canonical_json(SAMPLE), number=args.number)
+    per = 1e6 / args.number
+    print(f"recursive : {old * per:8.2f} µs/proof")
+    print(f"canonical : {new * per:8.2f} µs/proof")
+    print(f"speed-up  : {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
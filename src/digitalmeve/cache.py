@@ -0,0 +1,176 @@
+"""
+digitalmeve.cache
+
+Cache persistant des empreintes, indexé par (device, inode, size, mtime_ns).
+Un fichier inchangé depuis le dernier calcul est servi sans relire son
+contenu : seul un `stat` est nécessaire.
+
+- stockage : SQLite sous $XDG_CACHE_HOME/digitalmeve (défaut ~/.cache)
+- taille bornée, éviction LRU
+- désactivable : DIGITALMEVE_NO_CACHE=1 ou `use_cache=False`
+- le cache ne doit jamais faire échouer une génération : toute erreur
+  SQLite désactive silencieusement le cache pour le processus
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+__all__ = ["DigestCache", "cache_dir", "default_cache"]
+
+logger = logging.getLogger("digitalmeve.cache")
+
+_DB_NAME = "digests.sqlite3"
+_MAX_ENTRIES = 200_000
+_EVICT_EVERY = 256
+# Fichiers modifiés il y a moins de 2 s : mtime pas encore fiable
+# (même seconde/tick que l'écriture en cours) -> jamais mis en cache
+_RACY_WINDOW_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algo TEXT NOT NULL,
+    hexdigest TEXT NOT NULL,
+    preview BLOB NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns, algo)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS digests_used ON digests (used);
+"""
+
+
+def cache_dir() -> Path:
+    """Répertoire de cache XDG de digitalmeve."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(base) / "digitalmeve"
+
+
+def _i64(value: int) -> int:
+    # SQLite stocke des entiers signés 64 bits (inodes/devices non signés)
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _key(st: os.stat_result, algo: str) -> tuple:
+    return (_i64(st.st_dev), _i64(st.st_ino), st.st_size, st.st_mtime_ns, algo)
+
+
+class DigestCache:
+    """Cache (stat -> empreinte, aperçu) sur disque, sûr entre threads."""
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_entries: int = _MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path) if path is not None else cache_dir() / _DB_NAME
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5.0, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, st: os.stat_result, algo: str) -> Optional[Tuple[str, bytes]]:
+        key = _key(st, algo)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT hexdigest, preview FROM digests WHERE dev=? AND ino=?"
+                " AND size=? AND mtime_ns=? AND algo=?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE digests SET used=? WHERE dev=? AND ino=? AND size=?"
+                " AND mtime_ns=? AND algo=?",
+                (time.time_ns(), *key),
+            )
+        return row[0], bytes(row[1])
+
+    def put(
+        self, st: os.stat_result, algo: str, hexdigest: str, preview: bytes
+    ) -> bool:
+        """Enregistre une empreinte ; False si le fichier est trop récent."""
+        now = time.time_ns()
+        if now - st.st_mtime_ns < _RACY_WINDOW_NS:
+            return False
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*_key(st, algo), hexdigest, preview, now),
+            )
+            self._puts += 1
+            if self._puts % _EVICT_EVERY == 0:
+                self._evict()
+        return True
+
+    def _evict(self) -> None:
+        # Conserve les `max_entries` entrées les plus récemment utilisées
+        self._conn.execute(
+            "DELETE FROM digests WHERE used < (SELECT used FROM digests"
+            " ORDER BY used DESC LIMIT 1 OFFSET ?)",
+            (self.max_entries - 1,),
+        )
+
+    def evict(self) -> None:
+        with self._lock:
+            self._evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM digests").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default: Optional[DigestCache] = None
+_default_pid: Optional[int] = None
+_default_lock = threading.Lock()
+_disabled = False
+
+
+def default_cache() -> Optional[DigestCache]:
+    """
+    Cache partagé du processus, ou None si désactivé/indisponible.
+    Rouvert après un fork (une connexion SQLite ne se partage pas).
+    """
+    global _default, _default_pid, _disabled
+    if _disabled or os.environ.get("DIGITALMEVE_NO_CACHE"):
+        return None
+    pid = os.getpid()
+    if _default is not None and _default_pid == pid:
+        return _default
+    with _default_lock:
+        if _default is None or _default_pid != pid:
+            try:
+                _default = DigestCache()
+                _default_pid = pid
+            except (OSError, sqlite3.Error) as e:
+                logger.debug("digest cache unavailable: %s", e)
+                _disabled = True
+                return None
+    return _default
+
+
+def disable_default_cache() -> None:
+    """Désactive le cache partagé après une erreur (jusqu'à la fin du processus)."""
+    global _disabled
+    _disabled = True
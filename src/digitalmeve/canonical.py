@@ -0,0 +1,38 @@
+"""
+digitalmeve.canonical
+
+Encodeur JSON canonique partagé (bibliothèque, API, embarquement) :
+  - clés triées, séparateurs fixes « , » et « : », aucun espace ;
+  - UTF-8 non échappé (`ensure_ascii=False`) ;
+  - nombres au format `repr` de Python (déterministe), NaN/Infinity refusés.
+
+Un seul encodeur préconfiguré est réutilisé : chaque appel est une unique
+passe de l'accélérateur C du module `json`, sans recréer d'encodeur.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+__all__ = ["canonical_bytes", "canonical_json"]
+
+_ENCODER = json.JSONEncoder(
+    ensure_ascii=False,
+    allow_nan=False,
+    sort_keys=True,
+    separators=(",", ":"),
+)
+
+
+def canonical_json(obj: Any) -> str:
+    """
+    JSON canonique de `obj` (str).
+    ValueError pour NaN/Infinity, TypeError pour un type non sérialisable.
+    """
+    return _ENCODER.encode(obj)
+
+
+def canonical_bytes(obj: Any) -> bytes:
+    """`canonical_json(obj)` encodé en UTF-8."""
+    return _ENCODER.encode(obj).encode("utf-8")
@@ -3,15 +3,24 @@ from __future__ import annotations
 import json
 import logging
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import click
-
-from .embedding_pdf import embed_proof_pdf, extract_proof_pdf
-from .embedding_png import embed_proof_png, extract_proof_png
-from .generator import generate_meve
-from .verifier import verify_meve
+from click.core import ParameterSource
+
+from .canonical import canonical_bytes
+from .formats import extract_embedded
+from .generator import generate_many, generate_meve_stream, prove_file
+from .hashing import DEFAULT_ALGORITHM, DEFAULT_CHUNK_SIZE, algorithms
+from .ledger import Ledgers
+from .ledger import lookup as ledger_lookup
+from .sidecars import DEFAULT_SIDECAR_POLICY, SIDECAR_POLICIES, sidecar_candidates
+from .utils import iter_files, iter_files_relative
+from .verifier import verify_file, verify_many
+from .watch import BACKENDS as WATCH_BACKENDS
+from .watch import watch
 
 # --------------------------------------------------------------------------- #
 # Logging
@@ -41,106 +50,6 @@ def _read_json_file(path: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _sidecar_candidates(path: Path) -> list[Path]:
-    """
-    Conventions testées, dans l'ordre :
-      A) file.ext.meve.json
-      B) file.meve.json
-      C) <str(path)>.meve.json
-      D) path.parent / (path.name + ".meve.json")
-      E) path.parent / (path.stem + ".meve.json")
-    """
-    cands: list[Path] = []
-    try:
-        cands.append(path.with_suffix(path.suffix + ".meve.json"))
-    except Exception as e:
-        logger.debug(
-            "with_suffix(%s + .meve.json) failed for %s: %s", path.suffix, path, e
-        )
-    try:
-        cands.append(path.with_suffix(".meve.json"))
-    except Exception as e:
-        logger.debug("with_suffix(.meve.json) failed for %s: %s", path, e)
-    cands.append(Path(str(path) + ".meve.json"))
-    cands.append(path.parent / (path.name + ".meve.json"))
-    cands.append(path.parent / (path.stem + ".meve.json"))
-
-    seen: set[str] = set()
-    uniq: list[Path] = []
-    for p in cands:
-        key = str(p)
-        if key not in seen:
-            seen.add(key)
-            uniq.append(p)
-    return uniq
-
-
-def _find_sidecar_for(path: Path) -> Optional[Path]:
-    for cand in _sidecar_candidates(path):
-        if cand.exists():
-            return cand
-    return None
-
-
-def _maybe_extract_embedded(path: Path) -> Optional[Dict[str, Any]]:
-    sfx = path.suffix.lower()
-    if sfx == ".pdf":
-        return extract_proof_pdf(path)
-    if sfx == ".png":
-        return extract_proof_png(path)
-    return None
-
-
-def _write_sidecars(
-    path: Path,
-    proof: Dict[str, Any],
-    outdir: Optional[Path],
-) -> list[Path]:
-    """
-    Écrit des sidecars robustes, y compris pour les fichiers SANS extension.
-
-    On tente :
-      - file.ext.meve.json (si extension présente)
-      - file.meve.json (remplacement extension)
-      - file.name + ".meve.json" (toujours)
-      - file.stem + ".meve.json" (souvent identique au précédent)
-    """
-    base = outdir or path.parent
-    base.mkdir(parents=True, exist_ok=True)
-
-    outs: list[Path] = []
-
-    # Variante "conserve l'extension"
-    try:
-        outs.append((base / path.name).with_suffix(path.suffix + ".meve.json"))
-    except Exception as e:
-        logger.debug("sidecar keep-ext failed for %s: %s", path, e)
-
-    # Variante "remplace l'extension par .meve.json"
-    try:
-        outs.append((base / path.name).with_suffix(".meve.json"))
-    except Exception as e:
-        logger.debug("sidecar replace-ext failed for %s: %s", path, e)
-
-    # Variantes robustes (fonctionnent même sans extension)
-    outs.append(base / (path.name + ".meve.json"))
-    outs.append(base / (path.stem + ".meve.json"))
-
-    # Déduplication
-    uniq: list[Path] = []
-    seen: set[str] = set()
-    for o in outs:
-        k = str(o)
-        if k not in seen:
-            seen.add(k)
-            uniq.append(o)
-
-    payload = json.dumps(proof, ensure_ascii=False, separators=(",", ":"))
-    for o in uniq:
-        o.write_text(payload, encoding="utf-8")
-    return uniq
-
-
 def _summarize_proof(proof: Dict[str, Any]) -> Dict[str, Any]:
     """
     Transforme une preuve MEVE complète en résumé lisible, attendu par les tests.
@@ -162,6 +71,34 @@ def _summarize_proof(proof: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+# Options sans effet sur un flux (pas de fichier source, une seule passe)
+_FILE_ONLY_OPTIONS = (
+    "also_json",
+    "sidecar_policy",
+    "pattern",
+    "recursive",
+    "workers",
+    "processes",
+    "no_cache",
+    "hash_mode",
+    "chunk_size",
+    "delta",
+    "append_only",
+)
+
+
+def _reject_for_stdin(ctx: click.Context) -> None:
+    """UsageError si une option propre aux fichiers est donnée avec '-'."""
+    given = []
+    for p in ctx.command.params:
+        if p.name not in _FILE_ONLY_OPTIONS:
+            continue
+        if ctx.get_parameter_source(p.name) is not ParameterSource.DEFAULT:
+            given.append(p.opts[0])
+    if given:
+        raise click.UsageError(f"{', '.join(given)} cannot be used with stdin ('-').")
+
+
 # --------------------------------------------------------------------------- #
 # CLI
 # --------------------------------------------------------------------------- #
@@ -174,8 +111,10 @@ def cli() -> None:
 
 @cli.command("generate")
 @click.argument(
-    "file",
-    type=click.Path(path_type=Path, exists=True, dir_okay=False),
+    "files",
+    nargs=-1,
+    required=True,
+    type=click.Path(path_type=Path, exists=True, dir_okay=True, allow_dash=True),
 )
 @click.option(
     "--issuer",
@@ -196,47 +135,353 @@ def cli() -> None:
     required=False,
     help="Directory for outputs (sidecar and/or embedded copy).",
 )
+@click.option(
+    "--sidecars",
+    "sidecar_policy",
+    type=click.Choice(list(SIDECAR_POLICIES)),
+    default=DEFAULT_SIDECAR_POLICY,
+    show_default=True,
+    help="single: one <file>.meve.json; links/copies: also legacy names "
+    "(<stem>.meve.json) as hard links or copies.",
+)
+@click.option(
+    "--ledger",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Append proofs to this ledger segment instead of writing sidecars.",
+)
+@click.option(
+    "--ledger-per-dir",
+    "ledger_per_dir",
+    is_flag=True,
+    default=False,
+    help="Append proofs to a proofs.meve.ledger segment in each directory "
+    "(or in --outdir) instead of writing sidecars.",
+)
+@click.option(
+    "--glob",
+    "pattern",
+    type=str,
+    default=None,
+    help="Pattern for files inside directory arguments (default: '*').",
+)
+@click.option(
+    "--recursive",
+    "-r",
+    is_flag=True,
+    default=False,
+    help="Descend into sub-directories of directory arguments.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Parallel workers for batch mode (default: CPU count).",
+)
+@click.option(
+    "--processes",
+    is_flag=True,
+    default=False,
+    help="Use a process pool instead of threads in batch mode.",
+)
+@click.option(
+    "--no-cache",
+    "no_cache",
+    is_flag=True,
+    default=False,
+    help="Always re-hash files (ignore the persistent digest cache).",
+)
+@click.option(
+    "--hash-mode",
+    type=click.Choice(["plain", "tree"]),
+    default="plain",
+    show_default=True,
+    help="'tree' hashes fixed-size chunks of large files in parallel.",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    help="Chunk size in bytes for --hash-mode tree.",
+)
+@click.option(
+    "--delta",
+    is_flag=True,
+    default=False,
+    help="Keep a chunk manifest (tree mode) next to the proof. The file is "
+    "still hashed in full unless --append-only is given.",
+)
+@click.option(
+    "--append-only",
+    is_flag=True,
+    default=False,
+    help="With --delta: the file only grew since the previous manifest; "
+    "re-hash only appended chunks.",
+)
+@click.option(
+    "--name",
+    type=str,
+    default=None,
+    help="Filename recorded in the proof when reading from stdin ('-').",
+)
+@click.option(
+    "--hash-alg",
+    "algorithm",
+    type=click.Choice(list(algorithms())),
+    default=DEFAULT_ALGORITHM,
+    show_default=True,
+    help="Hash algorithm recorded in the proof.",
+)
 def cmd_generate(
-    file: Path,
+    files: tuple[Path, ...],
     issuer: Optional[str],
     also_json: bool,
     outdir: Optional[Path],
+    sidecar_policy: str,
+    ledger: Optional[Path],
+    ledger_per_dir: bool,
+    pattern: Optional[str],
+    recursive: bool,
+    workers: Optional[int],
+    processes: bool,
+    no_cache: bool,
+    hash_mode: str,
+    chunk_size: int,
+    delta: bool,
+    append_only: bool,
+    name: Optional[str],
+    algorithm: str,
 ) -> None:
     """
-    Generate a MEVE proof for FILE.
+    Generate a MEVE proof for each FILE.
 
     Comportement:
-      - PDF/PNG: embed la preuve dans un .meve.pdf/.meve.png (dans --outdir si fourni).
+      - PDF/PNG/JPEG: embed la preuve dans un .meve.pdf/.meve.png/.meve.jpg
+        (dans --outdir si fourni).
       - Toujours écrire un sidecar à côté du fichier source.
-      - Si --outdir est fourni: écrire aussi un sidecar dans --outdir.
-      - Et AFFICHER la preuve en JSON sur stdout (attendu par les tests).
+      - Si --outdir est fourni: écrire aussi un sidecar dans --outdir, en
+        reproduisant l'arborescence des dossiers donnés (deux fichiers aux
+        sorties identiques : le second est signalé en échec).
+      - --sidecars : un seul <file>.meve.json (défaut), ou aussi les noms
+        historiques en liens physiques (links) / copies (copies).
+      - --ledger / --ledger-per-dir : preuves ajoutées à un registre
+        (digitalmeve.ledger) au lieu des sidecars.
+      - Un seul fichier : AFFICHER la preuve en JSON sur stdout (attendu par les tests).
+      - Plusieurs fichiers, dossiers, --glob ou --recursive : mode lot,
+        une ligne JSON par fichier traité (ordre de complétion).
+      - FILE = '-' : lecture du document sur stdin, sans fichier temporaire
+        (nom enregistré via --name ; sidecar uniquement si --outdir ;
+        options propres aux fichiers, --hash-mode, --delta…, refusées).
     """
-    proof = generate_meve(file, issuer=issuer)
+    if ledger is not None and ledger_per_dir:
+        raise click.UsageError("--ledger and --ledger-per-dir are exclusive.")
+    use_ledger = ledger is not None or ledger_per_dir
+    if use_ledger and processes:
+        raise click.UsageError("--ledger cannot be combined with --processes.")
+    if append_only and not delta:
+        raise click.UsageError("--append-only requires --delta.")
+
+    if str(files[0]) == "-":
+        if use_ledger:
+            raise click.UsageError("--ledger is not supported for stdin ('-').")
+        if len(files) > 1:
+            raise click.UsageError("'-' (stdin) cannot be combined with other FILES.")
+        _reject_for_stdin(click.get_current_context())
+        proof = generate_meve_stream(
+            sys.stdin.buffer,
+            filename=name or "stdin",
+            outdir=outdir,
+            issuer=issuer or "Personal",
+            algorithm=algorithm,
+        )
+        # mêmes octets que le sidecar / la preuve embarquée
+        click.echo(canonical_bytes(proof), nl=False)
+        return
+
+    batch = len(files) > 1 or pattern is not None or recursive or files[0].is_dir()
+    options: Dict[str, Any] = {
+        "outdir": outdir,
+        "issuer": issuer,
+        "also_json": also_json,
+        "sidecar_policy": sidecar_policy,
+        "use_cache": not no_cache,
+        "hash_mode": hash_mode,
+        "chunk_size": chunk_size,
+        "delta": delta,
+        "append_only": append_only,
+        "algorithm": algorithm,
+    }
 
-    # 1) Embedding si supporté
-    suffix = file.suffix.lower()
-    if suffix == ".pdf":
-        dst = None if outdir is None else (outdir / (file.stem + ".meve.pdf"))
-        embed_proof_pdf(file, proof, out_path=dst)
-    elif suffix == ".png":
-        dst = None if outdir is None else (outdir / (file.stem + ".meve.png"))
-        embed_proof_png(file, proof, out_path=dst)
+    # segments fermés (index + trailer écrits) avant toute sortie du processus
+    with Ledgers(ledger) if use_ledger else nullcontext() as ledgers:
+        options["ledger"] = ledgers
+        if not batch:
+            res = prove_file(files[0], with_bytes=True, **options)
+        else:
+            failed = 0
+            results = generate_many(
+                iter_files_relative(files, pattern=pattern, recursive=recursive),
+                workers=workers,
+                processes=processes,
+                **options,
+            )
+            for res in results:
+                failed += not res["ok"]
+                click.echo(canonical_bytes(res))
+
+    if batch:
+        sys.exit(1 if failed else 0)
+    if not res["ok"]:
+        click.echo(f"Error: {res['error']}", err=True)
+        sys.exit(1)
+    # Sortie attendue par les tests : JSON pur sur stdout, octet pour octet
+    # celui du sidecar
+    click.echo(res["proof_bytes"], nl=False)
 
-    # 2) Sidecar TOUJOURS à côté du fichier source
-    _write_sidecars(file, proof, outdir=None)
 
-    # 3) Sidecar AUSSI dans --outdir si fourni (ou si --also-json demandé)
-    if outdir is not None or also_json:
-        _write_sidecars(file, proof, outdir=outdir)
+@cli.command("watch")
+@click.argument(
+    "dirs",
+    nargs=-1,
+    required=True,
+    type=click.Path(path_type=Path, exists=True, file_okay=False, dir_okay=True),
+)
+@click.option("--issuer", type=str, default=None, help="Issuer name for new proofs.")
+@click.option(
+    "--outdir",
+    type=click.Path(path_type=Path, file_okay=False, dir_okay=True),
+    default=None,
+    help="Directory for outputs (sidecar and/or embedded copy).",
+)
+@click.option(
+    "--sidecars",
+    "sidecar_policy",
+    type=click.Choice(list(SIDECAR_POLICIES)),
+    default=DEFAULT_SIDECAR_POLICY,
+    show_default=True,
+    help="Sidecar naming policy (see 'generate').",
+)
+@click.option(
+    "--glob",
+    "pattern",
+    type=str,
+    default=None,
+    help="Only prove files whose name matches (default: '*').",
+)
+@click.option(
+    "--recursive",
+    "-r",
+    is_flag=True,
+    default=False,
+    help="Also watch sub-directories (including new ones).",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Proofs generated in parallel (default: CPU count).",
+)
+@click.option(
+    "--debounce",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="Seconds a file must stay unchanged after its last write.",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(list(WATCH_BACKENDS)),
+    default="auto",
+    show_default=True,
+    help="'auto' uses inotify when available, else polling.",
+)
+@click.option(
+    "--poll-interval",
+    type=click.FloatRange(min=0.1),
+    default=2.0,
+    show_default=True,
+    help="Seconds between scans for the polling backend.",
+)
+@click.option(
+    "--existing",
+    is_flag=True,
+    default=False,
+    help="First prove files that have no sidecar yet.",
+)
+@click.option(
+    "--no-cache",
+    "no_cache",
+    is_flag=True,
+    default=False,
+    help="Always re-hash files (ignore the persistent digest cache).",
+)
+@click.option(
+    "--hash-alg",
+    "algorithm",
+    type=click.Choice(list(algorithms())),
+    default=DEFAULT_ALGORITHM,
+    show_default=True,
+    help="Hash algorithm recorded in the proofs.",
+)
+def cmd_watch(
+    dirs: tuple[Path, ...],
+    issuer: Optional[str],
+    outdir: Optional[Path],
+    sidecar_policy: str,
+    pattern: Optional[str],
+    recursive: bool,
+    workers: Optional[int],
+    debounce: float,
+    backend: str,
+    poll_interval: float,
+    existing: bool,
+    no_cache: bool,
+    algorithm: str,
+) -> None:
+    """
+    Watch DIRS and prove each new or modified document.
 
-    # 4) Sortie attendue par les tests : JSON pur sur stdout
-    click.echo(json.dumps(proof, ensure_ascii=False, separators=(",", ":")), nl=False)
+    Comportement:
+      - inotify (Linux), sinon scrutation périodique ;
+      - un fichier est traité une fois fermé et stable depuis --debounce s ;
+      - une ligne JSON par fichier traité (comme 'generate' en mode lot) ;
+      - Ctrl-C : les preuves en cours sont terminées, puis arrêt.
+    """
+
+    def echo(res: Dict[str, Any]) -> None:
+        click.echo(canonical_bytes(res))
+
+    try:
+        watch(
+            dirs,
+            recursive=recursive,
+            pattern=pattern,
+            debounce=debounce,
+            workers=workers,
+            backend=backend,
+            poll_interval=poll_interval,
+            existing=existing,
+            on_result=echo,
+            outdir=outdir,
+            issuer=issuer,
+            sidecar_policy=sidecar_policy,
+            use_cache=not no_cache,
+            algorithm=algorithm,
+        )
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
 
 
 @cli.command("verify")
 @click.argument(
-    "file",
-    type=click.Path(path_type=Path, exists=True, dir_okay=False),
+    "files",
+    nargs=-1,
+    required=True,
+    type=click.Path(path_type=Path, exists=True, dir_okay=True),
 )
 @click.option(
     "--expected-issuer",
@@ -244,38 +489,120 @@ def cmd_generate(
     required=False,
     help="Expected issuer.",
 )
-def cmd_verify(file: Path, expected_issuer: Optional[str]) -> None:
-    """
-    Verify FILE (embedded first, then sidecar).
-    Exit code 0 on success, 1 on failure.
+@click.option(
+    "--content/--no-content",
+    default=None,
+    help="Re-hash the original document and compare it with the proof "
+    "(default: whenever the document is found).",
+)
+@click.option(
+    "--document",
+    type=click.Path(path_type=Path, exists=True, dir_okay=False),
+    required=False,
+    help="Original document to check the proof against (single FILE only).",
+)
+@click.option(
+    "--schema",
+    is_flag=True,
+    default=False,
+    help="Also validate each proof against the bundled JSON schema.",
+)
+@click.option(
+    "--glob",
+    "pattern",
+    type=str,
+    default=None,
+    help="Pattern for files inside directory arguments (default: '*').",
+)
+@click.option(
+    "--recursive",
+    "-r",
+    is_flag=True,
+    default=False,
+    help="Descend into sub-directories of directory arguments.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Parallel workers for batch mode (default: CPU count).",
+)
+@click.option(
+    "--processes",
+    is_flag=True,
+    default=False,
+    help="Use a process pool instead of threads in batch mode.",
+)
+@click.option(
+    "--ledger",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Ledger segment to look proofs up in "
+    "(default: proofs.meve.ledger next to each file).",
+)
+def cmd_verify(
+    files: tuple[Path, ...],
+    expected_issuer: Optional[str],
+    content: Optional[bool],
+    document: Optional[Path],
+    schema: bool,
+    pattern: Optional[str],
+    recursive: bool,
+    workers: Optional[int],
+    processes: bool,
+    ledger: Optional[Path],
+) -> None:
     """
-    proof: Optional[Dict[str, Any]]
+    Verify each FILE (embedded first, then sidecar, then ledger).
 
-    # Cas 1 : on inspecte directement un *.meve.json
-    if file.name.endswith(".meve.json"):
-        proof = _read_json_file(file)
-    else:
-        # Cas 2 : embedded (PDF/PNG)
-        proof = _maybe_extract_embedded(file)
-        # Cas 3 : sidecar à partir d’un fichier “source”
-        if proof is None:
-            sc = _find_sidecar_for(file)
-            if sc is not None:
-                proof = _read_json_file(sc)
+    Lorsque le document original est connu (FILE avec son sidecar, --document,
+    ou subject.filename à côté de la preuve), son contenu est relu et comparé
+    à l'empreinte ; --no-content limite la vérification à la structure.
 
-    if proof is None:
-        click.echo(
-            "Error: No proof found (neither embedded nor sidecar).",
-            err=True,
+    Plusieurs fichiers, dossiers, --glob ou --recursive : mode lot, une ligne
+    JSON par fichier puis une ligne {"summary": ...}.
+    Exit code 0 on success, 1 on failure.
+    """
+    batch = len(files) > 1 or pattern is not None or recursive or files[0].is_dir()
+
+    if not batch:
+        ok, info = verify_file(
+            files[0],
+            expected_issuer=expected_issuer,
+            content=content,
+            document=document,
+            schema=schema,
+            ledger=ledger,
         )
+        if ok:
+            sys.exit(0)
+        click.echo(f"Error: {info.get('error', 'Invalid proof')}", err=True)
         sys.exit(1)
 
-    ok, info = verify_meve(proof, expected_issuer=expected_issuer)
-    if ok:
-        sys.exit(0)
-
-    click.echo(f"Error: {info.get('error', 'Invalid proof')}", err=True)
-    sys.exit(1)
+    if document is not None:
+        raise click.UsageError("--document requires a single FILE.")
+
+    failed = 0
+    results = verify_many(
+        # sidecars et registres exclus : chaque document est vérifié via le sien
+        iter_files(
+            files,
+            pattern=pattern,
+            recursive=recursive,
+            exclude=(".meve.json", ".meve.ledger"),
+        ),
+        workers=workers,
+        processes=processes,
+        expected_issuer=expected_issuer,
+        content=content,
+        schema=schema,
+        ledger=ledger,
+    )
+    for res in results:
+        if "summary" in res:
+            failed = res["summary"]["failed"]
+        click.echo(canonical_bytes(res))
+    sys.exit(1 if failed else 0)
 
 
 @cli.command("inspect")
@@ -283,12 +610,20 @@ def cmd_verify(file: Path, expected_issuer: Optional[str]) -> None:
     "file",
     type=click.Path(path_type=Path, exists=True, dir_okay=False),
 )
-def cmd_inspect(file: Path) -> None:
+@click.option(
+    "--ledger",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Ledger segment to look the proof up in "
+    "(default: proofs.meve.ledger next to FILE).",
+)
+def cmd_inspect(file: Path, ledger: Optional[Path]) -> None:
     """
     Print a compact JSON summary of the MEVE proof.
       1) Si FILE est un *.meve.json → lire directement
-      2) Sinon, embedded (PDF/PNG)
+      2) Sinon, embedded (PDF/PNG/JPEG)
       3) Sinon, sidecar (plusieurs conventions)
+      4) Sinon, registre (--ledger, ou proofs.meve.ledger du dossier)
     """
     proof: Optional[Dict[str, Any]]
 
@@ -297,13 +632,17 @@ def cmd_inspect(file: Path) -> None:
         proof = _read_json_file(file)
     else:
         # 2) embedded
-        proof = _maybe_extract_embedded(file)
+        proof = extract_embedded(file)
         # 3) sidecars
+        # (fichier unique : un essai par convention, sans parcourir le dossier)
         if proof is None:
-            for cand in _sidecar_candidates(file):
+            for cand in sidecar_candidates(file):
                 proof = _read_json_file(cand)
                 if proof is not None:
                     break
+        # 4) ledger
+        if proof is None:
+            proof = ledger_lookup(file, ledger)
 
     if proof is None:
         click.echo(
@@ -313,7 +652,7 @@ def cmd_inspect(file: Path) -> None:
         sys.exit(1)
 
     summary = _summarize_proof(proof)
-    click.echo(json.dumps(summary, ensure_ascii=False, separators=(",", ":")), nl=False)
+    click.echo(canonical_bytes(summary), nl=False)
 
 
 def main() -> None:
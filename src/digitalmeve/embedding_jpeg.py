@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+from io import BytesIO
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from .proof import ProofLike, proof_bytes
+
+# Segment APP15 dédié : identifiant, puis numéro de segment et total (1 octet
+# chacun) ; une preuve plus grande qu'un segment (64 KiB) est découpée.
+_MEVE_MARKER = 0xEF
+MEVE_APP_ID = b"DigitalMeve\x00"
+
+_SOI = b"\xff\xd8"
+_SOS = 0xDA
+_EOI = 0xD9
+# Marqueurs autonomes (sans champ longueur) : TEM, RST0-7
+_STANDALONE = {0x01, *range(0xD0, 0xD8)}
+_LENGTH = struct.Struct(">H")
+_MAX_SEGMENT = 0xFFFF - 2  # données d'un segment, champ longueur exclu
+_MAX_CHUNK = _MAX_SEGMENT - len(MEVE_APP_ID) - 2
+_COPY_BUFFER = 1024 * 1024
+
+
+def _proof_segments(payload: bytes) -> List[bytes]:
+    """Segments APP15 (marqueur compris) portant `payload`."""
+    chunks = [
+        payload[i : i + _MAX_CHUNK]  # noqa: E203
+        for i in range(0, len(payload), _MAX_CHUNK)
+    ] or [b""]
+    if len(chunks) > 255:
+        raise ValueError("proof too large for JPEG embedding")
+    total = len(chunks)
+    segments = []
+    for seq, chunk in enumerate(chunks, start=1):
+        body = MEVE_APP_ID + bytes((seq, total)) + chunk
+        segments.append(
+            bytes((0xFF, _MEVE_MARKER)) + _LENGTH.pack(len(body) + 2) + body
+        )
+    return segments
+
+
+def _next_marker(f: BinaryIO) -> Optional[int]:
+    """Code du prochain marqueur (octets de remplissage 0xFF ignorés)."""
+    b = f.read(1)
+    if b != b"\xff":
+        return None
+    while b == b"\xff":
+        b = f.read(1)
+    return b[0] if b else None
+
+
+def _iter_segments(f: BinaryIO):
+    """
+    (marqueur, longueur des données) de chaque segment avant SOS/EOI ;
+    `f` est positionné au début des données du segment. Le consommateur
+    doit lire ou sauter exactement `longueur` octets.
+    """
+    while True:
+        marker = _next_marker(f)
+        if marker is None:
+            raise ValueError("invalid JPEG marker")
+        if marker in _STANDALONE:
+            yield marker, 0
+            continue
+        if marker == _EOI:
+            yield marker, 0
+            return
+        raw = f.read(2)
+        if len(raw) < 2:
+            raise ValueError("truncated JPEG")
+        (length,) = _LENGTH.unpack(raw)
+        yield marker, length - 2
+        if marker == _SOS:
+            return
+
+
+def _is_meve(f: BinaryIO, length: int) -> Tuple[bool, bytes]:
+    """(segment DigitalMeve ?, octets déjà lus) pour un APP15 en cours."""
+    head = f.read(min(length, len(MEVE_APP_ID)))
+    return head == MEVE_APP_ID, head
+
+
+def _embed_jpeg(src: BinaryIO, proof: ProofLike, dst: BinaryIO) -> None:
+    """
+    Recopie `src` marqueur par marqueur (données compressées jamais
+    décodées) en insérant les segments APP15 de la preuve après les
+    segments APPn de tête (JFIF/Exif restent en premier) ; d'anciens
+    segments DigitalMeve sont remplacés.
+    """
+    if src.read(2) != _SOI:
+        raise ValueError("not a JPEG file")
+    dst.write(_SOI)
+    segments = _proof_segments(proof_bytes(proof))
+    pending = True
+
+    for marker, length in _iter_segments(src):
+        if pending and not (0xE0 <= marker <= 0xEF):
+            dst.writelines(segments)
+            pending = False
+        if marker == _MEVE_MARKER:
+            ours, head = _is_meve(src, length)
+            if ours:
+                src.seek(length - len(head), os.SEEK_CUR)
+                continue
+            dst.write(b"\xff\xef" + _LENGTH.pack(length + 2) + head)
+            length -= len(head)
+        elif marker in _STANDALONE or marker == _EOI:
+            dst.write(bytes((0xFF, marker)))
+            continue
+        else:
+            dst.write(bytes((0xFF, marker)) + _LENGTH.pack(length + 2))
+        _copy_exact(src, dst, length)
+
+    # SOS atteint : données d'image et EOI recopiées telles quelles
+    while True:
+        block = src.read(_COPY_BUFFER)
+        if not block:
+            return
+        dst.write(block)
+
+
+def _copy_exact(src: BinaryIO, dst: BinaryIO, n: int) -> None:
+    while n:
+        block = src.read(min(n, _COPY_BUFFER))
+        if not block:
+            raise ValueError("truncated JPEG")
+        dst.write(block)
+        n -= len(block)
+
+
+def embed_proof_jpeg(
+    in_path: Path | str,
+    proof: ProofLike,
+    out_path: Path | str | None = None,
+) -> Path:
+    """
+    Intègre une preuve .MEVE dans un JPEG via des segments APP15
+    « DigitalMeve », sans recompression (copie des segments).
+
+    - in_path : chemin du JPEG source
+    - proof   : preuve (`Proof` ou dict JSON-serializable)
+    - out_path: chemin de sortie (par défaut, <in>.meve.jpg / .meve.jpeg)
+    """
+    src = Path(in_path)
+    if out_path is None:
+        out_path = src.with_suffix(".meve" + src.suffix)
+    dst = Path(out_path)
+    # fichier temporaire (par processus et thread) + rename : écriture
+    # atomique, y compris sur place
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(src, "rb") as fi, open(tmp, "wb") as fo:
+            _embed_jpeg(fi, proof, fo)
+        os.replace(tmp, dst)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return dst
+
+
+def embed_proof_jpeg_stream(src: BinaryIO, proof: ProofLike, dst: BinaryIO) -> None:
+    """Variante flux de `embed_proof_jpeg` (`src` lisible, `dst` inscriptible)."""
+    _embed_jpeg(src, proof, dst)
+
+
+def embed_proof_jpeg_bytes(data: bytes, proof: ProofLike) -> bytes:
+    """Variante mémoire de `embed_proof_jpeg` : retourne les octets du JPEG."""
+    out = BytesIO()
+    _embed_jpeg(BytesIO(data), proof, out)
+    return out.getvalue()
+
+
+def read_jpeg_proof(f: BinaryIO) -> Optional[bytes]:
+    """
+    Charge utile DigitalMeve de `f` (positionné au début du JPEG), ou None.
+    Seuls les en-têtes de segments avant SOS sont lus ; les autres segments
+    sont sautés par `seek`.
+    """
+    if f.read(2) != _SOI:
+        return None
+    parts: Dict[int, bytes] = {}
+    total = 0
+    for marker, length in _iter_segments(f):
+        if marker == _MEVE_MARKER:
+            ours, head = _is_meve(f, length)
+            if ours:
+                seq_total = f.read(2)
+                if len(seq_total) < 2:
+                    raise ValueError("truncated JPEG")
+                seq, total = seq_total
+                parts[seq] = f.read(length - len(head) - 2)
+                continue
+            length -= len(head)
+        f.seek(length, os.SEEK_CUR)
+    if not parts:
+        return None
+    if sorted(parts) != list(range(1, total + 1)):
+        raise ValueError("incomplete DigitalMeve segments")
+    return b"".join(parts[i] for i in range(1, total + 1))
+
+
+def extract_proof_jpeg(in_path: Path | str) -> Optional[Dict[str, Any]]:
+    """
+    Extrait la preuve .MEVE embarquée dans un JPEG (si présente), sinon None.
+    """
+    with open(in_path, "rb") as f:
+        return extract_proof_jpeg_stream(f)
+
+
+def extract_proof_jpeg_stream(f: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Variante flux de `extract_proof_jpeg` (`f` positionné au début du JPEG)."""
+    try:
+        raw = read_jpeg_proof(f)
+        if not raw:
+            return None
+        return json.loads(raw)
+    except ValueError:
+        # segments absents/incomplets ou JSON non décodable
+        return None
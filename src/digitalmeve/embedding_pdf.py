@@ -1,23 +1,179 @@
 from __future__ import annotations
 
 import json
+import os
+import re
+import shutil
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional, Tuple
 
-import pikepdf
+from .pdf_trailer import PdfTrailerError, read_info_string
+from .proof import ProofLike, proof_json
 
 # La clé **doit** être un PdfName ET commencer par "/"
-MEVE_DOCINFO_KEY = pikepdf.Name("/MeveProof")
+_MEVE_KEY = "/MeveProof"
+
+try:  # reflink (Linux)
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX
+    fcntl = None  # type: ignore[assignment]
+
+_FICLONE = 0x40049409
+_COPY_BUFFER = 1024 * 1024
+_TAIL_BYTES = 4096
+_STARTXREF = re.compile(rb"startxref\s+(\d+)\s+%%EOF")
+_OBJ_HEADER = re.compile(rb"\s*\d+\s+\d+\s+obj\b")
+
+
+def _pikepdf() -> Any:
+    """pikepdf, chargé au premier besoin (démarrage du CLI sans bibliothèque native)."""
+    import pikepdf
+
+    return pikepdf
+
+
+def __getattr__(name: str) -> Any:
+    # MEVE_DOCINFO_KEY (pikepdf.Name) reste disponible, sans import anticipé
+    if name == "MEVE_DOCINFO_KEY":
+        return _pikepdf().Name(_MEVE_KEY)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _clone_file(src: Path, dst: Path) -> None:
+    """
+    Copie `src` vers `dst` sans relire les octets en espace utilisateur
+    quand c'est possible : reflink (FICLONE, Btrfs/XFS…), puis
+    `copy_file_range` (copie côté noyau), puis copie classique.
+    """
+    with open(src, "rb") as fi, open(dst, "wb") as fo:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fo.fileno(), _FICLONE, fi.fileno())
+                return
+            except OSError:
+                pass  # FS sans reflink ou volumes différents
+        size = os.fstat(fi.fileno()).st_size
+        done = 0
+        copy_range = getattr(os, "copy_file_range", None)
+        if copy_range is not None:
+            try:
+                while done < size:
+                    n = copy_range(fi.fileno(), fo.fileno(), size - done)
+                    if n == 0:
+                        break
+                    done += n
+            except OSError:
+                pass
+        if done < size:
+            fi.seek(done)
+            fo.seek(done)
+            shutil.copyfileobj(fi, fo, _COPY_BUFFER)
+
+
+def _last_xref(f: BinaryIO) -> Optional[Tuple[int, int, bool]]:
+    """
+    (offset du dernier xref, taille du fichier, fin de ligne finale ?) lus
+    dans la fin du flux ; None si `startxref` est introuvable/incohérent.
+    """
+    size = f.seek(0, os.SEEK_END)
+    f.seek(max(0, size - _TAIL_BYTES))
+    tail = f.read()
+    found = _STARTXREF.findall(tail)
+    if not found:
+        return None
+    prev = int(found[-1])
+    if prev >= size:
+        return None
+    f.seek(prev)
+    head = f.read(32)
+    # table classique (« xref ») ou flux de références (« N G obj »)
+    if not (head.startswith(b"xref") or _OBJ_HEADER.match(head)):
+        return None
+    return prev, size, tail.endswith((b"\n", b"\r"))
+
+
+def _update_section(f: BinaryIO, payload: str) -> Optional[Tuple[int, bytes]]:
+    """
+    Mise à jour incrémentale (ISO 32000, 7.5.6) : les octets d'origine sont
+    conservés tels quels, seuls un nouveau dictionnaire Info (avec
+    /MeveProof), une section xref et un trailer (/Prev) sont ajoutés.
+
+    Retourne (taille d'origine, octets à ajouter), ou None si le document
+    ne s'y prête pas (chiffré, réparé à l'ouverture, trailer introuvable) :
+    l'appelant réécrit alors le PDF.
+    """
+    xref = _last_xref(f)
+    if xref is None:
+        return None
+    prev, size0, eol = xref
+
+    pikepdf = _pikepdf()
+    f.seek(0)
+    with pikepdf.Pdf.open(f) as pdf:
+        if pdf.is_encrypted or pdf.get_warnings():
+            return None
+        trailer = pdf.trailer
+        root = trailer.get("/Root")
+        if root is None or not root.is_indirect:
+            return None
+        info = pikepdf.Dictionary()
+        old = trailer.get("/Info")
+        if isinstance(old, pikepdf.Dictionary):
+            for key, value in old.items():
+                info[key] = value
+        info[pikepdf.Name(_MEVE_KEY)] = pikepdf.String(payload)
+        info_bytes = info.unparse()
+        num = int(trailer.get("/Size", 0))
+        root_ref = b"%d %d R" % root.objgen
+        doc_id = trailer["/ID"].unparse() if "/ID" in trailer else None
+
+    buf = bytearray() if eol else bytearray(b"\n")
+    obj_offset = size0 + len(buf)
+    buf += b"%d 0 obj\n%s\nendobj\n" % (num, info_bytes)
+    xref_offset = size0 + len(buf)
+    buf += b"xref\n%d 1\n%010d 00000 n\r\n" % (num, obj_offset)
+    buf += b"trailer\n<< /Size %d /Root %s /Info %d 0 R /Prev %d" % (
+        num + 1,
+        root_ref,
+        num,
+        prev,
+    )
+    if doc_id is not None:
+        buf += b" /ID " + doc_id
+    buf += b" >>\nstartxref\n%d\n%%%%EOF\n" % xref_offset
+    return size0, bytes(buf)
+
+
+def _rewrite(src: Any, dst: Any, payload: str) -> None:
+    """
+    Réécriture complète par pikepdf (recompression de tout le document) ;
+    `src`/`dst` : chemins ou flux binaires.
+    """
+    pikepdf = _pikepdf()
+    in_place = isinstance(dst, Path) and dst.exists() and dst.samefile(src)
+    with pikepdf.Pdf.open(src, allow_overwriting_input=in_place) as pdf:
+        info = pdf.docinfo if pdf.docinfo is not None else pikepdf.Dictionary()
+        # ⚠️ clé correcte + valeur typée
+        info[pikepdf.Name(_MEVE_KEY)] = pikepdf.String(payload)
+        pdf.docinfo = info
+        pdf.save(dst)
 
 
 def embed_proof_pdf(
     in_path: Path | str,
-    proof: Dict[str, Any],
+    proof: ProofLike,
     out_path: Path | str | None = None,
+    incremental: bool = True,
 ) -> Path:
     """
-    Écrit la preuve JSON minifiée dans le DocInfo du PDF sous /MeveProof,
+    Écrit la preuve (JSON canonique) dans le DocInfo du PDF sous /MeveProof,
     puis sauvegarde le PDF (par défaut en <in>.meve.pdf).
+
+    `incremental=True` (défaut) : mise à jour incrémentale ajoutée en fin
+    de copie du fichier, coût indépendant de la taille du document, octets
+    d'origine intacts ; repli automatique sur une réécriture complète
+    (`incremental=False`) si le PDF ne s'y prête pas.
     """
     in_path = Path(in_path)
     if out_path is None:
@@ -25,30 +181,100 @@ def embed_proof_pdf(
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    payload = json.dumps(proof, separators=(",", ":"), ensure_ascii=False)
+    payload = proof_json(proof)
 
-    with pikepdf.Pdf.open(in_path) as pdf:
-        info = pdf.docinfo if pdf.docinfo is not None else pikepdf.Dictionary()
-        # ⚠️ clé correcte + valeur typée
-        info[MEVE_DOCINFO_KEY] = pikepdf.String(payload)
-        pdf.docinfo = info
-        pdf.save(str(out_path))
+    update = None
+    if incremental:
+        with open(in_path, "rb") as f:
+            update = _update_section(f, payload)
+    if update is None:
+        _rewrite(in_path, out_path, payload)
+        return out_path
 
+    size0, tail = update
+    if not (out_path.exists() and out_path.samefile(in_path)):
+        _clone_file(in_path, out_path)
+    with open(out_path, "r+b") as f:
+        # position explicite : jamais d'écriture au-delà des octets d'origine
+        f.seek(size0)
+        f.write(tail)
+        f.truncate()
     return out_path
 
 
+def embed_proof_pdf_stream(
+    src: BinaryIO,
+    proof: ProofLike,
+    dst: BinaryIO,
+    incremental: bool = True,
+) -> None:
+    """
+    Variante flux de `embed_proof_pdf` : `src` (lisible, positionnable) est
+    recopié dans `dst` suivi de la mise à jour incrémentale.
+    """
+    payload = proof_json(proof)
+    update = _update_section(src, payload) if incremental else None
+    src.seek(0)
+    if update is None:
+        _rewrite(src, dst, payload)
+        return
+    shutil.copyfileobj(src, dst, _COPY_BUFFER)
+    dst.write(update[1])
+
+
+def embed_proof_pdf_bytes(
+    data: bytes,
+    proof: ProofLike,
+    incremental: bool = True,
+) -> bytes:
+    """
+    Variante mémoire de `embed_proof_pdf` (service HTTP) : retourne les
+    octets du PDF embarqué ; en mode incrémental, `data` + mise à jour.
+    """
+    payload = proof_json(proof)
+    update = _update_section(BytesIO(data), payload) if incremental else None
+    if update is not None:
+        return bytes(data) + update[1]
+    out = BytesIO()
+    _rewrite(BytesIO(data), out, payload)
+    return out.getvalue()
+
+
 def extract_proof_pdf(in_path: Path | str) -> Optional[Dict[str, Any]]:
     """
     Lit /MeveProof depuis le DocInfo du PDF et renvoie un dict ou None.
+
+    Lecture rapide par le trailer (`digitalmeve.pdf_trailer`, coût
+    indépendant du nombre de pages) ; pikepdf uniquement en repli.
     """
-    in_path = Path(in_path)
     try:
-        with pikepdf.Pdf.open(in_path) as pdf:
+        with open(in_path, "rb") as f:
+            return extract_proof_pdf_stream(f)
+    except OSError:
+        return None
+
+
+def extract_proof_pdf_stream(f: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Variante flux de `extract_proof_pdf` (`f` binaire, déjà ouvert)."""
+    try:
+        raw = read_info_string(f, "MeveProof")
+    except PdfTrailerError:
+        f.seek(0)
+        return _extract_with_pikepdf(f)
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def _extract_with_pikepdf(src: BinaryIO) -> Optional[Dict[str, Any]]:
+    try:
+        pikepdf = _pikepdf()
+        with pikepdf.Pdf.open(src) as pdf:
             info = pdf.docinfo or {}
-            raw = info.get(MEVE_DOCINFO_KEY)
-            if not raw:
-                # fallback défensif si une autre clé existe par erreur
-                raw = info.get(pikepdf.Name("/MeveProof"))
+            raw = info.get(pikepdf.Name(_MEVE_KEY))
             if not raw:
                 return None
             if isinstance(raw, bytes):
@@ -1,69 +1,180 @@
 from __future__ import annotations
 
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional
 import json
+import os
+import struct
+import threading
+import zlib
 
-from PIL import Image, PngImagePlugin
+from .proof import ProofLike, proof_json
 
 # Clé iTXt pour stocker la preuve .MEVE
 _MEVE_KEY = "meve_proof"
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_LENGTH = struct.Struct(">I")
+_TEXT_CHUNKS = (b"tEXt", b"zTXt", b"iTXt")
+_COPY_BUFFER = 1024 * 1024
 
-def _minified_json(data: Dict[str, Any]) -> str:
-    """Retourne un JSON minifié, UTF-8 (sans échappement ASCII)."""
-    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+def _minified_json(data: ProofLike) -> str:
+    """Retourne le JSON canonique, UTF-8 (sans échappement ASCII)."""
+    return proof_json(data)
+
+
+def _itxt_chunk(key: str, text: str) -> bytes:
+    """Chunk iTXt non compressé (mot-clé Latin-1, texte UTF-8), CRC inclus."""
+    # mot-clé \0, compression 0/0, langue vide \0, mot-clé traduit vide \0
+    data = key.encode("latin-1") + b"\x00\x00\x00\x00\x00" + text.encode("utf-8")
+    crc = zlib.crc32(data, zlib.crc32(b"iTXt"))
+    return _LENGTH.pack(len(data)) + b"iTXt" + data + _LENGTH.pack(crc)
+
+
+def _copy_exact(src: BinaryIO, dst: BinaryIO, n: int, buf: memoryview) -> None:
+    while n:
+        got = src.readinto(buf[: min(n, len(buf))])
+        if not got:
+            raise ValueError("truncated PNG")
+        dst.write(buf[:got])
+        n -= got
+
+
+def _embed_png(src: BinaryIO, proof: ProofLike, dst: BinaryIO) -> None:
+    """
+    Recopie les chunks de `src` tels quels (aucun décodage de pixels,
+    ICC/EXIF/… conservés) en insérant l'iTXt de la preuve après IHDR ;
+    un ancien chunk texte `meve_proof` (tEXt/zTXt/iTXt) est remplacé.
+    """
+    if src.read(8) != PNG_SIGNATURE:
+        raise ValueError("not a PNG file")
+    dst.write(PNG_SIGNATURE)
+    chunk = _itxt_chunk(_MEVE_KEY, _minified_json(proof))
+    buf = memoryview(bytearray(_COPY_BUFFER))
+    key_prefix = _MEVE_KEY.encode("latin-1") + b"\x00"
+
+    while True:
+        header = src.read(8)
+        if len(header) < 8:
+            raise ValueError("truncated PNG (no IEND)")
+        (length,) = _LENGTH.unpack_from(header)
+        ctype = header[4:]
+        if ctype in _TEXT_CHUNKS:
+            body = src.read(length + 4)
+            if not body.startswith(key_prefix):
+                dst.write(header)
+                dst.write(body)
+            continue  # ancienne preuve : supprimée
+        dst.write(header)
+        _copy_exact(src, dst, length + 4, buf)  # données + CRC
+        if ctype == b"IHDR":
+            dst.write(chunk)
+        elif ctype == b"IEND":
+            return
 
 
 def embed_proof_png(
     in_path: Path | str,
-    proof: Dict[str, Any],
+    proof: ProofLike,
     out_path: Path | str | None = None,
 ) -> Path:
     """
-    Intègre une preuve .MEVE (dict) dans un PNG via un chunk iTXt.
+    Intègre une preuve .MEVE (dict) dans un PNG via un chunk iTXt, par
+    simple recopie des chunks (coût d'une copie de fichier).
 
     - in_path : chemin du PNG source
-    - proof   : dict JSON-serializable de la preuve
+    - proof   : preuve (`Proof` ou dict JSON-serializable)
     - out_path: chemin de sortie (par défaut, <in>.meve.png)
     """
     src = Path(in_path)
     if out_path is None:
         out_path = src.with_suffix(".meve.png")
     dst = Path(out_path)
+    # fichier temporaire (par processus et thread) + rename : écriture
+    # atomique, y compris sur place
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(src, "rb") as fi, open(tmp, "wb") as fo:
+            _embed_png(fi, proof, fo)
+        os.replace(tmp, dst)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return dst
 
-    with Image.open(src) as im:
-        info = PngImagePlugin.PngInfo()
 
-        # Conserver les métadonnées textuelles existantes si présentes
-        for k, v in im.info.items():
-            if isinstance(v, str):
-                try:
-                    info.add_text(k, v)
-                except Exception:
-                    # Si une clé n'est pas re-sérialisable en texte, on l'ignore
-                    pass
+def embed_proof_png_stream(src: BinaryIO, proof: ProofLike, dst: BinaryIO) -> None:
+    """Variante flux de `embed_proof_png` (`src` lisible, `dst` inscriptible)."""
+    _embed_png(src, proof, dst)
 
-        # Ajoute la preuve minifiée dans un iTXt
-        info.add_text(_MEVE_KEY, _minified_json(proof))
 
-        # Sauvegarde avec les métadonnées
-        im.save(dst, pnginfo=info)
+def embed_proof_png_bytes(data: bytes, proof: ProofLike) -> bytes:
+    """Variante mémoire de `embed_proof_png` : retourne les octets du PNG."""
+    out = BytesIO()
+    _embed_png(BytesIO(data), proof, out)
+    return out.getvalue()
 
-    return dst
+
+def _decode_text_chunk(ctype: bytes, body: bytes) -> str:
+    """Texte d'un chunk tEXt/zTXt/iTXt, `body` sans le mot-clé ni son \\0."""
+    if ctype == b"tEXt":
+        return body.decode("latin-1")
+    if ctype == b"zTXt":  # méthode de compression (0 = zlib) + données
+        return zlib.decompress(body[1:]).decode("latin-1")
+    # iTXt : drapeau, méthode, langue\0, mot-clé traduit\0, texte UTF-8
+    if len(body) < 2:
+        raise ValueError("truncated iTXt chunk")
+    compressed = body[0]
+    lang_end = body.index(b"\x00", 2)
+    text = body[body.index(b"\x00", lang_end + 1) + 1 :]  # noqa: E203
+    if compressed:
+        text = zlib.decompress(text)
+    return text.decode("utf-8")
+
+
+def read_png_text(f: BinaryIO, key: str = _MEVE_KEY) -> Optional[str]:
+    """
+    Parcourt les en-têtes de chunks de `f` (positionné au début du PNG)
+    et retourne le texte associé à `key`, ou None. Seuls les chunks texte
+    sont lus : IDAT et autres données sont sautés par `seek`.
+    """
+    if f.read(8) != PNG_SIGNATURE:
+        return None
+    prefix = key.encode("latin-1") + b"\x00"
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        (length,) = _LENGTH.unpack_from(header)
+        ctype = header[4:]
+        if ctype in _TEXT_CHUNKS and length >= len(prefix):
+            body = f.read(length)
+            f.seek(4, os.SEEK_CUR)  # CRC
+            if body.startswith(prefix):
+                return _decode_text_chunk(ctype, body[len(prefix) :])  # noqa: E203
+        elif ctype == b"IEND":
+            return None
+        else:
+            f.seek(length + 4, os.SEEK_CUR)
 
 
 def extract_proof_png(in_path: Path | str) -> Optional[Dict[str, Any]]:
     """
     Extrait la preuve .MEVE embarquée dans un PNG (si présente), sinon None.
+    Quelques petites lectures par fichier, quelle que soit la taille de l'image.
     """
-    src = Path(in_path)
-    with Image.open(src) as im:
-        raw = im.info.get(_MEVE_KEY)
+    with open(in_path, "rb") as f:
+        return extract_proof_png_stream(f)
+
+
+def extract_proof_png_stream(f: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Variante flux de `extract_proof_png` (`f` positionné au début du PNG)."""
+    try:
+        raw = read_png_text(f)
         if not raw:
             return None
-        try:
-            return json.loads(raw)
-        except Exception:
-            # Chunk présent mais non décodable en JSON
-            return None
+        return json.loads(raw)
+    except (ValueError, zlib.error):
+        # Chunk présent mais non décodable (JSON, zlib, UTF-8)
+        return None
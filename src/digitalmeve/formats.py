@@ -0,0 +1,195 @@
+"""
+digitalmeve.formats
+
+Registre des formats à preuve embarquée. Chaque `FormatHandler` décrit :
+  - sniff   : reconnaissance par les premiers octets du fichier ;
+  - embed   : intégration de la preuve dans une copie du fichier ;
+  - extract : lecture de la preuve depuis le fichier déjà ouvert.
+
+Le format est déterminé par le contenu, non par l'extension : un fichier
+mal nommé est confié au bon moteur, et un fichier d'un autre format n'est
+jamais ouvert par pikepdf. L'en-tête est lu une fois ; le même descripteur
+sert ensuite à l'extraction. Les modules d'intégration ne sont importés
+qu'au premier fichier de leur format.
+
+Ajouter un format : `register(FormatHandler(...))`, sans toucher au CLI,
+au générateur ni au vérificateur.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+__all__ = [
+    "SNIFF_BYTES",
+    "FormatHandler",
+    "detect",
+    "extract_embedded",
+    "handlers",
+    "register",
+    "sniff",
+    "sniff_stream",
+]
+
+logger = logging.getLogger("digitalmeve.formats")
+
+# Octets lus pour la détection (l'en-tête %PDF- peut être précédé de
+# données parasites dans le premier kilo-octet)
+SNIFF_BYTES = 1024
+
+_PDF_HEADER = re.compile(rb"%PDF-\d\.\d")
+# octets de contrôle hors blancs : préambule binaire (PJL, MacBinary…)
+_BINARY = re.compile(rb"[\x00-\x08\x0b\x0e-\x1f\x7f]")
+
+
+@dataclass(frozen=True)
+class FormatHandler:
+    """
+    Moteur d'un format. `module` est un nom de module absolu, importé au
+    premier usage ; `embed` et `extract` y désignent :
+      - embed(in_path, proof, out_path) -> Path ;
+      - extract(f) -> dict | None, `f` binaire positionné au début.
+    `suffixes[0]` est l'extension de sortie pour un fichier mal nommé.
+    """
+
+    name: str
+    suffixes: Tuple[str, ...]
+    sniff: Callable[[bytes], bool]
+    module: str
+    embed: str
+    extract: str
+
+    def _func(self, attr: str) -> Callable[..., Any]:
+        return getattr(import_module(self.module), attr)
+
+    def embed_file(self, in_path: Path, proof: Any, out_path: Union[str, Path]) -> Path:
+        return self._func(self.embed)(in_path, proof, out_path=out_path)
+
+    def extract_stream(self, f: BinaryIO) -> Optional[Dict[str, Any]]:
+        return self._func(self.extract)(f)
+
+    def output_name(self, path: Path) -> str:
+        """
+        Nom du fichier à preuve embarquée : <stem>.meve<ext> ; un fichier
+        mal nommé garde son nom complet (scan.dat -> scan.dat.meve.pdf).
+        """
+        if path.suffix.lower() in self.suffixes:
+            return f"{path.stem}.meve{path.suffix}"
+        return f"{path.name}.meve{self.suffixes[0]}"
+
+
+_HANDLERS: List[FormatHandler] = []
+
+
+def register(handler: FormatHandler) -> None:
+    """Ajoute `handler` (ou remplace le moteur de même nom)."""
+    for i, h in enumerate(_HANDLERS):
+        if h.name == handler.name:
+            _HANDLERS[i] = handler
+            return
+    _HANDLERS.append(handler)
+
+
+def handlers() -> Tuple[FormatHandler, ...]:
+    return tuple(_HANDLERS)
+
+
+def sniff(head: bytes) -> Optional[FormatHandler]:
+    """Moteur reconnaissant l'en-tête `head`, ou None."""
+    for h in _HANDLERS:
+        if h.sniff(head):
+            return h
+    return None
+
+
+def sniff_stream(f: BinaryIO) -> Optional[FormatHandler]:
+    """Comme `sniff`, sur les premiers octets de `f` (repositionné au début)."""
+    head = f.read(SNIFF_BYTES)
+    f.seek(0)
+    return sniff(head)
+
+
+def detect(path: Union[str, Path]) -> Optional[FormatHandler]:
+    """Moteur du fichier `path` ; None si format inconnu ou illisible."""
+    try:
+        with open(path, "rb") as f:
+            return sniff(f.read(SNIFF_BYTES))
+    except OSError:
+        return None
+
+
+def extract_embedded(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Preuve embarquée dans `path`, ou None (format inconnu, fichier
+    illisible ou mal formé, aucune preuve). Un seul `open` : détection puis
+    extraction. ImportError si le moteur du format n'est pas installé.
+    """
+    try:
+        with open(path, "rb") as f:
+            handler = sniff_stream(f)
+            if handler is None:
+                return None
+            try:
+                return handler.extract_stream(f)
+            except (ImportError, OSError):
+                raise
+            except Exception as e:
+                # erreur d'analyse (ValueError, zlib.error, IndexError…)
+                logger.debug("%s extraction failed for %s: %s", handler.name, path, e)
+                return None
+    except OSError:
+        return None
+
+
+# --- Formats intégrés -------------------------------------------------------
+
+register(
+    FormatHandler(
+        name="PNG",
+        suffixes=(".png",),
+        sniff=lambda head: head.startswith(b"\x89PNG\r\n\x1a\n"),
+        module="digitalmeve.embedding_png",
+        embed="embed_proof_png",
+        extract="extract_proof_png_stream",
+    )
+)
+register(
+    FormatHandler(
+        name="JPEG",
+        suffixes=(".jpg", ".jpeg"),
+        sniff=lambda head: head.startswith(b"\xff\xd8\xff"),
+        module="digitalmeve.embedding_jpeg",
+        embed="embed_proof_jpeg",
+        extract="extract_proof_jpeg_stream",
+    )
+)
+
+
+def _sniff_pdf(head: bytes) -> bool:
+    """
+    En-tête %PDF-x.y en début de fichier (après d'éventuels blancs) ou après
+    un préambule binaire ; un texte qui cite « %PDF-1.7 » n'est pas un PDF.
+    """
+    m = _PDF_HEADER.search(head)
+    if m is None:
+        return False
+    preamble = head[: m.start()]
+    return not preamble.strip() or _BINARY.search(preamble) is not None
+
+
+# PDF en dernier : son en-tête n'est pas forcément en tête de fichier
+register(
+    FormatHandler(
+        name="PDF",
+        suffixes=(".pdf",),
+        sniff=_sniff_pdf,
+        module="digitalmeve.embedding_pdf",
+        embed="embed_proof_pdf",
+        extract="extract_proof_pdf_stream",
+    )
+)
@@ -1,34 +1,173 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 from base64 import b64encode
 from datetime import datetime, timezone
-from hashlib import sha256
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-__all__ = ["generate_meve", "generate_proof"]
+from . import formats
+from .hashing import (
+    DEFAULT_ALGORITHM,
+    DEFAULT_CHUNK_SIZE,
+    HASH_MODES,
+    FileDigest,
+    TreeDigest,
+    algorithms,
+    digest_file,
+    digest_stream,
+    new_hasher,
+    tree_digest,
+)
+from .ledger import Ledgers
+from .parallel import imap_unordered
+from .proof import Proof, Subject
+from .sidecars import DEFAULT_SIDECAR_POLICY, atomic_write_bytes, write_sidecars
+
+__all__ = [
+    "generate_many",
+    "generate_meve",
+    "generate_meve_stream",
+    "generate_proof",
+    "load_manifest",
+    "manifest_path",
+    "prove_file",
+]
+
+logger = logging.getLogger("digitalmeve.generator")
 
 _MEVE_VERSION = "1.0"
 _PREVIEW_BYTES = 128  # small readable preview for debug
+_MANIFEST_VERSION = "1.0"
+
+Digest = Union[FileDigest, TreeDigest]
 
 
 def _file_sha256(path: Path) -> str:
-    h = sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    return digest_file(path, preview_bytes=0).hexdigest
+
+
+def _digest(
+    path: Path,
+    use_cache: bool,
+    cache_key: str,
+    compute: Callable[[], Digest],
+    chunk_size: Optional[int] = None,
+) -> Digest:
+    """
+    Run `compute` on `path`, or serve its result from the persistent
+    stat-keyed cache when the file is unchanged (same device, inode,
+    size and mtime_ns).
+
+    `chunk_size` is set for tree digests: a cache hit then returns a
+    `TreeDigest` (without chunk digests), so the proof keeps its
+    `hash_mode` and `chunk_size`.
+    """
+    if not use_cache:
+        return compute()
+    # sqlite3 is only loaded once a cached digest is actually requested
+    import sqlite3
+
+    from . import cache as _cache
 
+    cache = _cache.default_cache()
+    if cache is None:
+        return compute()
 
-def _preview_b64(path: Path, limit: int = _PREVIEW_BYTES) -> str:
+    st = os.stat(path)
     try:
-        with path.open("rb") as f:
-            head = f.read(limit)
-        return b64encode(head).decode("ascii")
-    except Exception:
-        # preview is optional and must not fail generation
-        return ""
+        hit = cache.get(st, cache_key)
+    except sqlite3.Error:
+        _cache.disable_default_cache()
+        hit = None
+    if hit is not None:
+        preview = hit[1][:_PREVIEW_BYTES]
+        if chunk_size is not None:
+            return TreeDigest(hit[0], (), chunk_size, preview, st.st_size)
+        return FileDigest(hit[0], preview, st.st_size)
+
+    digest = compute()
+    # only cache if the file did not change while being read
+    after = os.stat(path)
+    if (st.st_ino, st.st_size, st.st_mtime_ns) == (
+        after.st_ino,
+        after.st_size,
+        after.st_mtime_ns,
+    ) and digest.size == st.st_size:
+        try:
+            cache.put(st, cache_key, digest.hexdigest, digest.preview)
+        except sqlite3.Error:
+            _cache.disable_default_cache()
+    return digest
+
+
+def manifest_path(
+    file_path: Union[str, Path], outdir: Optional[Union[str, Path]] = None
+) -> Path:
+    """Default location of the chunk manifest of `file_path`."""
+    path = Path(file_path)
+    base = Path(outdir) if outdir is not None else path.parent
+    return base / f"{path.name}.chunks.meve.json"
+
+
+def _write_manifest(dest: Path, path: Path, digest: TreeDigest, algorithm: str) -> None:
+    data = {
+        "meve_manifest": _MANIFEST_VERSION,
+        "filename": path.name,
+        "size": digest.size,
+        "hash_alg": algorithm,
+        "hash_mode": "tree",
+        "chunk_size": digest.chunk_size,
+        "root": digest.hexdigest,
+        "leaves": [leaf.hex() for leaf in digest.leaves],
+    }
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+
+
+def load_manifest(source: Union[str, Path, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Load a chunk manifest (path or already-parsed dict).
+
+    Returns {"size", "chunk_size", "hash_alg", "leaves": [bytes...]} or None
+    when the manifest is missing or unusable (everything is then re-hashed).
+    """
+    data: Any = source
+    if not isinstance(source, dict):
+        try:
+            data = json.loads(Path(source).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+    try:
+        if data.get("hash_mode") != "tree":
+            return None
+        leaves = [bytes.fromhex(x) for x in data["leaves"]]
+        size, chunk_size = int(data["size"]), int(data["chunk_size"])
+        algorithm = str(data.get("hash_alg", DEFAULT_ALGORITHM))
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+    if chunk_size <= 0 or size < 0 or algorithm not in algorithms():
+        return None
+    return {
+        "size": size,
+        "chunk_size": chunk_size,
+        "hash_alg": algorithm,
+        "leaves": leaves,
+    }
 
 
 def _iso8601_z_now() -> str:
@@ -41,52 +180,210 @@ def _iso8601_z_now() -> str:
     )
 
 
+def _build_proof(
+    filename: str,
+    digest: Digest,
+    issuer: str,
+    metadata: Optional[Dict[str, Any]],
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> Proof:
+    issued_at = _iso8601_z_now()
+    tree = isinstance(digest, TreeDigest)
+    subject = Subject(
+        filename=filename,
+        size=digest.size,
+        digest=digest.hexdigest,
+        hash_alg=algorithm,
+        hash_mode="tree" if tree else None,
+        chunk_size=digest.chunk_size if tree else None,  # type: ignore[union-attr]
+    )
+    return Proof(
+        meve_version=_MEVE_VERSION,
+        issuer=issuer,
+        issued_at=issued_at,
+        timestamp=issued_at,
+        metadata=metadata or {},
+        subject=subject,
+        hash=digest.hexdigest,
+        preview_b64=b64encode(digest.preview).decode("ascii"),
+    )
+
+
+def _dump_proof(
+    proof: Proof,
+    filename: str,
+    outdir: Optional[Union[str, Path]],
+    fallback_dir: Optional[Path],
+) -> None:
+    """
+    Write <filename>.meve.json in outdir (or fallback_dir when no outdir).
+    Only the last component of `filename` is used: a caller-supplied name
+    such as "../x" cannot place the sidecar outside that directory.
+    """
+    if outdir is not None:
+        out = Path(outdir)
+        out.mkdir(parents=True, exist_ok=True)
+    elif fallback_dir is not None:
+        out = fallback_dir
+    else:
+        return
+    name = Path(filename).name
+    atomic_write_bytes(out / f"{name}.meve.json", proof.to_bytes())
+
+
+def _generate(
+    file_path: Union[str, Path],
+    outdir: Optional[Union[str, Path]] = None,
+    issuer: str = "Personal",
+    metadata: Optional[Dict[str, Any]] = None,
+    also_json: bool = False,
+    use_cache: bool = True,
+    hash_mode: str = "plain",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    manifest: Union[bool, str, Path] = False,
+    previous: Optional[Union[str, Path, Dict[str, Any]]] = None,
+    dirty: Optional[Iterable[Tuple[int, int]]] = None,
+    append_only: bool = False,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> Proof:
+    """`generate_meve` returning the `Proof` object (serialized once)."""
+    if hash_mode not in HASH_MODES:
+        raise ValueError(f"unsupported hash mode: {hash_mode}")
+    path = Path(file_path)
+
+    prev = load_manifest(previous) if previous is not None else None
+    if manifest or previous is not None:
+        hash_mode = "tree"
+        if prev is not None:
+            chunk_size = prev["chunk_size"]
+            algorithm = prev["hash_alg"]
+    new_hasher(algorithm)  # reject unknown algorithms before any I/O
+
+    compute: Callable[[], Digest]
+    tree_chunk: Optional[int] = None
+    if hash_mode == "tree":
+        tree_chunk = chunk_size
+        cache_key = f"{algorithm}-tree:{chunk_size}"
+        compute = partial(
+            tree_digest,
+            path,
+            chunk_size=chunk_size,
+            workers=workers,
+            preview_bytes=_PREVIEW_BYTES,
+            previous=None if prev is None else prev["leaves"],
+            previous_size=0 if prev is None else prev["size"],
+            dirty=dirty,
+            append_only=append_only,
+            algorithm=algorithm,
+        )
+        if manifest or prev is not None:
+            # chunk digests are needed: the cache only stores the root
+            use_cache = False
+    else:
+        cache_key = algorithm
+        # single pass: hash, preview and size from one open file handle
+        compute = partial(
+            digest_file, path, preview_bytes=_PREVIEW_BYTES, algorithm=algorithm
+        )
+
+    try:
+        digest = _digest(path, use_cache, cache_key, compute, tree_chunk)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"file not found: {path}") from None
+
+    proof = _build_proof(path.name, digest, issuer, metadata, algorithm)
+    if manifest and isinstance(digest, TreeDigest):
+        dest = (
+            manifest_path(path, outdir)
+            if manifest is True
+            else Path(manifest)  # type: ignore[arg-type]
+        )
+        _write_manifest(dest, path, digest, algorithm)
+
+    _dump_proof(proof, path.name, outdir, path.parent if also_json else None)
+    return proof
+
+
 def generate_meve(
     file_path: Union[str, Path],
     outdir: Optional[Union[str, Path]] = None,
     issuer: str = "Personal",
     metadata: Optional[Dict[str, Any]] = None,
     also_json: bool = False,
+    use_cache: bool = True,
+    hash_mode: str = "plain",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    manifest: Union[bool, str, Path] = False,
+    previous: Optional[Union[str, Path, Dict[str, Any]]] = None,
+    dirty: Optional[Iterable[Tuple[int, int]]] = None,
+    append_only: bool = False,
+    algorithm: str = DEFAULT_ALGORITHM,
 ) -> Dict[str, Any]:
     """
     Generate a minimal MEVE proof (as dict) for the given file.
-    """
-    path = Path(file_path)
-    if not path.exists():
-        raise FileNotFoundError(f"file not found: {path}")
 
-    content_hash = _file_sha256(path)
-    preview = _preview_b64(path)
-    issued_at = _iso8601_z_now()
+    `algorithm` picks the hash from `digitalmeve.hashing.algorithms()`;
+    SHA-256 (default) is stored in `subject.hash_sha256`, any other one in
+    `subject.hash_alg` + `subject.digest`.
 
-    proof: Dict[str, Any] = {
-        "meve_version": _MEVE_VERSION,
-        "issuer": issuer,
-        "issued_at": issued_at,
-        "timestamp": issued_at,
-        "metadata": metadata or {},
-        "subject": {
-            "filename": path.name,
-            "size": path.stat().st_size,
-            "hash_sha256": content_hash,
-        },
-        "hash": content_hash,
-        "preview_b64": preview,
-    }
+    With `use_cache` (default), unchanged files are not re-read: their digest
+    comes from the persistent cache (see `digitalmeve.cache`).
 
-    if outdir is not None:
-        out = Path(outdir)
-        out.mkdir(parents=True, exist_ok=True)
-        outfile = out / f"{path.name}.meve.json"
-        with outfile.open("w", encoding="utf-8") as f:
-            json.dump(proof, f, ensure_ascii=False, separators=(",", ":"), indent=None)
+    `hash_mode="tree"` hashes `chunk_size` blocks on `workers` threads and
+    records the root in `subject.hash_sha256`, with `subject.hash_mode` and
+    `subject.chunk_size` (see `digitalmeve.hashing`).
 
-    if also_json and outdir is None:
-        outfile = path.with_name(f"{path.name}.meve.json")
-        with outfile.open("w", encoding="utf-8") as f:
-            json.dump(proof, f, ensure_ascii=False, separators=(",", ":"), indent=None)
+    Delta re-proofing (implies tree mode):
+      - `manifest`: write the per-chunk digests to a manifest file
+        (True: `manifest_path(file, outdir)`, or an explicit path);
+      - `previous`: manifest (path or dict) of an earlier version. Its
+        complete chunks are reused only when the caller vouches for them:
+        with `append_only=True` (the file only grew), or with `dirty`
+        listing every modified byte range. Only appended bytes, the last
+        partial chunk and `dirty` ranges are then re-read; otherwise the
+        file is hashed in full. The first and last reused chunks are
+        re-hashed as a check: if either differs, nothing is reused.
+    """
+    return _generate(
+        file_path,
+        outdir=outdir,
+        issuer=issuer,
+        metadata=metadata,
+        also_json=also_json,
+        use_cache=use_cache,
+        hash_mode=hash_mode,
+        chunk_size=chunk_size,
+        workers=workers,
+        manifest=manifest,
+        previous=previous,
+        dirty=dirty,
+        append_only=append_only,
+        algorithm=algorithm,
+    ).to_dict()
 
-    return proof
+
+def generate_meve_stream(
+    stream: BinaryIO,
+    filename: str,
+    size_hint: Optional[int] = None,
+    outdir: Optional[Union[str, Path]] = None,
+    issuer: str = "Personal",
+    metadata: Optional[Dict[str, Any]] = None,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> Dict[str, Any]:
+    """
+    Generate a MEVE proof from any readable binary stream (pipe, stdin,
+    object-store reader...) in one pass, without spilling it to disk.
+
+    `filename` is recorded in `subject.filename`; `size_hint` only sizes
+    the read buffer. With `outdir`, `<filename>.meve.json` is written there.
+    """
+    digest = digest_stream(stream, _PREVIEW_BYTES, size_hint, algorithm)
+    proof = _build_proof(filename, digest, issuer, metadata, algorithm)
+    _dump_proof(proof, filename, outdir, None)
+    return proof.to_dict()
 
 
 def generate_proof(
@@ -104,3 +401,161 @@ def generate_proof(
         metadata=metadata,
         also_json=also_json,
     )
+
+
+def _embed(path: Path, proof: Proof, outdir: Optional[Path]) -> Optional[Path]:
+    """
+    Embed the proof into a copy of `path` when its content is a registered
+    format (see `digitalmeve.formats`); None otherwise.
+    """
+    handler = formats.detect(path)
+    if handler is None:
+        return None
+    dst = (path.parent if outdir is None else outdir) / handler.output_name(path)
+    try:
+        return handler.embed_file(path, proof, dst)
+    except OSError:
+        raise  # I/O failure (disk full, permissions): reported as such
+    except Exception as e:
+        # malformed file of a known format (ValueError, pikepdf.PdfError...):
+        # the proof is still written as a sidecar
+        logger.debug("%s embedding skipped for %s: %s", handler.name, path, e)
+        return None
+
+
+def prove_file(
+    file_path: Union[str, Path],
+    outdir: Optional[Union[str, Path]] = None,
+    issuer: Optional[str] = None,
+    also_json: bool = False,
+    delta: bool = False,
+    sidecar_policy: str = DEFAULT_SIDECAR_POLICY,
+    ledger: Optional[Ledgers] = None,
+    with_bytes: bool = False,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Full pipeline for one file, as run by `digitalmeve generate`:
+    proof generation, PDF/PNG/JPEG embedding and sidecar writing.
+    Extra keyword `options` are passed to `generate_meve`.
+
+    `delta=True` keeps a chunk manifest next to the sidecars. The previous
+    manifest, when one exists, only saves re-reading chunks with
+    `append_only=True` (see `generate_meve`); otherwise the file is hashed
+    in full and the manifest refreshed.
+
+    `sidecar_policy` ("single", "links" or "copies", see
+    `digitalmeve.sidecars.write_sidecars`) controls whether legacy sidecar
+    names are written too. `also_json` is accepted for backwards
+    compatibility: a sidecar is always written next to the source.
+
+    With `ledger` (see `digitalmeve.ledger.Ledgers`), the proof is appended
+    to a ledger segment instead of being written as sidecar files.
+
+    `with_bytes=True` adds "proof_bytes": the canonical bytes written to the
+    sidecar (not JSON-serializable: for callers printing the proof as is).
+
+    Never raises: failures are reported as {"file", "ok": False, "error"}.
+    """
+    path = Path(file_path)
+    out = None if outdir is None else Path(outdir)
+    if delta:
+        mpath = manifest_path(path, out)
+        options["manifest"] = mpath
+        if mpath.exists():
+            options["previous"] = mpath
+    try:
+        proof = _generate(path, issuer=issuer or "Personal", **options)
+        embedded = _embed(path, proof, out)
+        sidecars: List[Path] = []
+        segment = None
+        if ledger is not None:
+            segment = ledger.append(path, proof, out)
+        else:
+            # sidecar always next to the source, and in outdir when given
+            sidecars = write_sidecars(path, proof, None, sidecar_policy)
+            if out is not None:
+                sidecars += write_sidecars(path, proof, out, sidecar_policy)
+    except Exception as e:
+        return {"file": str(path), "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    result: Dict[str, Any] = {
+        "file": str(path),
+        "ok": True,
+        "embedded": None if embedded is None else str(embedded),
+        "sidecars": [str(s) for s in sidecars],
+        "proof": proof.to_dict(),
+    }
+    if segment is not None:
+        result["ledger"] = str(segment)
+    if delta:
+        result["manifest"] = str(options["manifest"])
+    if with_bytes:
+        result["proof_bytes"] = proof.to_bytes()
+    return result
+
+
+def _plan_outputs(
+    items: Iterable[Union[str, Path, Tuple[Union[str, Path], Union[str, Path]]]],
+    outdir: Optional[Union[str, Path]],
+) -> Iterator[Tuple[Path, Optional[Path], Optional[Path]]]:
+    """
+    (path, output directory, clashing path) for each input item.
+
+    Items are paths or (path, relative directory) pairs; the relative
+    directory is mirrored under `outdir`, so `a/x.pdf` and `b/x.pdf` do not
+    share outputs. A file whose outputs would still overwrite those of an
+    earlier one is reported with that earlier path instead of being proved.
+    """
+    seen: Dict[Tuple[Path, str], Path] = {}
+    for item in items:
+        if isinstance(item, tuple):
+            path, rel = Path(item[0]), Path(item[1])
+        else:
+            path, rel = Path(item), Path()
+        if outdir is None:
+            yield path, None, None
+            continue
+        target = Path(outdir) / rel
+        first = seen.setdefault((target, path.name), path)
+        yield path, target, None if first == path else first
+
+
+def _prove_planned(
+    item: Tuple[Path, Optional[Path], Optional[Path]], **options: Any
+) -> Dict[str, Any]:
+    path, outdir, clash = item
+    if clash is not None:
+        return {
+            "file": str(path),
+            "ok": False,
+            "error": f"FileExistsError: outputs in {outdir} already used by {clash}",
+        }
+    return prove_file(path, outdir=outdir, **options)
+
+
+def generate_many(
+    paths: Iterable[Union[str, Path, Tuple[Union[str, Path], Union[str, Path]]]],
+    *,
+    workers: Optional[int] = None,
+    processes: bool = False,
+    **options: Any,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run `prove_file` over many paths with a pool of `workers`; keyword
+    `options` (outdir, issuer, also_json, use_cache...) go to `prove_file`.
+
+    `paths` may also hold (path, relative directory) pairs, as produced by
+    `digitalmeve.utils.iter_files_relative`: outputs then go to
+    `outdir/<relative directory>`. Files that would overwrite the outputs of
+    an earlier file in `outdir` are reported as failures.
+
+    Results are yielded as each file completes (not in input order).
+    Threads suit hashing (hashlib releases the GIL); pass `processes=True`
+    when PDF/PNG/JPEG embedding dominates and keeps the GIL busy.
+    """
+    outdir = options.pop("outdir", None)
+    job = partial(_prove_planned, **options)
+    return imap_unordered(
+        job, _plan_outputs(paths, outdir), workers=workers, processes=processes
+    )
@@ -0,0 +1,347 @@
+"""
+digitalmeve.hashing
+
+Moteur d'empreinte « une seule passe » : SHA-256, aperçu (premiers octets)
+et taille calculés à partir d'un unique descripteur ouvert.
+
+- petits fichiers : une lecture (tampon dimensionné sur la taille) ;
+- fichiers moyens : `readinto` dans un tampon réutilisé (64 KiB → 1 MiB) ;
+- gros fichiers locaux : `mmap` + indication d'accès séquentiel au noyau.
+
+Mode « tree » (fichiers très volumineux) : le fichier est découpé en blocs
+de `chunk_size` octets hachés en parallèle ; la racine est
+  leaf_i = H(0x00 || bloc_i)
+  root   = H(0x01 || leaf_0 || leaf_1 || ...)
+
+H est choisi dans un registre d'algorithmes (SHA-256 par défaut, BLAKE2b,
+BLAKE3 si le paquet `blake3` est installé…). Une preuve SHA-256 garde le
+champ historique `subject.hash_sha256` ; les autres algorithmes sont
+enregistrés dans `subject.hash_alg` + `subject.digest`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+try:  # BLAKE3 (optionnel)
+    import blake3 as _blake3  # type: ignore
+except ImportError:  # pragma: no cover
+    _blake3 = None  # type: ignore
+
+__all__ = [
+    "DEFAULT_ALGORITHM",
+    "DEFAULT_CHUNK_SIZE",
+    "HASH_MODES",
+    "FileDigest",
+    "TreeDigest",
+    "algorithms",
+    "digest_file",
+    "digest_stream",
+    "new_hasher",
+    "register_algorithm",
+    "subject_digest",
+    "tree_digest",
+    "tree_root",
+]
+
+HASH_MODES = ("plain", "tree")
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_ALGORITHM = "sha256"
+
+# nom -> fabrique d'objet « hashlib-like » (update/digest/hexdigest)
+_ALGORITHMS: Dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "blake2b": hashlib.blake2b,
+}
+if _blake3 is not None:  # pragma: no cover - dépend de l'environnement
+    _ALGORITHMS["blake3"] = _blake3.blake3
+
+_MIN_BUFFER = 64 * 1024
+_MAX_BUFFER = 1024 * 1024
+_MMAP_THRESHOLD = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class FileDigest:
+    """Résultat d'une passe de hachage."""
+
+    hexdigest: str
+    preview: bytes
+    size: int
+
+
+def register_algorithm(name: str, factory: Callable[[], Any]) -> None:
+    """Enregistre (ou remplace) un algorithme : `factory()` -> objet hashlib-like."""
+    _ALGORITHMS[name] = factory
+
+
+def algorithms() -> Tuple[str, ...]:
+    """Noms des algorithmes disponibles."""
+    return tuple(_ALGORITHMS)
+
+
+def new_hasher(algorithm: str = DEFAULT_ALGORITHM, data: bytes = b"") -> Any:
+    """Nouvel objet de hachage ; ValueError si l'algorithme est inconnu."""
+    try:
+        h = _ALGORITHMS[algorithm]()
+    except KeyError:
+        raise ValueError(f"unsupported hash algorithm: {algorithm}") from None
+    if data:
+        h.update(data)
+    return h
+
+
+def subject_digest(subject: Mapping[str, Any]) -> Tuple[str, Any]:
+    """(algorithme, empreinte hex) enregistrés dans le `subject` d'une preuve."""
+    if "hash_alg" in subject:
+        return subject["hash_alg"], subject.get("digest")
+    return DEFAULT_ALGORITHM, subject.get("hash_sha256")
+
+
+def _buffer_size(size: int) -> int:
+    """Tampon adaptatif : toute la taille si possible, borné à [64 KiB, 1 MiB]."""
+    return max(_MIN_BUFFER, min(_MAX_BUFFER, size + 1))
+
+
+def _advise_sequential(fd: int) -> None:
+    fadvise = getattr(os, "posix_fadvise", None)
+    if fadvise is None:  # pragma: no cover - non POSIX
+        return
+    try:
+        fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:  # pragma: no cover - FS sans support
+        pass
+
+
+def _digest_mmap(fd: int, size: int, preview_bytes: int, algorithm: str) -> FileDigest:
+    h = new_hasher(algorithm)
+    with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        preview = mm[:preview_bytes]
+        with memoryview(mm) as view:
+            # hashlib relâche le GIL sur les gros tampons : un seul appel suffit
+            h.update(view)
+    return FileDigest(h.hexdigest(), preview, size)
+
+
+def digest_file(
+    path: Union[str, Path],
+    preview_bytes: int = 128,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> FileDigest:
+    """
+    Calcule empreinte (SHA-256 par défaut), aperçu et taille de `path`
+    en une seule ouverture.
+
+    La taille retournée est le nombre d'octets effectivement hachés.
+    Laisse remonter les OSError (FileNotFoundError, PermissionError…).
+    """
+    new_hasher(algorithm)  # algorithme inconnu : échoue avant toute lecture
+    with open(path, "rb", buffering=0) as f:
+        fd = f.fileno()
+        st = os.fstat(fd)
+        _advise_sequential(fd)
+
+        if st.st_size >= _MMAP_THRESHOLD:
+            try:
+                return _digest_mmap(fd, st.st_size, preview_bytes, algorithm)
+            except (OSError, ValueError):
+                # FS ne supportant pas mmap : repli sur la lecture classique
+                f.seek(0)
+
+        return digest_stream(f, preview_bytes, st.st_size, algorithm)
+
+
+def digest_stream(
+    stream: BinaryIO,
+    preview_bytes: int = 128,
+    size_hint: Optional[int] = None,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> FileDigest:
+    """
+    Calcule empreinte, aperçu et taille en une passe sur un flux binaire
+    lisible (fichier, tube, stdin, lecteur d'objet distant…).
+
+    `size_hint` sert uniquement à dimensionner le tampon de lecture.
+    """
+    h = new_hasher(algorithm)
+    buf = bytearray(_buffer_size(size_hint if size_hint is not None else _MAX_BUFFER))
+    view = memoryview(buf)
+    readinto = getattr(stream, "readinto", None)
+    head = b""
+    size = 0
+    while True:
+        if readinto is not None:
+            n = readinto(buf)
+            chunk = view[:n] if n else b""
+        else:
+            chunk = stream.read(len(buf))
+            n = len(chunk)
+        if not n:
+            break
+        h.update(chunk)
+        if len(head) < preview_bytes:
+            head += bytes(chunk[: preview_bytes - len(head)])
+        size += n
+    view.release()
+    return FileDigest(h.hexdigest(), head, size)
+
+
+@dataclass(frozen=True)
+class TreeDigest:
+    """Racine d'un hachage par blocs, avec les empreintes de chaque bloc."""
+
+    hexdigest: str
+    leaves: Tuple[bytes, ...]
+    chunk_size: int
+    preview: bytes
+    size: int
+    reused: int = 0  # blocs repris d'un manifeste précédent
+
+
+def tree_root(leaves: Sequence[bytes], algorithm: str = DEFAULT_ALGORITHM) -> str:
+    h = new_hasher(algorithm, b"\x01")
+    for leaf in leaves:
+        h.update(leaf)
+    return h.hexdigest()
+
+
+def _leaf(data, algorithm: str = DEFAULT_ALGORITHM) -> bytes:
+    h = new_hasher(algorithm, b"\x00")
+    h.update(data)
+    return h.digest()
+
+
+def _reusable_leaves(
+    previous: Optional[Sequence[bytes]],
+    previous_size: int,
+    size: int,
+    chunk_size: int,
+    dirty: Iterable[Tuple[int, int]],
+) -> Dict[int, bytes]:
+    """
+    Blocs repris tels quels : blocs COMPLETS de l'ancienne version, hors
+    plages `dirty` ([début, fin) en octets). Un fichier plus court que
+    l'ancienne version n'est pas un ajout : rien n'est repris.
+    """
+    if not previous or size < previous_size:
+        return {}
+    full = min(previous_size // chunk_size, len(previous))
+    keep = {i: previous[i] for i in range(full)}
+    for start, end in dirty:
+        last = min(full, -(-end // chunk_size))
+        for i in range(max(0, start) // chunk_size, last):
+            keep.pop(i, None)
+    return keep
+
+
+def _hash_chunks(
+    fd: int,
+    size: int,
+    chunk_size: int,
+    indices: Sequence[int],
+    workers: int,
+    preview_bytes: int,
+    algorithm: str,
+) -> Tuple[bytes, Dict[int, bytes]]:
+    """(aperçu, {indice: empreinte}) des blocs `indices`, via mmap si possible."""
+    try:
+        mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # pas de mmap : lectures positionnelles indépendantes par bloc
+        preview = os.pread(fd, preview_bytes, 0)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            computed = pool.map(
+                lambda i: _leaf(os.pread(fd, chunk_size, i * chunk_size), algorithm),
+                indices,
+            )
+            return preview, dict(zip(indices, computed))
+
+    with mm, memoryview(mm) as view:
+
+        def _slice_leaf(i: int) -> bytes:
+            start = i * chunk_size
+            end = start + chunk_size
+            return _leaf(view[start:end], algorithm)
+
+        preview = mm[:preview_bytes]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return preview, dict(zip(indices, pool.map(_slice_leaf, indices)))
+
+
+def tree_digest(
+    path: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    preview_bytes: int = 128,
+    previous: Optional[Sequence[bytes]] = None,
+    previous_size: int = 0,
+    dirty: Optional[Iterable[Tuple[int, int]]] = None,
+    append_only: bool = False,
+    algorithm: str = DEFAULT_ALGORITHM,
+) -> TreeDigest:
+    """
+    Hache `path` par blocs de `chunk_size` octets, en parallèle sur
+    `workers` threads (défaut : nombre de CPU), via des tranches mmap.
+
+    Re-preuve incrémentale : avec `previous` (empreintes des blocs d'une
+    version antérieure de `previous_size` octets), seuls les blocs ajoutés,
+    le dernier bloc partiel et les blocs couvrant `dirty` sont relus.
+    Reprendre un bloc sans le relire n'est sûr que si l'appelant le
+    garantit : soit `append_only=True` (journaux, images disque en
+    croissance), soit `dirty` liste TOUTES les plages modifiées. Sans l'un
+    ou l'autre, `previous` est ignoré et le fichier est haché en entier.
+    Le premier et le dernier bloc repris sont de plus relus par contrôle :
+    la moindre différence provoque un hachage complet.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    new_hasher(algorithm)
+    n = workers or os.cpu_count() or 1
+
+    with open(path, "rb", buffering=0) as f:
+        fd = f.fileno()
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return TreeDigest(tree_root((), algorithm), (), chunk_size, b"", 0)
+
+        count = -(-size // chunk_size)
+        keep = (
+            _reusable_leaves(previous, previous_size, size, chunk_size, dirty or ())
+            if append_only or dirty is not None
+            else {}
+        )
+        # contrôle : bords de la zone reprise relus et comparés au manifeste
+        checks = {i: keep.pop(i) for i in {min(keep), max(keep)}} if keep else {}
+        todo = [i for i in range(count) if i not in keep]
+        preview, fresh = _hash_chunks(
+            fd, size, chunk_size, todo, n, preview_bytes, algorithm
+        )
+        if any(fresh[i] != leaf for i, leaf in checks.items()):
+            # pas un simple ajout : rien n'est repris
+            rest = sorted(keep)
+            keep = {}
+            fresh.update(_hash_chunks(fd, size, chunk_size, rest, n, 0, algorithm)[1])
+
+    leaves = tuple(keep[i] if i in keep else fresh[i] for i in range(count))
+    root = tree_root(leaves, algorithm)
+    return TreeDigest(root, leaves, chunk_size, preview, size, len(keep))
@@ -0,0 +1,456 @@
+"""
+digitalmeve.ledger
+
+Registre de preuves en ajout seul : une alternative aux sidecars pour les
+très nombreux petits fichiers (un fichier segment par dossier ou par
+traitement au lieu d'un `.meve.json` par document).
+
+Format d'un segment :
+  - en-tête  : MAGIC (8 octets) ;
+  - records  : longueur (>I) + CRC32 (>I) + type (1 octet) + données ;
+      * PROOF   : clé (>H + UTF-8) + JSON canonique de la preuve ;
+      * INDEX   : JSON {"names": {clé: offset}, "hashes": {empreinte: offset}} ;
+      * TRAILER : offset (>Q) du dernier record INDEX — toujours en fin de
+                  fichier après une fermeture propre.
+
+Lecture : trailer (17 octets en fin de fichier) -> index -> un seul `seek`
+jusqu'au record de la preuve. Un segment sans trailer valide (arrêt
+brutal) est reconstruit par un parcours séquentiel qui s'arrête au premier
+record tronqué ou corrompu. L'écrivain ne tronque que le dernier record
+interrompu (qui déborde de la fin du fichier) ; un record corrompu au
+milieu du segment lève `LedgerError` plutôt que d'effacer la suite.
+
+Durabilité : `fsync` groupé (tous les `fsync_every` records ou toutes les
+`fsync_interval` secondes) ; seuls les records non encore synchronisés
+peuvent être perdus en cas de panne, jamais les précédents.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple, Union
+
+from .hashing import subject_digest
+from .proof import Proof, ProofLike, proof_bytes
+
+try:  # verrou inter-processus (POSIX)
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX
+    fcntl = None  # type: ignore[assignment]
+
+__all__ = [
+    "DEFAULT_LEDGER_NAME",
+    "LedgerError",
+    "LedgerReader",
+    "LedgerWriter",
+    "Ledgers",
+    "ledger_key",
+    "lookup",
+]
+
+MAGIC = b"MEVELDG\x01"
+# Segment par dossier (suffixe .meve.ledger : jamais pris pour un document)
+DEFAULT_LEDGER_NAME = "proofs.meve.ledger"
+
+_PROOF = 1
+_INDEX = 2
+_TRAILER = 3
+_HEADER = struct.Struct(">IIB")  # longueur, CRC32 (type + données), type
+_KEY_LEN = struct.Struct(">H")
+_OFFSET = struct.Struct(">Q")
+_TRAILER_SIZE = _HEADER.size + _OFFSET.size
+# Segments ouverts simultanément par `Ledgers` (un descripteur chacun)
+_MAX_OPEN = 32
+
+PathLike = Union[str, Path]
+
+
+class LedgerError(ValueError):
+    """Segment illisible (en-tête inconnu, index corrompu…)."""
+
+
+def _crc(kind: int, data: bytes) -> int:
+    return zlib.crc32(data, zlib.crc32(bytes((kind,))))
+
+
+def _frame(kind: int, data: bytes) -> bytes:
+    return _HEADER.pack(len(data), _crc(kind, data), kind) + data
+
+
+def _read_record(f: BinaryIO, offset: int) -> Optional[Tuple[int, bytes]]:
+    """(type, données) du record à `offset`, ou None s'il est tronqué/corrompu."""
+    f.seek(offset)
+    head = f.read(_HEADER.size)
+    if len(head) < _HEADER.size:
+        return None
+    length, crc, kind = _HEADER.unpack(head)
+    data = f.read(length)
+    if len(data) < length or _crc(kind, data) != crc:
+        return None
+    return kind, data
+
+
+def _runs_past_eof(f: BinaryIO, offset: int, size: int) -> bool:
+    """True si le record à `offset` déborde de la fin du fichier (ajout interrompu)."""
+    f.seek(offset)
+    head = f.read(_HEADER.size)
+    if len(head) < _HEADER.size:
+        return True
+    return offset + _HEADER.size + _HEADER.unpack(head)[0] > size
+
+
+def _split_proof(data: bytes) -> Tuple[str, bytes]:
+    (n,) = _KEY_LEN.unpack_from(data)
+    end = _KEY_LEN.size + n
+    return data[_KEY_LEN.size : end].decode("utf-8"), data[end:]  # noqa: E203
+
+
+def _digest_of(proof: ProofLike) -> Optional[str]:
+    if isinstance(proof, Proof):
+        return proof.subject.digest
+    return subject_digest(proof.get("subject") or {})[1]
+
+
+def ledger_key(ledger: PathLike, document: PathLike) -> str:
+    """
+    Clé d'un document dans un segment : chemin relatif au dossier du segment
+    (séparateurs « / »), ou chemin absolu si le document est ailleurs.
+    Purement lexical (`os.path.abspath`, pas de `resolve`) : les liens
+    symboliques ne sont pas suivis ; seul un chemin relatif coûte un
+    `getcwd`.
+    """
+    base = os.path.dirname(os.path.abspath(ledger))
+    doc = os.path.abspath(document)
+    rel = os.path.relpath(doc, base)
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+        return Path(doc).as_posix()
+    return Path(rel).as_posix()
+
+
+class _Index:
+    __slots__ = ("names", "hashes", "end")
+
+    def __init__(self) -> None:
+        self.names: Dict[str, int] = {}
+        self.hashes: Dict[str, int] = {}
+        self.end = len(MAGIC)  # fin du dernier record valide
+
+    def to_bytes(self) -> bytes:
+        return json.dumps(
+            {"names": self.names, "hashes": self.hashes},
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+
+def _load_index(f: BinaryIO, size: int) -> Tuple[_Index, bool]:
+    """(index, trailer valide ?) du segment ouvert `f` de taille `size`."""
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise LedgerError("not a MEVE ledger")
+    index = _Index()
+    if size >= len(MAGIC) + _TRAILER_SIZE:
+        trailer = _read_record(f, size - _TRAILER_SIZE)
+        if trailer is not None and trailer[0] == _TRAILER:
+            (at,) = _OFFSET.unpack(trailer[1])
+            rec = _read_record(f, at)
+            if rec is not None and rec[0] == _INDEX:
+                try:
+                    data = json.loads(rec[1])
+                    index.names = {k: int(v) for k, v in data["names"].items()}
+                    index.hashes = {k: int(v) for k, v in data["hashes"].items()}
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    pass
+                else:
+                    index.end = size
+                    return index, True
+
+    # reprise après arrêt brutal : parcours jusqu'au premier record invalide
+    pos = len(MAGIC)
+    while pos < size:
+        rec = _read_record(f, pos)
+        if rec is None:
+            break
+        kind, data = rec
+        if kind == _PROOF:
+            try:
+                key, body = _split_proof(data)
+                digest = subject_digest(json.loads(body).get("subject") or {})[1]
+            except (UnicodeDecodeError, ValueError, AttributeError, struct.error):
+                break
+            index.names[key] = pos
+            if isinstance(digest, str):
+                index.hashes[digest] = pos
+        pos += _HEADER.size + len(data)
+    index.end = pos
+    return index, False
+
+
+class LedgerWriter:
+    """
+    Écrivain d'un segment (créé au besoin) ; sûr entre threads.
+    `close()` (ou la sortie du bloc `with`) écrit l'index et le trailer.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        *,
+        fsync_every: int = 256,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._f: BinaryIO = open(self.path, "r+b")
+        except FileNotFoundError:
+            self._f = open(self.path, "w+b")
+        try:
+            self._open()
+        except BaseException:
+            self._f.close()
+            raise
+
+    def _open(self) -> None:
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                raise LedgerError(f"ledger in use: {self.path}") from None
+        size = os.fstat(self._f.fileno()).st_size
+        if size == 0:
+            self._f.write(MAGIC)
+            self._index = _Index()
+            self._sync()
+            _fsync_dir(self.path.parent)
+        else:
+            self._index, _ = _load_index(self._f, size)
+            end = self._index.end
+            if end < size:
+                # seul un dernier record tronqué (arrêt brutal) est retiré ;
+                # un record corrompu au milieu du segment n'efface rien
+                if not _runs_past_eof(self._f, end, size):
+                    raise LedgerError(f"corrupted record at offset {end}: {self.path}")
+                self._f.truncate(end)
+        self._f.seek(self._index.end)
+
+    def append(self, proof: ProofLike, key: str) -> int:
+        """Ajoute la preuve sous `key` ; retourne l'offset du record."""
+        raw_key = key.encode("utf-8")
+        record = _frame(
+            _PROOF, _KEY_LEN.pack(len(raw_key)) + raw_key + proof_bytes(proof)
+        )
+        digest = _digest_of(proof)
+        with self._lock:
+            offset = self._index.end
+            self._f.write(record)
+            self._index.end += len(record)
+            self._index.names[key] = offset
+            if isinstance(digest, str):
+                self._index.hashes[digest] = offset
+            self._unsynced += 1
+            due = self._last_sync + self.fsync_interval <= time.monotonic()
+            if due or self._unsynced >= self.fsync_every:
+                self._sync()
+        return offset
+
+    def _sync(self) -> None:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f.closed:
+                return
+            at = self._index.end
+            index = _frame(_INDEX, self._index.to_bytes())
+            self._f.write(index)
+            self._f.write(_frame(_TRAILER, _OFFSET.pack(at)))
+            self._sync()
+            self._f.close()
+
+    def __enter__(self) -> "LedgerWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - plateformes sans fsync de dossier
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+class Ledgers:
+    """
+    Écrivains d'un traitement : un segment unique (`path`) ou, sans `path`,
+    un segment `DEFAULT_LEDGER_NAME` par dossier (dans `outdir` si fourni).
+
+    Au plus `max_open` segments restent ouverts (descripteur + verrou) : au
+    delà, le moins récemment utilisé parmi les inactifs est fermé (index et
+    trailer écrits) puis rouvert en ajout s'il resservait. Les fichiers d'un
+    même dossier se suivant dans un parcours, ces réouvertures sont rares.
+    """
+
+    def __init__(
+        self,
+        path: Optional[PathLike] = None,
+        *,
+        max_open: int = _MAX_OPEN,
+        **options: Any,
+    ) -> None:
+        self.path = None if path is None else Path(path)
+        self.max_open = max(1, max_open)
+        self._options = options
+        self._writers: "OrderedDict[Path, LedgerWriter]" = OrderedDict()
+        self._busy: Dict[Path, int] = {}  # appends en cours par segment
+        self._lock = threading.Lock()
+
+    def _acquire(self, target: Path) -> LedgerWriter:
+        with self._lock:
+            w = self._writers.get(target)
+            if w is None:
+                self._evict()
+                w = self._writers[target] = LedgerWriter(target, **self._options)
+            else:
+                self._writers.move_to_end(target)
+            self._busy[target] = self._busy.get(target, 0) + 1
+        return w
+
+    def _release(self, target: Path) -> None:
+        with self._lock:
+            self._busy[target] -= 1
+            if not self._busy[target]:
+                del self._busy[target]
+
+    def _evict(self) -> None:
+        # sous self._lock : un segment fermé ici ne peut être rouvert qu'après
+        for target in list(self._writers):
+            if len(self._writers) < self.max_open:
+                return
+            if target not in self._busy:
+                self._writers.pop(target).close()
+
+    def append(
+        self, document: Path, proof: ProofLike, outdir: Optional[Path] = None
+    ) -> Path:
+        """Ajoute la preuve de `document` ; retourne le chemin du segment."""
+        target = self.path or (outdir or document.parent) / DEFAULT_LEDGER_NAME
+        w = self._acquire(target)
+        try:
+            w.append(proof, ledger_key(target, document))
+        finally:
+            self._release(target)
+        return target
+
+    def close(self) -> None:
+        with self._lock:
+            writers, self._writers = list(self._writers.values()), OrderedDict()
+        for w in writers:
+            w.close()
+
+    def __enter__(self) -> "Ledgers":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class LedgerReader:
+    """Lecture d'un segment : index chargé une fois, une preuve = un `seek`."""
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._index, self.complete = _load_index(f, os.fstat(f.fileno()).st_size)
+
+    def __len__(self) -> int:
+        return len(self._index.names)
+
+    def _proof_at(self, offset: int) -> Optional[Dict[str, Any]]:
+        with open(self.path, "rb") as f:
+            rec = _read_record(f, offset)
+        if rec is None or rec[0] != _PROOF:
+            return None
+        try:
+            obj = json.loads(_split_proof(rec[1])[1])
+        except (UnicodeDecodeError, ValueError, struct.error):
+            return None
+        return obj if isinstance(obj, dict) else None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Dernière preuve enregistrée sous `key`, ou None."""
+        offset = self._index.names.get(key)
+        return None if offset is None else self._proof_at(offset)
+
+    def find_hash(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Dernière preuve dont l'empreinte du sujet vaut `digest`, ou None."""
+        offset = self._index.hashes.get(digest.lower())
+        return None if offset is None else self._proof_at(offset)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._index.names)
+
+
+# Lecteurs mis en cache par segment, invalidés si taille/mtime changent
+_READERS: Dict[str, Tuple[Tuple[int, int], LedgerReader]] = {}
+_READERS_LOCK = threading.Lock()
+
+
+def _reader(path: Path) -> Optional[LedgerReader]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    sig = (st.st_size, st.st_mtime_ns)
+    key = os.fspath(path)
+    with _READERS_LOCK:
+        cached = _READERS.get(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    try:
+        reader = LedgerReader(path)
+    except (OSError, LedgerError):
+        return None
+    with _READERS_LOCK:
+        _READERS[key] = (sig, reader)
+    return reader
+
+
+def lookup(
+    document: PathLike, ledger: Optional[PathLike] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Preuve de `document` dans `ledger` (défaut : `DEFAULT_LEDGER_NAME` du
+    dossier du document), ou None. L'index du segment est gardé en mémoire
+    entre deux appels tant que le fichier n'a pas changé.
+    """
+    doc = Path(document)
+    path = Path(ledger) if ledger is not None else doc.parent / DEFAULT_LEDGER_NAME
+    reader = _reader(path)
+    if reader is None:
+        return None
+    return reader.get(ledger_key(path, doc))
@@ -0,0 +1,79 @@
+"""
+digitalmeve.parallel
+
+Exécution par lot avec un nombre borné de tâches en vol : les résultats
+sont produits au fil de l'eau (ordre de complétion), sans matérialiser
+toute la liste d'entrées ni un futur par fichier.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Iterable, Iterator, Optional, Set, TypeVar
+
+__all__ = ["default_workers", "imap_unordered"]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Nombre de tâches soumises d'avance par worker
+_PREFETCH = 4
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def imap_unordered(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    workers: Optional[int] = None,
+    processes: bool = False,
+) -> Iterator[R]:
+    """
+    Applique `fn` à chaque élément de `items` et produit les résultats
+    dans l'ordre de complétion.
+
+    - workers   : taille du pool (défaut : nombre de CPU) ; 1 = séquentiel
+    - processes : pool de processus (pour le travail qui garde le GIL) ;
+                  `fn` et les résultats doivent alors être picklables
+    """
+    n = workers or default_workers()
+    if n <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    pool: Executor
+    if processes:
+        # multiprocessing n'est chargé que pour le mode processus
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=n)
+    else:
+        pool = ThreadPoolExecutor(max_workers=n, thread_name_prefix="digitalmeve")
+
+    limit = n * _PREFETCH
+    pending: Set[Future] = set()
+    try:
+        for item in items:
+            pending.add(pool.submit(fn, item))
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+    finally:
+        # consommateur interrompu : on n'exécute pas le reste de la file
+        pool.shutdown(wait=True, cancel_futures=True)
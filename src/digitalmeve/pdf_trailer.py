@@ -0,0 +1,523 @@
+"""
+digitalmeve.pdf_trailer
+
+Lecteur PDF minimal, sans dépendance : retrouve une entrée du dictionnaire
+/Info (DocInfo) en ne lisant que la fin du fichier et les quelques objets
+nécessaires, via `mmap`.
+
+  1) dernier `startxref` -> section xref la plus récente ;
+  2) trailer (table classique ou flux /XRef) -> référence /Info ;
+  3) offset de l'objet Info (sections /Prev, /XRefStm, flux d'objets) ;
+  4) lecture de la seule entrée demandée.
+
+Le coût ne dépend pas du nombre de pages. Toute structure non gérée
+(document chiffré, filtre inconnu, offsets incohérents…) lève
+`PdfTrailerError` : l'appelant se replie alors sur pikepdf.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+__all__ = ["PdfTrailerError", "decode_pdf_text", "read_info_string"]
+
+
+class PdfTrailerError(ValueError):
+    """Structure PDF non gérée par le lecteur rapide."""
+
+
+class _Name(str):
+    """Nom PDF (sans le « / » initial)."""
+
+
+class _Ref(tuple):
+    """Référence indirecte (numéro, génération)."""
+
+
+Buffer = Union[bytes, mmap.mmap]
+
+_WS = b" \t\r\n\f\x00"
+_TOKEN = re.compile(rb"[^\s()<>\[\]{}/%\x00]+")
+_INT_REF = re.compile(rb"(\d+)\s+(\d+)\s+R(?![^\s()<>\[\]{}/%])")
+_OBJ_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+_XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_SUBSECTION = re.compile(rb"\s*(\d+)\s+(\d+)\s*?(?:\r\n|\r|\n)")
+_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_ESCAPES = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+    ord("("): b"(",
+    ord(")"): b")",
+    ord("\\"): b"\\",
+}
+_MAX_SECTIONS = 256  # garde-fou contre les chaînes /Prev cycliques
+
+# PDFDocEncoding : écarts par rapport à Latin-1 (ISO 32000-1, annexe D)
+_PDFDOC = {
+    0x18: "˘",
+    0x19: "ˇ",
+    0x1A: "ˆ",
+    0x1B: "˙",
+    0x1C: "˝",
+    0x1D: "˛",
+    0x1E: "˚",
+    0x1F: "˜",
+    0x80: "•",
+    0x81: "†",
+    0x82: "‡",
+    0x83: "…",
+    0x84: "—",
+    0x85: "–",
+    0x86: "ƒ",
+    0x87: "⁄",
+    0x88: "‹",
+    0x89: "›",
+    0x8A: "−",
+    0x8B: "‰",
+    0x8C: "„",
+    0x8D: "“",
+    0x8E: "”",
+    0x8F: "‘",
+    0x90: "’",
+    0x91: "‚",
+    0x92: "™",
+    0x93: "ﬁ",
+    0x94: "ﬂ",
+    0x95: "Ł",
+    0x96: "Œ",
+    0x97: "Š",
+    0x98: "Ÿ",
+    0x99: "Ž",
+    0x9A: "ı",
+    0x9B: "ł",
+    0x9C: "œ",
+    0x9D: "š",
+    0x9E: "ž",
+    0xA0: "€",
+}
+_PDFDOC_TABLE = {i: _PDFDOC.get(i, chr(i)) for i in range(256)}
+
+
+def decode_pdf_text(raw: bytes) -> str:
+    """Chaîne texte PDF : UTF-16BE (BOM), UTF-8 (BOM, PDF 2.0) ou PDFDocEncoding."""
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be")
+    if raw.startswith(b"\xef\xbb\xbf"):
+        return raw[3:].decode("utf-8")
+    return raw.decode("latin-1").translate(_PDFDOC_TABLE)
+
+
+# --------------------------------------------------------------------------- #
+# Analyse lexicale / syntaxique (objets PDF)
+# --------------------------------------------------------------------------- #
+
+
+def _skip_ws(buf: Buffer, pos: int) -> int:
+    n = len(buf)
+    while pos < n:
+        c = buf[pos]
+        if c in _WS:
+            pos += 1
+        elif c == 0x25:  # « % » : commentaire jusqu'à la fin de ligne
+            while pos < n and buf[pos] not in b"\r\n":
+                pos += 1
+        else:
+            break
+    return pos
+
+
+def _literal_string(buf: Buffer, pos: int) -> Tuple[bytes, int]:
+    out = bytearray()
+    depth = 1
+    n = len(buf)
+    pos += 1
+    while pos < n:
+        c = buf[pos]
+        if c == 0x5C:  # « \ »
+            pos += 1
+            e = buf[pos]
+            if e in _ESCAPES:
+                out += _ESCAPES[e]
+                pos += 1
+            elif 0x30 <= e <= 0x37:  # octal, jusqu'à 3 chiffres
+                end = pos
+                while end < pos + 3 and 0x30 <= buf[end] <= 0x37:
+                    end += 1
+                out.append(int(bytes(buf[pos:end]), 8) & 0xFF)
+                pos = end
+            elif e in b"\r\n":  # continuation de ligne
+                pos += 2 if buf[pos : pos + 2] == b"\r\n" else 1  # noqa: E203
+            else:
+                out.append(e)
+                pos += 1
+            continue
+        if c == 0x28:
+            depth += 1
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos + 1
+        out.append(c)
+        pos += 1
+    raise PdfTrailerError("unterminated string")
+
+
+def _parse(buf: Buffer, pos: int) -> Tuple[Any, int]:
+    """Objet PDF à `pos` -> (valeur, position suivante)."""
+    pos = _skip_ws(buf, pos)
+    c = buf[pos : pos + 2]  # noqa: E203
+    if c == b"<<":
+        d: Dict[str, Any] = {}
+        pos += 2
+        while True:
+            pos = _skip_ws(buf, pos)
+            if buf[pos : pos + 2] == b">>":  # noqa: E203
+                return d, pos + 2
+            key, pos = _parse(buf, pos)
+            if not isinstance(key, _Name):
+                raise PdfTrailerError("dictionary key is not a name")
+            d[key], pos = _parse(buf, pos)
+    if c[:1] == b"[":
+        items: List[Any] = []
+        pos += 1
+        while True:
+            pos = _skip_ws(buf, pos)
+            if buf[pos] == 0x5D:  # « ] »
+                return items, pos + 1
+            item, pos = _parse(buf, pos)
+            items.append(item)
+    if c[:1] == b"(":
+        return _literal_string(buf, pos)
+    if c[:1] == b"<":
+        end = buf.find(b">", pos)
+        if end < 0:
+            raise PdfTrailerError("unterminated hex string")
+        digits = re.sub(rb"\s", b"", bytes(buf[pos + 1 : end]))  # noqa: E203
+        if len(digits) % 2:
+            digits += b"0"
+        return bytes.fromhex(digits.decode("ascii")), end + 1
+    if c[:1] == b"/":
+        m = _TOKEN.match(buf, pos + 1)
+        raw = m.group(0) if m else b""
+        name = re.sub(
+            rb"#([0-9A-Fa-f]{2})", lambda x: bytes.fromhex(x[1].decode()), raw
+        )
+        return _Name(name.decode("latin-1")), pos + 1 + len(raw)
+    ref = _INT_REF.match(buf, pos)
+    if ref:
+        return _Ref((int(ref.group(1)), int(ref.group(2)))), ref.end()
+    m = _TOKEN.match(buf, pos)
+    if not m:
+        raise PdfTrailerError(f"unexpected byte at {pos}")
+    tok = m.group(0)
+    if tok == b"true":
+        return True, m.end()
+    if tok == b"false":
+        return False, m.end()
+    if tok == b"null":
+        return None, m.end()
+    try:
+        return (float(tok) if b"." in tok else int(tok)), m.end()
+    except ValueError:
+        raise PdfTrailerError(f"unexpected token {tok!r}") from None
+
+
+# --------------------------------------------------------------------------- #
+# Flux (xref streams, object streams)
+# --------------------------------------------------------------------------- #
+
+
+def _unpredict(data: bytes, columns: int) -> bytes:
+    """Prédicteurs PNG (Predictor >= 10), 1 composante de 8 bits."""
+    row = columns + 1
+    if len(data) % row:
+        raise PdfTrailerError("bad predictor row size")
+    out = bytearray()
+    prev = bytearray(columns)
+    for start in range(0, len(data), row):
+        ftype = data[start]
+        cur = bytearray(data[start + 1 : start + row])  # noqa: E203
+        for i in range(columns):
+            left = cur[i - 1] if i else 0
+            up = prev[i]
+            if ftype == 1:
+                cur[i] = (cur[i] + left) & 0xFF
+            elif ftype == 2:
+                cur[i] = (cur[i] + up) & 0xFF
+            elif ftype == 3:
+                cur[i] = (cur[i] + ((left + up) >> 1)) & 0xFF
+            elif ftype == 4:
+                ul = prev[i - 1] if i else 0
+                p = left + up - ul
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - ul)
+                pred = left if pa <= pb and pa <= pc else (up if pb <= pc else ul)
+                cur[i] = (cur[i] + pred) & 0xFF
+            elif ftype != 0:
+                raise PdfTrailerError(f"unknown PNG predictor {ftype}")
+        out += cur
+        prev = cur
+    return bytes(out)
+
+
+def _stream_data(buf: Buffer, d: Dict[str, Any], pos: int) -> bytes:
+    """Contenu décodé du flux dont le dictionnaire `d` se termine à `pos`."""
+    pos = _skip_ws(buf, pos)
+    if buf[pos : pos + 6] != b"stream":  # noqa: E203
+        raise PdfTrailerError("stream keyword expected")
+    pos += 6
+    pos += 2 if buf[pos : pos + 2] == b"\r\n" else 1  # noqa: E203
+    length = d.get("Length")
+    if not isinstance(length, int):  # longueur indirecte : borne par endstream
+        end = buf.find(b"endstream", pos)
+        if end < 0:
+            raise PdfTrailerError("endstream not found")
+        length = end - pos
+    data = bytes(buf[pos : pos + length])  # noqa: E203
+
+    filters = d.get("Filter")
+    filters = [filters] if isinstance(filters, str) else (filters or [])
+    parms = d.get("DecodeParms")
+    if isinstance(parms, list):
+        parms = parms[0] if parms else None
+    for f in filters:
+        if f != "FlateDecode":
+            raise PdfTrailerError(f"unsupported filter {f}")
+        try:
+            data = zlib.decompress(data)
+        except zlib.error:
+            try:
+                data = zlib.decompressobj().decompress(data)  # fin tronquée/bruitée
+            except zlib.error as e:
+                raise PdfTrailerError(f"corrupt FlateDecode stream: {e}") from e
+    if isinstance(parms, dict):
+        predictor = parms.get("Predictor", 1)
+        if predictor >= 10:
+            if parms.get("Colors", 1) != 1 or parms.get("BitsPerComponent", 8) != 8:
+                raise PdfTrailerError("unsupported predictor parameters")
+            data = _unpredict(data, parms.get("Columns", 1))
+        elif predictor != 1:
+            raise PdfTrailerError(f"unsupported predictor {predictor}")
+    return data
+
+
+# --------------------------------------------------------------------------- #
+# Tables de références croisées
+# --------------------------------------------------------------------------- #
+
+# (1, offset) objet en clair ; (2, numéro du flux d'objets, index)
+_Location = Tuple[int, int, int]
+
+
+class _Reader:
+    def __init__(self, buf: Buffer) -> None:
+        self.buf = buf
+        self._objstm: Dict[int, Tuple[bytes, Dict[int, int]]] = {}
+        self._locators: List[Any] = []
+
+    # -- sections xref --------------------------------------------------- #
+
+    def section(self, offset: int) -> Tuple[Dict[str, Any], Any]:
+        """(trailer, localisateur d'objets) de la section xref à `offset`."""
+        buf = self.buf
+        pos = _skip_ws(buf, offset)
+        if buf[pos : pos + 4] == b"xref":  # noqa: E203
+            return self._classic(pos + 4)
+        m = _OBJ_HEADER.match(buf, pos)
+        if not m:
+            raise PdfTrailerError("no xref at startxref offset")
+        d, end = _parse(buf, m.end())
+        if not isinstance(d, dict) or d.get("Type") != "XRef":
+            raise PdfTrailerError("object at startxref is not an XRef stream")
+        return d, self._stream_locator(d, _stream_data(buf, d, end))
+
+    def _classic(self, pos: int) -> Tuple[Dict[str, Any], Any]:
+        buf = self.buf
+        subsections: List[Tuple[int, int, int]] = []
+        while True:
+            pos = _skip_ws(buf, pos)
+            if buf[pos : pos + 7] == b"trailer":  # noqa: E203
+                break
+            m = _SUBSECTION.match(buf, pos)
+            if not m:
+                raise PdfTrailerError("malformed xref subsection")
+            start, count = int(m.group(1)), int(m.group(2))
+            subsections.append((start, count, m.end()))
+            pos = m.end() + 20 * count
+        trailer, _ = _parse(buf, pos + 7)
+        if not isinstance(trailer, dict):
+            raise PdfTrailerError("malformed trailer")
+
+        def locate(num: int) -> Optional[_Location]:
+            for start, count, base in subsections:
+                if start <= num < start + count:
+                    at = base + 20 * (num - start)
+                    e = _XREF_ENTRY.match(buf, at)
+                    if not e:
+                        raise PdfTrailerError("malformed xref entry")
+                    if e.group(3) == b"f":
+                        return None
+                    return 1, int(e.group(1)), 0
+            return None
+
+        return trailer, locate
+
+    @staticmethod
+    def _stream_locator(d: Dict[str, Any], data: bytes) -> Any:
+        widths = d.get("W")
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise PdfTrailerError("bad /W in XRef stream")
+        w1, w2, w3 = widths
+        row = w1 + w2 + w3
+        index = d.get("Index") or [0, d.get("Size", 0)]
+
+        def field(at: int, width: int, default: int = 0) -> int:
+            if width == 0:
+                return default
+            return int.from_bytes(data[at : at + width], "big")  # noqa: E203
+
+        def locate(num: int) -> Optional[_Location]:
+            base = 0
+            for start, count in zip(index[::2], index[1::2]):
+                if start <= num < start + count:
+                    at = (base + num - start) * row
+                    if at + row > len(data):
+                        raise PdfTrailerError("XRef stream too short")
+                    kind = field(at, w1, 1)
+                    if kind == 0:
+                        return None
+                    return kind, field(at + w1, w2), field(at + w1 + w2, w3)
+                base += count
+            return None
+
+        return locate
+
+    # -- objets ---------------------------------------------------------- #
+
+    def object_at(self, loc: _Location, num: int) -> Any:
+        kind, a, b = loc
+        if kind == 1:
+            m = _OBJ_HEADER.match(self.buf, a)
+            if not m or int(m.group(1)) != num:
+                raise PdfTrailerError(f"object {num} not at its xref offset")
+            return _parse(self.buf, m.end())[0]
+        if kind == 2:
+            data, offsets = self._object_stream(a)
+            if num not in offsets:
+                raise PdfTrailerError(f"object {num} missing from object stream")
+            return _parse(data, offsets[num])[0]
+        raise PdfTrailerError(f"unknown xref entry type {kind}")
+
+    def _object_stream(self, stm: int) -> Tuple[bytes, Dict[int, int]]:
+        if stm not in self._objstm:
+            loc = self.locate(stm)
+            if loc is None or loc[0] != 1:
+                raise PdfTrailerError("object stream not found")
+            m = _OBJ_HEADER.match(self.buf, loc[1])
+            if not m:
+                raise PdfTrailerError("object stream not at its xref offset")
+            d, end = _parse(self.buf, m.end())
+            data = _stream_data(self.buf, d, end)
+            first, count = d.get("First"), d.get("N")
+            if not isinstance(first, int) or not isinstance(count, int):
+                raise PdfTrailerError("bad object stream header")
+            header = [int(x) for x in data[:first].split()]
+            offsets = {header[2 * i]: first + header[2 * i + 1] for i in range(count)}
+            self._objstm[stm] = (data, offsets)
+        return self._objstm[stm]
+
+    # -- chaîne des révisions -------------------------------------------- #
+
+    def load(self) -> Dict[str, Any]:
+        """Lit la chaîne des sections (plus récente d'abord) ; retourne le trailer."""
+        m = None
+        for m in _STARTXREF.finditer(self.buf, max(0, len(self.buf) - 4096)):
+            pass
+        if m is None:
+            raise PdfTrailerError("startxref not found")
+        trailer: Optional[Dict[str, Any]] = None
+        offset: Optional[int] = int(m.group(1))
+        seen = set()
+        while offset is not None:
+            if offset in seen or len(seen) >= _MAX_SECTIONS:
+                raise PdfTrailerError("cyclic /Prev chain")
+            seen.add(offset)
+            t, locate = self.section(offset)
+            self._locators.append(locate)
+            stm = t.get("XRefStm")  # fichier hybride
+            if isinstance(stm, int):
+                self._locators.append(self.section(stm)[1])
+            if trailer is None:
+                trailer = t
+            prev = t.get("Prev")
+            offset = prev if isinstance(prev, int) else None
+        assert trailer is not None
+        return trailer
+
+    def locate(self, num: int) -> Optional[_Location]:
+        for locate in self._locators:
+            loc = locate(num)
+            if loc is not None:
+                return loc
+        return None
+
+    def resolve(self, value: Any) -> Any:
+        if isinstance(value, _Ref):
+            loc = self.locate(value[0])
+            return None if loc is None else self.object_at(loc, value[0])
+        return value
+
+
+def read_info_string(source: Union[str, Path, BinaryIO], key: str) -> Optional[str]:
+    """
+    Valeur texte de l'entrée `key` (sans « / ») du dictionnaire /Info du PDF,
+    ou None si absente. PdfTrailerError si le lecteur rapide ne peut conclure.
+
+    `source` : chemin, ou fichier binaire déjà ouvert (projeté via `fileno`
+    lorsqu'il en a un, lu en mémoire sinon).
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return read_info_string(f, key)
+    try:
+        fd = source.fileno()
+    except (AttributeError, OSError):  # flux en mémoire (BytesIO…)
+        source.seek(0)
+        return _info_string(source.read(), key)
+    try:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except ValueError:  # fichier vide
+        raise PdfTrailerError("empty file") from None
+    with mm:
+        return _info_string(mm, key)
+
+
+def _info_string(buf: Buffer, key: str) -> Optional[str]:
+    try:
+        reader = _Reader(buf)
+        trailer = reader.load()
+        if "Encrypt" in trailer:
+            raise PdfTrailerError("encrypted document")
+        info = reader.resolve(trailer.get("Info"))
+        if info is None:
+            return None
+        if not isinstance(info, dict):
+            raise PdfTrailerError("/Info is not a dictionary")
+        value = reader.resolve(info.get(key))
+    except PdfTrailerError:
+        raise
+    except (IndexError, KeyError, TypeError, ValueError, RecursionError) as e:
+        # fichier tronqué / syntaxe inattendue / imbrication démesurée :
+        # laisser pikepdf conclure
+        raise PdfTrailerError(f"{type(e).__name__}: {e}") from e
+    if value is None:
+        return None
+    if not isinstance(value, bytes):
+        raise PdfTrailerError(f"/{key} is not a string")
+    return decode_pdf_text(value)
@@ -0,0 +1,160 @@
+"""
+digitalmeve.proof
+
+Représentation compacte d'une preuve MEVE : dataclasses à `__slots__`,
+champs `subject` typés, sérialisation JSON canonique (voir
+`digitalmeve.canonical`) calculée une seule fois puis réutilisée
+(sidecars, PDF, PNG).
+
+Interopérabilité : `Proof.from_dict` / `Proof.to_dict` (clés inconnues
+conservées dans `extra`) ; `proof_json` / `proof_bytes` acceptent
+indifféremment un `Proof` ou un dict.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Union
+
+from .canonical import canonical_bytes, canonical_json
+from .hashing import DEFAULT_ALGORITHM
+
+__all__ = ["Proof", "ProofLike", "Subject", "proof_bytes", "proof_json"]
+
+_SUBJECT_KEYS = frozenset(
+    {"filename", "size", "hash_sha256", "hash_alg", "digest", "hash_mode", "chunk_size"}
+)
+_PROOF_KEYS = frozenset(
+    {
+        "meve_version",
+        "issuer",
+        "issued_at",
+        "timestamp",
+        "metadata",
+        "subject",
+        "hash",
+        "preview_b64",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Subject:
+    """Document décrit par la preuve."""
+
+    filename: str
+    size: int
+    digest: str
+    hash_alg: str = DEFAULT_ALGORITHM
+    hash_mode: Optional[str] = None
+    chunk_size: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Subject":
+        if "hash_alg" in data:
+            alg, digest = data["hash_alg"], data["digest"]
+        else:
+            alg, digest = DEFAULT_ALGORITHM, data["hash_sha256"]
+        return cls(
+            filename=data["filename"],
+            size=data["size"],
+            digest=digest,
+            hash_alg=alg,
+            hash_mode=data.get("hash_mode"),
+            chunk_size=data.get("chunk_size"),
+            extra={k: v for k, v in data.items() if k not in _SUBJECT_KEYS},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {"filename": self.filename, "size": self.size}
+        # SHA-256 : champ historique hash_sha256 ; sinon hash_alg + digest
+        if self.hash_alg == DEFAULT_ALGORITHM:
+            d["hash_sha256"] = self.digest
+        else:
+            d["hash_alg"] = self.hash_alg
+            d["digest"] = self.digest
+        if self.hash_mode is not None:
+            d["hash_mode"] = self.hash_mode
+        if self.chunk_size is not None:
+            d["chunk_size"] = self.chunk_size
+        d.update(self.extra)
+        return d
+
+
+@dataclass(frozen=True, slots=True)
+class Proof:
+    """
+    Preuve MEVE immuable. `to_json()` / `to_bytes()` sont calculés au
+    premier appel puis mis en cache sur l'instance.
+    """
+
+    meve_version: str
+    issuer: str
+    timestamp: str
+    subject: Subject
+    hash: str
+    issued_at: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    preview_b64: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _bytes: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Proof":
+        """KeyError si une clé requise manque (voir `verify_meve`)."""
+        return cls(
+            meve_version=data["meve_version"],
+            issuer=data["issuer"],
+            timestamp=data["timestamp"],
+            subject=Subject.from_dict(data["subject"]),
+            hash=data["hash"],
+            issued_at=data.get("issued_at"),
+            metadata=data.get("metadata") or {},
+            preview_b64=data.get("preview_b64"),
+            extra={k: v for k, v in data.items() if k not in _PROOF_KEYS},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Nouveau dict (modifiable sans toucher au cache de sérialisation)."""
+        d: Dict[str, Any] = {"meve_version": self.meve_version, "issuer": self.issuer}
+        if self.issued_at is not None:
+            d["issued_at"] = self.issued_at
+        d["timestamp"] = self.timestamp
+        d["metadata"] = dict(self.metadata)
+        d["subject"] = self.subject.to_dict()
+        d["hash"] = self.hash
+        if self.preview_b64 is not None:
+            d["preview_b64"] = self.preview_b64
+        d.update(self.extra)
+        return d
+
+    def to_json(self) -> str:
+        """JSON canonique (clés triées, UTF-8 non échappé), mis en cache."""
+        if self._json is None:
+            object.__setattr__(self, "_json", canonical_json(self.to_dict()))
+        return self._json  # type: ignore[return-value]
+
+    def to_bytes(self) -> bytes:
+        """`to_json()` encodé en UTF-8, mis en cache."""
+        if self._bytes is None:
+            object.__setattr__(self, "_bytes", self.to_json().encode("utf-8"))
+        return self._bytes  # type: ignore[return-value]
+
+
+ProofLike = Union[Proof, Mapping[str, Any]]
+
+
+def proof_json(proof: ProofLike) -> str:
+    """JSON canonique d'une preuve (cache réutilisé pour un `Proof`)."""
+    if isinstance(proof, Proof):
+        return proof.to_json()
+    return canonical_json(proof)
+
+
+def proof_bytes(proof: ProofLike) -> bytes:
+    """Comme `proof_json`, encodé en UTF-8."""
+    if isinstance(proof, Proof):
+        return proof.to_bytes()
+    return canonical_bytes(proof)
@@ -0,0 +1,269 @@
+"""
+digitalmeve.schema
+
+Validation des preuves contre le schéma JSON embarqué
+(`digitalmeve/schemas/meve-1.schema.json`), sans dépendance externe.
+
+- le schéma est chargé et compilé UNE fois par processus en fermetures
+  Python (expressions régulières précompilées) ;
+- les champs « chauds » (clés requises, subject, empreintes) sont d'abord
+  contrôlés par un vérificateur écrit à la main : une preuve mal formée
+  est rejetée sans passer par le validateur générique.
+
+Mots-clés supportés : type, required, properties, additionalProperties,
+items, const, enum, pattern, minLength, minimum, format (date-time), anyOf.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from importlib.resources import files
+from typing import Any, Callable, Dict, List, Mapping
+
+__all__ = ["SchemaError", "compile_schema", "load_schema", "validate_proof"]
+
+Validator = Callable[[Any, str], None]
+
+_SCHEMA_NAME = "meve-1.schema.json"
+
+# Mots-clés purement descriptifs (ignorés)
+_ANNOTATIONS = {"$schema", "$id", "title", "description", "$comment", "examples"}
+_KEYWORDS = {
+    "type",
+    "required",
+    "properties",
+    "additionalProperties",
+    "items",
+    "const",
+    "enum",
+    "pattern",
+    "minLength",
+    "minimum",
+    "format",
+    "anyOf",
+}
+
+_FORMATS = {
+    "date-time": re.compile(
+        r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})$"
+    ),
+}
+
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+class SchemaError(ValueError):
+    """Preuve non conforme au schéma (message : chemin + raison)."""
+
+
+def _fail(path: str, msg: str) -> None:
+    raise SchemaError(f"{path or '$'}: {msg}")
+
+
+def compile_schema(schema: Mapping[str, Any]) -> Validator:
+    """
+    Compile un (sous-)schéma en une fonction `check(value, path)` qui lève
+    SchemaError. Les mots-clés non supportés sont refusés à la compilation
+    plutôt qu'ignorés silencieusement.
+    """
+    checks: List[Validator] = []
+
+    unknown = set(schema) - _ANNOTATIONS - _KEYWORDS
+    if unknown:
+        raise ValueError(f"unsupported schema keywords: {sorted(unknown)}")
+
+    if "type" in schema:
+        tname = schema["type"]
+        tcheck = _TYPES[tname]
+
+        def _type(v: Any, path: str) -> None:
+            if not tcheck(v):
+                _fail(path, f"expected {tname}")
+
+        checks.append(_type)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def _const(v: Any, path: str) -> None:
+            if v != const:
+                _fail(path, f"expected {const!r}")
+
+        checks.append(_const)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def _enum(v: Any, path: str) -> None:
+            if v not in allowed:
+                _fail(path, f"expected one of {allowed!r}")
+
+        checks.append(_enum)
+
+    if "minLength" in schema:
+        min_len = schema["minLength"]
+
+        def _min_length(v: Any, path: str) -> None:
+            if isinstance(v, str) and len(v) < min_len:
+                _fail(path, f"shorter than {min_len}")
+
+        checks.append(_min_length)
+
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+
+        def _minimum(v: Any, path: str) -> None:
+            if _TYPES["number"](v) and v < minimum:
+                _fail(path, f"less than {minimum}")
+
+        checks.append(_minimum)
+
+    for key in ("pattern", "format"):
+        if key not in schema:
+            continue
+        rx = (
+            re.compile(schema["pattern"])
+            if key == "pattern"
+            else _FORMATS.get(schema["format"])
+        )
+        if rx is None:  # format inconnu : annotation seulement
+            continue
+
+        def _regex(v: Any, path: str, rx: re.Pattern = rx, key: str = key) -> None:
+            if isinstance(v, str) and rx.search(v) is None:
+                _fail(path, f"does not match {key}")
+
+        checks.append(_regex)
+
+    if "required" in schema:
+        required = tuple(schema["required"])
+
+        def _required(v: Any, path: str) -> None:
+            if isinstance(v, dict):
+                for k in required:
+                    if k not in v:
+                        _fail(path, f"missing required key {k!r}")
+
+        checks.append(_required)
+
+    if "properties" in schema or "additionalProperties" in schema:
+        props = {k: compile_schema(s) for k, s in schema.get("properties", {}).items()}
+        extra = schema.get("additionalProperties", True)
+        extra_check = compile_schema(extra) if isinstance(extra, dict) else None
+
+        def _properties(v: Any, path: str) -> None:
+            if not isinstance(v, dict):
+                return
+            for k, item in v.items():
+                sub = props.get(k)
+                if sub is not None:
+                    sub(item, f"{path}.{k}" if path else k)
+                elif extra is False:
+                    _fail(path, f"unexpected key {k!r}")
+                elif extra_check is not None:
+                    extra_check(item, f"{path}.{k}" if path else k)
+
+        checks.append(_properties)
+
+    if "items" in schema:
+        item_check = compile_schema(schema["items"])
+
+        def _items(v: Any, path: str) -> None:
+            if isinstance(v, list):
+                for i, item in enumerate(v):
+                    item_check(item, f"{path}[{i}]")
+
+        checks.append(_items)
+
+    if "anyOf" in schema:
+        options = [compile_schema(s) for s in schema["anyOf"]]
+
+        def _any_of(v: Any, path: str) -> None:
+            for option in options:
+                try:
+                    option(v, path)
+                    return
+                except SchemaError:
+                    continue
+            _fail(path, "does not match any allowed variant")
+
+        checks.append(_any_of)
+
+    def check(value: Any, path: str = "") -> None:
+        for c in checks:
+            c(value, path)
+
+    return check
+
+
+@lru_cache(maxsize=None)
+def load_schema(name: str = _SCHEMA_NAME) -> Dict[str, Any]:
+    """Schéma embarqué dans le package (lu une seule fois)."""
+    text = files("digitalmeve").joinpath("schemas", name).read_text(encoding="utf-8")
+    return json.loads(text)
+
+
+@lru_cache(maxsize=None)
+def _validator(name: str = _SCHEMA_NAME) -> Validator:
+    return compile_schema(load_schema(name))
+
+
+# --- Vérificateur « chemin chaud » : champs requis, écrit à la main ---------
+
+_HEX64 = re.compile(r"^[a-f0-9]{64}$")
+_HEX = re.compile(r"^[a-f0-9]+$")
+_HOT_KEYS = ("meve_version", "issuer", "timestamp", "subject", "hash")
+
+
+def _check_hot(obj: Any) -> None:
+    if not isinstance(obj, dict):
+        _fail("", "expected object")
+    for k in _HOT_KEYS:
+        if k not in obj:
+            _fail("", f"missing required key {k!r}")
+    if obj["meve_version"] != "1.0":
+        _fail("meve_version", "expected '1.0'")
+    issuer = obj["issuer"]
+    if not isinstance(issuer, str) or not issuer:
+        _fail("issuer", "expected non-empty string")
+    h = obj["hash"]
+    if not isinstance(h, str) or _HEX.match(h) is None:
+        _fail("hash", "does not match pattern")
+
+    subject = obj["subject"]
+    if not isinstance(subject, dict):
+        _fail("subject", "expected object")
+    if not isinstance(subject.get("filename"), str):
+        _fail("subject.filename", "expected string")
+    size = subject.get("size")
+    if not isinstance(size, int) or isinstance(size, bool) or size < 0:
+        _fail("subject.size", "expected integer >= 0")
+    if "hash_alg" in subject:
+        digest = subject.get("digest")
+        if not isinstance(digest, str) or _HEX.match(digest) is None:
+            _fail("subject.digest", "does not match pattern")
+    else:
+        digest = subject.get("hash_sha256")
+        if not isinstance(digest, str) or _HEX64.match(digest) is None:
+            _fail("subject.hash_sha256", "does not match pattern")
+
+
+def validate_proof(obj: Any) -> None:
+    """
+    Valide une preuve contre le schéma embarqué ; lève SchemaError.
+
+    Aucun coût d'initialisation par appel : schéma et expressions régulières
+    sont compilés au premier appel puis réutilisés (traitements par lot).
+    """
+    _check_hot(obj)
+    _validator()(obj, "")
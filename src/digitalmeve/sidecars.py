@@ -0,0 +1,217 @@
+"""
+digitalmeve.sidecars
+
+Conventions de nommage, écriture et recherche des sidecars `.meve.json`.
+Partagé par le CLI et les traitements par lot de la bibliothèque.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional
+
+from .proof import ProofLike, proof_bytes
+
+__all__ = [
+    "DEFAULT_SIDECAR_POLICY",
+    "SIDECAR_POLICIES",
+    "SidecarIndex",
+    "atomic_write_bytes",
+    "find_sidecar",
+    "sidecar_candidates",
+    "sidecar_path",
+    "write_sidecars",
+]
+
+logger = logging.getLogger("digitalmeve.sidecars")
+
+# single : un seul fichier ; links / copies : + noms historiques
+SIDECAR_POLICIES = ("single", "links", "copies")
+DEFAULT_SIDECAR_POLICY = "single"
+
+
+def sidecar_candidates(path: Path) -> list[Path]:
+    """
+    Conventions testées, dans l'ordre :
+      A) file.ext.meve.json
+      B) file.meve.json
+      C) <str(path)>.meve.json
+      D) path.parent / (path.name + ".meve.json")
+      E) path.parent / (path.stem + ".meve.json")
+    """
+    cands: list[Path] = []
+    try:
+        cands.append(path.with_suffix(path.suffix + ".meve.json"))
+    except Exception as e:
+        logger.debug(
+            "with_suffix(%s + .meve.json) failed for %s: %s", path.suffix, path, e
+        )
+    try:
+        cands.append(path.with_suffix(".meve.json"))
+    except Exception as e:
+        logger.debug("with_suffix(.meve.json) failed for %s: %s", path, e)
+    cands.append(Path(str(path) + ".meve.json"))
+    cands.append(path.parent / (path.name + ".meve.json"))
+    cands.append(path.parent / (path.stem + ".meve.json"))
+
+    seen: set[str] = set()
+    uniq: list[Path] = []
+    for p in cands:
+        key = str(p)
+        if key not in seen:
+            seen.add(key)
+            uniq.append(p)
+    return uniq
+
+
+class SidecarIndex:
+    """
+    Noms des fichiers de chaque dossier, lus une seule fois (`os.scandir`).
+
+    Pour les traitements par lot : la résolution d'un sidecar devient une
+    recherche en mémoire, soit un parcours par dossier au lieu de cinq
+    `stat` par document. L'index reflète l'état des dossiers à leur
+    première lecture (`invalidate` pour forcer une relecture).
+
+    Partageable entre threads : deux lectures concurrentes d'un même
+    dossier produisent le même ensemble, la seconde est simplement perdue.
+    """
+
+    __slots__ = ("_dirs",)
+
+    def __init__(self) -> None:
+        self._dirs: Dict[str, FrozenSet[str]] = {}
+
+    def names(self, directory: Path) -> FrozenSet[str]:
+        """Noms des entrées (hors sous-dossiers) de `directory`."""
+        key = os.fspath(directory) or "."
+        names = self._dirs.get(key)
+        if names is None:
+            try:
+                with os.scandir(key) as it:
+                    names = frozenset(e.name for e in it if not e.is_dir())
+            except OSError:
+                names = frozenset()
+            self._dirs[key] = names
+        return names
+
+    def is_file(self, path: Path) -> bool:
+        return path.name in self.names(path.parent)
+
+    def candidates(self, path: Path) -> list[Path]:
+        """`sidecar_candidates(path)` présents sur disque, dans l'ordre."""
+        names = self.names(path.parent)
+        return [c for c in sidecar_candidates(path) if c.name in names]
+
+    def invalidate(self, directory: Optional[Path] = None) -> None:
+        if directory is None:
+            self._dirs.clear()
+        else:
+            self._dirs.pop(os.fspath(directory) or ".", None)
+
+
+def find_sidecar(path: Path, index: Optional[SidecarIndex] = None) -> Optional[Path]:
+    """
+    Premier sidecar existant pour `path`, ou None. Avec `index`, aucun
+    accès disque par fichier (voir `SidecarIndex`).
+    """
+    if index is not None:
+        found = index.candidates(path)
+        return found[0] if found else None
+    for cand in sidecar_candidates(path):
+        if cand.exists():
+            return cand
+    return None
+
+
+def sidecar_path(path: Path, outdir: Optional[Path] = None) -> Path:
+    """Sidecar canonique : <outdir ou dossier de path>/<path.name>.meve.json."""
+    return (outdir or path.parent) / (path.name + ".meve.json")
+
+
+def _legacy_paths(path: Path, base: Path) -> list[Path]:
+    """Noms historiques (compatibilité) autres que le sidecar canonique."""
+    canonical = base / (path.name + ".meve.json")
+    outs: list[Path] = []
+    for o in (
+        (base / path.name).with_suffix(".meve.json"),
+        base / (path.stem + ".meve.json"),
+    ):
+        if o != canonical and o not in outs:
+            outs.append(o)
+    return outs
+
+
+def _tmp_path(dest: Path) -> Path:
+    # unique par processus ET par thread (traitements par lot)
+    return dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def atomic_write_bytes(dest: Path, data: bytes) -> None:
+    """
+    Écrit `dest` via un fichier temporaire du même dossier puis `os.replace` :
+    un lecteur voit l'ancien ou le nouveau contenu, jamais un fichier partiel.
+    """
+    tmp = _tmp_path(dest)
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _link(src: Path, dest: Path) -> bool:
+    """Lien physique `dest` -> `src` (remplacement atomique) ; False si refusé."""
+    tmp = _tmp_path(dest)
+    try:
+        os.link(src, tmp)
+    except OSError as e:  # FS sans liens physiques, autre volume…
+        logger.debug("hardlink %s -> %s failed: %s", dest, src, e)
+        return False
+    try:
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def write_sidecars(
+    path: Path,
+    proof: ProofLike,
+    outdir: Optional[Path],
+    policy: str = DEFAULT_SIDECAR_POLICY,
+) -> list[Path]:
+    """
+    Écrit le sidecar de `path` (dans `outdir`, sinon à côté du fichier) et
+    retourne les chemins écrits, le sidecar canonique en premier.
+
+    `policy` :
+      - "single" : <file.ext>.meve.json uniquement (une seule écriture) ;
+      - "links"  : + noms historiques (file.meve.json) en liens physiques ;
+      - "copies" : + noms historiques en copies (ancien comportement).
+    Chaque écriture est atomique (fichier temporaire + rename).
+    """
+    if policy not in SIDECAR_POLICIES:
+        raise ValueError(f"unknown sidecar policy: {policy}")
+    base = outdir or path.parent
+    if outdir is not None:
+        base.mkdir(parents=True, exist_ok=True)
+
+    payload = proof_bytes(proof)  # sérialisé une fois (mis en cache si Proof)
+    canonical = sidecar_path(path, outdir)
+    atomic_write_bytes(canonical, payload)
+    outs = [canonical]
+    if policy == "single":
+        return outs
+
+    for o in _legacy_paths(path, base):
+        if policy == "copies" or not _link(canonical, o):
+            atomic_write_bytes(o, payload)
+        outs.append(o)
+    return outs
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 import sys
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import Any, Mapping, Optional, Union
+from typing import Any, Iterable, Iterator, Mapping, Optional, Tuple, Union
 
 __all__ = [
+    "MEVE_OUTPUT_SUFFIXES",
     "format_identity",
+    "is_meve_output",
+    "iter_files",
+    "iter_files_relative",
     "load_json",
     "pretty_print",
 ]
 
+logger = logging.getLogger("digitalmeve.utils")
+
+# Fichiers produits par digitalmeve (jamais re-prouvés lors d'un parcours)
+MEVE_OUTPUT_SUFFIXES = (
+    ".meve.json",
+    ".meve.pdf",
+    ".meve.png",
+    ".meve.jpg",
+    ".meve.jpeg",
+    ".meve.ledger",
+)
+
 
 def load_json(path: Union[str, Path]) -> Any:
     """
@@ -46,3 +65,75 @@ def format_identity(value: Optional[Union[str, Path, Mapping]]) -> str:
     if isinstance(value, Mapping) and "identity" in value:
         return str(value["identity"])
     raise AttributeError("invalid identity")
+
+
+def is_meve_output(
+    path: Union[str, Path], suffixes: Tuple[str, ...] = MEVE_OUTPUT_SUFFIXES
+) -> bool:
+    """True si `path` est une sortie digitalmeve (sidecar ou copie embarquée)."""
+    return os.path.basename(str(path)).lower().endswith(suffixes)
+
+
+def _scan_dir(
+    root: str, pattern: str, recursive: bool, exclude: Tuple[str, ...]
+) -> Iterator[Tuple[Path, str]]:
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            # dossier illisible : signalé, jamais ignoré en silence
+            logger.warning("cannot list %s: %s", current, e)
+            continue
+        rel = os.path.relpath(current, root)
+        subdirs: list[str] = []
+        for entry in entries:
+            # DirEntry.is_* s'appuie sur d_type : pas de stat par fichier
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    subdirs.append(entry.path)
+            elif entry.is_file() and fnmatch(entry.name, pattern):
+                if not is_meve_output(entry.name, exclude):
+                    yield Path(entry.path), rel
+        stack.extend(reversed(subdirs))
+
+
+def iter_files_relative(
+    roots: Iterable[Union[str, Path]],
+    pattern: Optional[str] = None,
+    recursive: bool = False,
+    exclude: Tuple[str, ...] = MEVE_OUTPUT_SUFFIXES,
+) -> Iterator[Tuple[Path, Path]]:
+    """
+    Comme `iter_files`, mais produit des couples (fichier, dossier relatif) :
+    le dossier du fichier relativement au dossier argument qui le contient
+    (Path(".") pour un fichier donné directement). Sert à reproduire
+    l'arborescence sous un dossier de sortie.
+    """
+    for root in roots:
+        p = Path(root)
+        if p.is_dir():
+            for path, rel in _scan_dir(str(p), pattern or "*", recursive, exclude):
+                yield path, Path(rel)
+        else:
+            yield p, Path()
+
+
+def iter_files(
+    roots: Iterable[Union[str, Path]],
+    pattern: Optional[str] = None,
+    recursive: bool = False,
+    exclude: Tuple[str, ...] = MEVE_OUTPUT_SUFFIXES,
+) -> Iterator[Path]:
+    """
+    Développe une liste de chemins en fichiers à traiter :
+      - fichier  -> renvoyé tel quel
+      - dossier  -> fichiers correspondant à `pattern` (défaut "*"),
+                    récursivement si `recursive`, hors suffixes `exclude`
+                    (par défaut : toutes les sorties .meve)
+    Les fichiers sont produits au fil du parcours (pas de liste complète).
+    """
+    for path, _rel in iter_files_relative(roots, pattern, recursive, exclude):
+        yield path
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 import json
+import logging
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
-# --- Imports facultatifs pour l'extraction embarquée (ne cassent pas si absents)
-try:  # PDF
-    from .embedding_pdf import extract_proof_pdf  # type: ignore
-except Exception:  # pragma: no cover
-    extract_proof_pdf = None  # type: ignore
+from . import formats
+from .hashing import (
+    HASH_MODES,
+    algorithms,
+    digest_file,
+    subject_digest,
+    tree_digest,
+)
+from .ledger import DEFAULT_LEDGER_NAME
+from .ledger import lookup as ledger_lookup
+from .parallel import imap_unordered
+from .schema import SchemaError, validate_proof
+from .sidecars import SidecarIndex, find_sidecar
 
-try:  # PNG
-    from .embedding_png import extract_proof_png  # type: ignore
-except Exception:  # pragma: no cover
-    extract_proof_png = None  # type: ignore
+logger = logging.getLogger("digitalmeve.verifier")
 
 
 def verify_identity(identity: str | Path | None) -> bool:
@@ -26,84 +33,278 @@ def verify_identity(identity: str | Path | None) -> bool:
     return str(identity).strip() != ""
 
 
+_NO_PROOF = "No proof found (neither embedded nor sidecar)."
+
+
+def _load_file_proof(
+    p: Path,
+    index: Optional[SidecarIndex] = None,
+    ledger: Optional[str | Path] = None,
+) -> Tuple[Any, Optional[Path], Optional[str]]:
+    """
+    Localise la preuve associée à `p`.
+    Retourne (preuve, document_source|None, erreur|None) ; le document
+    source n'est connu que lorsque la preuve vient d'un sidecar de `p`.
+    """
+    name = p.name.lower()
+    suf = p.suffix.lower()
+
+    # 1) Sidecar JSON
+    if suf == ".json" or name.endswith(".meve.json"):
+        return _as_dict(p), None, None
+
+    # 2) Preuve embarquée : format reconnu au contenu (digitalmeve.formats),
+    #    extraction sur le descripteur déjà ouvert
+    proof: Any = None
+    try:
+        with open(p, "rb") as f:
+            handler = formats.sniff_stream(f)
+            if handler is not None:
+                try:
+                    proof = handler.extract_stream(f)
+                except ImportError:
+                    return None, None, f"{handler.name} extraction unavailable"
+                except Exception as e:
+                    # fichier mal formé d'un format connu : éventuel sidecar
+                    # ou registre ci-dessous
+                    logger.debug("%s extraction failed for %s: %s", handler.name, p, e)
+    except OSError:
+        pass  # illisible ici : éventuel sidecar ci-dessous
+    if proof is not None:
+        return proof, None, None
+
+    # 3) Sidecar à côté d'un fichier « source »
+    sc = find_sidecar(p, index)
+    if sc is not None:
+        return _as_dict(sc), p, None
+
+    # 4) Registre (ledger) : `ledger` explicite, sinon segment du dossier
+    if ledger is None:
+        segment = p.parent / DEFAULT_LEDGER_NAME
+        if index is not None and not index.is_file(segment):
+            return None, None, _NO_PROOF
+        ledger = segment
+    proof = ledger_lookup(p, ledger)
+    if proof is None:
+        return None, None, _NO_PROOF
+    return proof, p, None
+
+
+def _infer_document(
+    p: Path, proof: Dict[str, Any], index: Optional[SidecarIndex] = None
+) -> Optional[Path]:
+    """Document décrit par la preuve : subject.filename dans le dossier de `p`."""
+    filename = (proof.get("subject") or {}).get("filename")
+    if not isinstance(filename, str) or not filename:
+        return None
+    cand = p.parent / Path(filename).name
+    if cand == p:
+        return None
+    if index is not None:
+        return cand if index.is_file(cand) else None
+    return cand if cand.is_file() else None
+
+
+def verify_content(
+    proof: Dict[str, Any],
+    document: str | Path,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Lie une preuve (déjà validée structurellement) au contenu de `document` :
+      - taille différente de subject.size -> rejet immédiat, sans lecture ;
+      - sinon le document est relu et haché selon subject (algorithme, mode) ;
+      - la première erreur de lecture interrompt la vérification.
+    """
+    subject = proof.get("subject") or {}
+    doc = Path(document)
+    try:
+        st = doc.stat()
+    except FileNotFoundError:
+        return False, {"error": "Document not found"}
+    except OSError as e:
+        return False, {"error": f"Read error: {e}"}
+    if st.st_size != subject.get("size"):
+        return False, {"error": "Size mismatch"}
+
+    algorithm, expected = subject_digest(subject)
+    try:
+        if subject.get("hash_mode", "plain") == "tree":
+            actual = tree_digest(
+                doc,
+                chunk_size=subject["chunk_size"],
+                preview_bytes=0,
+                algorithm=algorithm,
+            )
+        else:
+            actual = digest_file(doc, preview_bytes=0, algorithm=algorithm)
+    except OSError as e:
+        return False, {"error": f"Read error: {e}"}
+
+    if actual.size != subject.get("size"):
+        return False, {"error": "Size mismatch"}
+    if not isinstance(expected, str) or actual.hexdigest != expected.lower():
+        return False, {"error": "Content mismatch"}
+    return True, proof
+
+
 def verify_file(
     path: str | Path,
     *,
     expected_issuer: Optional[str] = None,
+    content: Optional[bool] = False,
+    document: Optional[str | Path] = None,
+    schema: bool = False,
+    sidecar_index: Optional[SidecarIndex] = None,
+    ledger: Optional[str | Path] = None,
 ) -> Tuple[bool, Dict[str, Any]]:
     """
     Vérifie un fichier contenant une preuve .meve :
       - JSON (sidecar) : *.meve.json ou *.json
       - PDF embarqué   : *.pdf ou *.meve.pdf
       - PNG embarqué   : *.png ou *.meve.png
+      - JPEG embarqué  : *.jpg/*.jpeg (segments APP15)
+      - autre fichier (ou PDF/PNG/JPEG sans preuve embarquée) : son sidecar,
+        sinon son entrée dans le registre (`digitalmeve.ledger`)
+
+    Liaison au contenu (voir `verify_content`) :
+      - `document`      : document original à relire et comparer ;
+      - content=True    : document déduit (fichier source du sidecar, ou
+                          subject.filename à côté de la preuve), obligatoire ;
+      - content=None    : idem, seulement si un document est trouvé ;
+      - content=False   : structure seule (défaut, comportement historique).
+
+    `schema=True` valide en plus la preuve contre le schéma JSON embarqué.
+    `sidecar_index` : index de dossiers partagé par un lot (`SidecarIndex`),
+    qui remplace les `stat` de recherche par des recherches en mémoire.
+    `ledger` : segment de registre où chercher la preuve à défaut de sidecar
+    (par défaut, `proofs.meve.ledger` du dossier du fichier).
 
     Retourne (ok, info|{"error": "..."}).
     """
     p = Path(path)
-    if not p.exists():
+    found = p.exists() if sidecar_index is None else sidecar_index.is_file(p)
+    if not found:
         return False, {"error": "File not found"}
 
-    name = p.name.lower()
-    suf = p.suffix.lower()
+    proof, source, error = _load_file_proof(p, sidecar_index, ledger)
+    if error is not None:
+        return False, {"error": error}
 
-    # 1) Sidecar JSON
-    if suf == ".json" or name.endswith(".meve.json"):
-        proof = _as_dict(p)
-        return verify_meve(proof, expected_issuer=expected_issuer)
+    ok, info = verify_meve(proof, expected_issuer=expected_issuer, schema=schema)
+    if not ok:
+        return ok, info
+
+    if document is None and content is not False:
+        document = source or _infer_document(p, info, sidecar_index)
+        if document is None:
+            if content:
+                return False, {"error": "Document not found"}
+            return ok, info
+    if document is None:
+        return ok, info
+    return verify_content(info, document)
 
-    # 2) PDF embarqué
-    if suf == ".pdf" or name.endswith(".meve.pdf"):
-        if extract_proof_pdf is None:
-            return False, {"error": "PDF extraction unavailable"}
-        try:
-            proof = extract_proof_pdf(p)  # type: ignore[misc]
-        except Exception as e:  # pragma: no cover
-            return False, {"error": f"PDF extraction failed: {e}"}
-        return verify_meve(proof, expected_issuer=expected_issuer)
-
-    # 3) PNG embarqué
-    if suf == ".png" or name.endswith(".meve.png"):
-        if extract_proof_png is None:
-            return False, {"error": "PNG extraction unavailable"}
-        try:
-            proof = extract_proof_png(p)  # type: ignore[misc]
-        except Exception as e:  # pragma: no cover
-            return False, {"error": f"PNG extraction failed: {e}"}
-        return verify_meve(proof, expected_issuer=expected_issuer)
 
-    return False, {"error": f"Unsupported file type: {suf}"}
+def _verify_one(path: str | Path, **options: Any) -> Dict[str, Any]:
+    """Résultat compact d'un fichier pour `verify_many` (ne lève jamais)."""
+    try:
+        ok, info = verify_file(path, **options)
+    except Exception as e:  # pragma: no cover - filet de sécurité du lot
+        ok, info = False, {"error": f"{type(e).__name__}: {e}"}
+    res: Dict[str, Any] = {"file": str(path), "ok": ok}
+    if ok:
+        res["issuer"] = info.get("issuer")
+        res["hash"] = info.get("hash")
+    else:
+        res["error"] = info.get("error", "Invalid proof")
+    return res
+
+
+def verify_many(
+    paths: Iterable[str | Path],
+    *,
+    workers: Optional[int] = None,
+    processes: bool = False,
+    **options: Any,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Vérifie de nombreux fichiers en parallèle (`verify_file` sur chacun,
+    mêmes options : expected_issuer, content, ...).
+
+    Produit au fil de l'eau un résultat par fichier, dans l'ordre de
+    complétion : {"file", "ok", "issuer", "hash"} ou {"file", "ok", "error"},
+    puis un dernier élément {"summary": {"total", "ok", "failed"}}.
+
+    En mode threads, un `SidecarIndex` commun au lot est créé : chaque
+    dossier n'est parcouru qu'une fois pour trouver sidecars et documents.
+    """
+    if not processes:
+        options.setdefault("sidecar_index", SidecarIndex())
+    total = passed = 0
+    job = partial(_verify_one, **options)
+    for res in imap_unordered(job, paths, workers=workers, processes=processes):
+        total += 1
+        passed += res["ok"]
+        yield res
+    yield {"summary": {"total": total, "ok": passed, "failed": total - passed}}
+
+
+def parse_proof_bytes(data: bytes | bytearray | memoryview) -> Optional[Dict[str, Any]]:
+    """
+    Décode une preuve JSON depuis des octets (UTF-8/16/32, détecté par
+    `json.loads`). Retourne un dict ou None ; aucun accès disque.
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    try:
+        obj = json.loads(data)
+    except (ValueError, TypeError):
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def parse_proof_text(text: str) -> Optional[Dict[str, Any]]:
+    """Décode une preuve depuis une chaîne JSON ; dict ou None, aucun accès disque."""
+    try:
+        obj = json.loads(text)
+    except (ValueError, TypeError):
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def load_proof(path: str | Path) -> Optional[Dict[str, Any]]:
+    """Lit une preuve JSON depuis un fichier (une ouverture, sans `stat`)."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    return parse_proof_bytes(data)
 
 
 def _as_dict(proof: Any) -> Optional[Dict[str, Any]]:
     """
     Accepte :
       - un dict (retourné tel quel)
-      - une chaîne JSON
-      - un chemin de fichier (Path ou str) pointant vers un JSON
+      - des octets (bytes, bytearray, memoryview) : JSON
+      - une chaîne : JSON si elle commence par « { », sinon chemin de fichier
+      - un Path : fichier JSON
     Retourne un dict ou None si l'entrée n'est pas exploitable.
+
+    Aucune sonde du système de fichiers (`exists`/`is_file`) : le type de
+    l'entrée décide du décodage ; préférer les points d'entrée typés
+    `parse_proof_bytes`, `parse_proof_text` et `load_proof`.
     """
     if isinstance(proof, dict):
         return proof
-
-    if isinstance(proof, (str, Path)):
-        p = Path(proof)
-        if p.exists() and p.is_file():
-            try:
-                text = p.read_text(encoding="utf-8")
-                return json.loads(text)
-            except Exception:
-                return None
-        try:
-            return json.loads(str(proof))
-        except Exception:
-            return None
-
-    if isinstance(proof, (bytes, bytearray)):
-        try:
-            return json.loads(proof.decode("utf-8"))
-        except Exception:
-            return None
-
+    if isinstance(proof, str):
+        if proof.lstrip()[:1] == "{":
+            return parse_proof_text(proof)
+        return load_proof(proof)
+    if isinstance(proof, Path):
+        return load_proof(proof)
+    if isinstance(proof, (bytes, bytearray, memoryview)):
+        return parse_proof_bytes(proof)
     return None
 
 
@@ -111,10 +312,16 @@ def verify_meve(
     proof: Any,
     *,
     expected_issuer: Optional[str] = None,
+    schema: bool = False,
 ) -> Tuple[bool, Dict[str, Any]]:
     """
     Valide la structure d'une preuve .meve.
 
+    `proof` : dict, JSON (str/bytes/memoryview) ou chemin (voir `_as_dict`).
+
+    `schema=True` : validation complète contre `schemas/meve-1.schema.json`
+    (schéma compilé une fois par processus, voir `digitalmeve.schema`).
+
     Retourne :
       - (True, <dict de la preuve>) si valide
       - (False, {"error": "<raison>"}) sinon
@@ -138,22 +345,35 @@ def verify_meve(
     if not isinstance(subject, dict):
         return False, {"error": "Missing required keys"}  # noqa: E501
 
-    subj_required: Iterable[str] = ("filename", "size", "hash_sha256")
+    # SHA-256 : champ historique hash_sha256 ; sinon hash_alg + digest
+    digest_key = "digest" if "hash_alg" in subject else "hash_sha256"
+    subj_required: Iterable[str] = ("filename", "size", digest_key)
     if any(k not in subject for k in subj_required):
         return False, {"error": "Missing required keys"}  # noqa: E501
 
+    algorithm, digest = subject_digest(subject)
+    if algorithm not in algorithms():
+        return False, {"error": "Unsupported hash algorithm"}  # noqa: E501
+
+    mode = subject.get("hash_mode", "plain")
+    if mode not in HASH_MODES:
+        return False, {"error": "Unsupported hash mode"}  # noqa: E501
+    if mode == "tree":
+        chunk = subject.get("chunk_size")
+        if not isinstance(chunk, int) or isinstance(chunk, bool) or chunk <= 0:
+            return False, {"error": "Invalid chunk size"}  # noqa: E501
+
     if expected_issuer is not None and obj.get("issuer") != expected_issuer:
         return False, {"error": "Issuer mismatch"}  # noqa: E501
 
-    if obj.get("hash") != subject.get("hash_sha256"):
+    if obj.get("hash") != digest:
         return False, {"error": "Hash mismatch"}  # noqa: E501
 
-    try:
-        # placeholder de validation de schéma (futur)
-        # schema_validate(obj)
-        pass
-    except Exception as e:  # pragma: no cover
-        msg = f"Schema validation failed: {e}"
-        return False, {"error": msg}  # noqa: E501
+    if schema:
+        try:
+            validate_proof(obj)
+        except SchemaError as e:
+            msg = f"Schema validation failed: {e}"
+            return False, {"error": msg}  # noqa: E501
 
     return True, obj
@@ -0,0 +1,408 @@
+"""
+digitalmeve.watch
+
+Surveillance d'un dossier de dépôt (`digitalmeve watch`) : chaque nouveau
+document, ou document modifié, reçoit sa preuve (sidecar + copie embarquée)
+sans re-parcourir ni re-hacher tout le dossier.
+
+- Linux : inotify via ctypes (aucune dépendance), événements IN_CLOSE_WRITE
+  / IN_MOVED_TO ; sous-dossiers créés ajoutés à la volée en mode récursif.
+- Ailleurs, ou si inotify est indisponible : repli par scrutation
+  périodique (`os.scandir`, taille + mtime). Un dossier dont le watch est
+  refusé (limite de watches atteinte, FS réseau) est scruté de la même
+  façon, les autres restant sous inotify.
+- Anti-rebond : un fichier n'est traité qu'après `debounce` secondes sans
+  nouvelle écriture ET si sa taille/mtime n'ont pas bougé entre-temps.
+- Pool de threads borné ; un fichier déjà en cours est re-traité à la fin
+  de la tâche s'il a été modifié pendant celle-ci.
+
+Les sorties digitalmeve (*.meve.json, *.meve.pdf…) et les fichiers cachés
+(temporaires d'écriture atomique, fichiers d'éditeurs) sont ignorés.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .generator import prove_file
+from .parallel import default_workers
+from .sidecars import SidecarIndex, find_sidecar
+from .utils import is_meve_output, iter_files
+
+__all__ = ["BACKENDS", "watch"]
+
+logger = logging.getLogger("digitalmeve.watch")
+
+BACKENDS = ("auto", "inotify", "poll")
+
+# Constantes <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+_MASK |= IN_DELETE
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ nom)
+
+# Tâches en vol par worker ; pas maximal d'attente de la boucle
+_PREFETCH = 4
+_TICK = 0.5
+
+Event = Tuple[str, int]  # (chemin, masque inotify)
+Signature = Tuple[int, int]  # (taille, mtime_ns)
+
+
+class _Inotify:
+    """Watches inotify sur des dossiers ; `read` renvoie (chemin, masque)."""
+
+    def __init__(self) -> None:
+        import ctypes  # chargé seulement pour ce backend
+
+        self._ctypes = ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add = libc.inotify_add_watch  # AttributeError hors Linux
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+        self._dirs: Dict[int, str] = {}
+
+    def add(self, directory: str) -> None:
+        wd = self._add(self.fd, os.fsencode(directory), _MASK)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            raise OSError(err, os.strerror(err), directory)
+        self._dirs[wd] = directory
+
+    def read(self, timeout: float) -> List[Event]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events: List[Event] = []
+        pos = 0
+        while pos < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, pos)
+            pos += _EVENT.size
+            name = os.fsdecode(data[pos : pos + length].rstrip(b"\0"))  # noqa: E203
+            pos += length
+            if mask & IN_Q_OVERFLOW:
+                events.append(("", IN_Q_OVERFLOW))
+                continue
+            directory = self._dirs.get(wd)
+            if mask & IN_IGNORED:  # dossier supprimé / démonté
+                self._dirs.pop(wd, None)
+            elif directory is not None and name:
+                events.append((os.path.join(directory, name), mask))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    """
+    Repli par scrutation : compare taille + mtime de chaque fichier entre deux
+    parcours et signale les fichiers nouveaux ou modifiés comme IN_CLOSE_WRITE,
+    les nouveaux sous-dossiers comme IN_CREATE | IN_ISDIR.
+    """
+
+    def __init__(self, interval: float, stop: threading.Event) -> None:
+        self.interval = interval
+        self._stop = stop
+        self._roots: List[str] = []
+        self._seen: Dict[str, Signature] = {}
+        self._subdirs: Set[str] = set()
+        self._next = 0.0
+
+    def add(self, directory: str) -> None:
+        self._roots.append(directory)
+        self._seen.update(self._scan(directory, self._subdirs))
+
+    def _scan(
+        self, directory: str, subdirs: Set[str]
+    ) -> Iterable[Tuple[str, Signature]]:
+        try:
+            with os.scandir(directory) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        subdirs.add(e.path)
+                    elif e.is_file(follow_symlinks=False):
+                        st = e.stat(follow_symlinks=False)
+                        yield e.path, (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return
+
+    def read(self, timeout: float) -> List[Event]:
+        delay = self._next - time.monotonic()
+        if delay > 0:
+            self._stop.wait(min(delay, timeout))
+            return []
+        self._next = time.monotonic() + self.interval
+        current: Dict[str, Signature] = {}
+        subdirs: Set[str] = set()
+        for root in self._roots:
+            current.update(self._scan(root, subdirs))
+        events: List[Event] = [
+            (path, IN_CREATE | IN_ISDIR) for path in subdirs - self._subdirs
+        ]
+        events += [
+            (path, IN_CLOSE_WRITE)
+            for path, sig in current.items()
+            if self._seen.get(path) != sig
+        ]
+        self._seen, self._subdirs = current, subdirs
+        return events
+
+    def close(self) -> None:
+        pass
+
+
+def _signature(path: str) -> Optional[Signature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _walk_dirs(root: str, recursive: bool) -> Iterable[str]:
+    yield root
+    if not recursive:
+        return
+    for current, dirs, _files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for d in dirs:
+            yield os.path.join(current, d)
+
+
+def _relative_dir(path: str, roots: List[str]) -> str:
+    """Dossier de `path` relativement à la racine surveillée qui le contient."""
+    parent = os.path.dirname(path)
+    for root in roots:
+        rel = os.path.relpath(parent, root)
+        if rel != os.pardir and not rel.startswith(os.pardir + os.sep):
+            return rel
+    return os.curdir
+
+
+def _open_source(backend: str, poll_interval: float, stop: threading.Event) -> Any:
+    if backend in ("auto", "inotify"):
+        try:
+            return _Inotify()
+        except (AttributeError, OSError) as e:
+            if backend == "inotify":
+                raise OSError(f"inotify unavailable: {e}") from e
+            logger.info("inotify unavailable (%s): polling every %ss", e, poll_interval)
+    return _Poller(poll_interval, stop)
+
+
+def watch(
+    roots: Iterable[Union[str, Path]],
+    *,
+    recursive: bool = False,
+    pattern: Optional[str] = None,
+    debounce: float = 1.0,
+    workers: Optional[int] = None,
+    backend: str = "auto",
+    poll_interval: float = 2.0,
+    existing: bool = False,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    stop: Optional[threading.Event] = None,
+    ready: Optional[threading.Event] = None,
+    **options: Any,
+) -> None:
+    """
+    Surveille les dossiers `roots` jusqu'à `stop.set()` (ou Ctrl-C) et passe
+    chaque document prêt à `prove_file(path, **options)` ; chaque résultat
+    est transmis à `on_result` depuis le thread appelant.
+
+    - pattern       : filtre fnmatch sur le nom (défaut "*")
+    - debounce      : secondes de calme exigées après la dernière écriture
+    - workers       : taille du pool (défaut : nombre de CPU)
+    - backend       : "auto" (inotify, sinon scrutation), "inotify", "poll"
+    - poll_interval : période de scrutation du repli
+    - existing      : traite d'abord les fichiers présents sans sidecar
+    - ready         : positionné une fois les dossiers initiaux surveillés
+
+    Avec backend="inotify", un dossier impossible à surveiller lève OSError ;
+    en "auto", il est scruté toutes les `poll_interval` secondes.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown watch backend: {backend}")
+    stop = stop or threading.Event()
+    pattern = pattern or "*"
+    n = workers or default_workers()
+    dirs = [str(r) for r in roots]
+    outdir = options.pop("outdir", None)
+
+    def job(path: str) -> Dict[str, Any]:
+        # arborescence reproduite sous outdir, comme `generate` sur un dossier
+        out = None if outdir is None else Path(outdir) / _relative_dir(path, dirs)
+        return prove_file(path, outdir=out, **options)
+
+    def wanted(path: str) -> bool:
+        name = os.path.basename(path)
+        if name.startswith(".") or is_meve_output(name):
+            return False
+        return fnmatch(name, pattern)
+
+    source = _open_source(backend, poll_interval, stop)
+    if isinstance(source, _Poller):
+        # la scrutation ne voit une écriture qu'au parcours suivant
+        debounce = max(debounce, poll_interval)
+    watched: Set[str] = set()
+    fallback: Optional[_Poller] = None  # dossiers refusés par inotify
+
+    def add_dir(directory: str) -> None:
+        nonlocal fallback, debounce
+        if directory in watched:
+            return
+        try:
+            source.add(directory)
+        except OSError as e:
+            if backend == "inotify":
+                raise
+            # limite de watches (ENOSPC), FS sans inotify… : scrutation
+            logger.warning(
+                "cannot watch %s (%s): polling every %ss", directory, e, poll_interval
+            )
+            if fallback is None:
+                fallback = _Poller(poll_interval, stop)
+                debounce = max(debounce, poll_interval)
+            fallback.add(directory)
+        watched.add(directory)
+
+    try:
+        for root in dirs:
+            for d in _walk_dirs(root, recursive):
+                add_dir(d)
+    except OSError:
+        source.close()
+        raise
+
+    # chemin -> (échéance, signature à l'échéance précédente)
+    pending: Dict[str, Tuple[float, Optional[Signature]]] = {}
+    due: Deque[str] = deque()  # prêts, en attente d'un worker
+    running: Dict[Future, str] = {}
+    dirty: Set[str] = set()  # modifiés pendant leur traitement
+
+    def schedule(path: str, now: float) -> None:
+        if path in running.values():
+            dirty.add(path)
+        else:
+            pending[path] = (now + debounce, _signature(path))
+
+    def rescan(now: float) -> None:
+        # démarrage (--existing) ou débordement de la file inotify
+        index = SidecarIndex()
+        for p in iter_files(dirs, pattern=pattern, recursive=recursive):
+            if wanted(str(p)) and find_sidecar(p, index) is None:
+                schedule(str(p), now)
+
+    if existing:
+        rescan(time.monotonic())
+    if ready is not None:
+        ready.set()
+
+    pool = ThreadPoolExecutor(max_workers=n, thread_name_prefix="digitalmeve-watch")
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            timeout = _TICK
+            if pending:
+                timeout = min(
+                    timeout, max(0.0, min(d for d, _ in pending.values()) - now)
+                )
+            events = source.read(timeout)
+            if fallback is not None:
+                events += fallback.read(0)
+            for path, mask in events:
+                now = time.monotonic()
+                if mask & IN_Q_OVERFLOW:
+                    logger.warning("inotify queue overflow: rescanning")
+                    rescan(now)
+                elif mask & IN_ISDIR:
+                    hidden = os.path.basename(path).startswith(".")
+                    if recursive and not hidden and mask & (IN_CREATE | IN_MOVED_TO):
+                        for d in _walk_dirs(path, True):
+                            add_dir(d)
+                        # fichiers écrits avant la pose du watch
+                        for p in iter_files([path], pattern=pattern, recursive=True):
+                            if wanted(str(p)):
+                                schedule(str(p), now)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    pending.pop(path, None)
+                elif not wanted(path):
+                    continue
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    schedule(path, now)
+                elif mask & IN_MODIFY and path in pending:
+                    schedule(path, now)  # écriture en cours : on repousse
+
+            now = time.monotonic()
+            for path, (deadline, sig) in list(pending.items()):
+                if deadline > now:
+                    continue
+                current = _signature(path)
+                if current is None:  # supprimé entre-temps
+                    del pending[path]
+                elif current != sig:  # encore modifié : nouvelle attente
+                    pending[path] = (now + debounce, current)
+                else:
+                    del pending[path]
+                    due.append(path)
+
+            while due and len(running) < n * _PREFETCH:
+                path = due.popleft()
+                running[pool.submit(job, path)] = path
+
+            if running:
+                done, _ = wait(list(running), timeout=0, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    path = running.pop(fut)
+                    if path in dirty:
+                        dirty.discard(path)
+                        schedule(path, time.monotonic())
+                    if on_result is not None:
+                        on_result(fut.result())
+    finally:
+        source.close()
+        # tâches en cours menées à terme ; fichiers en attente abandonnés
+        pool.shutdown(wait=True, cancel_futures=True)
+        if on_result is not None:
+            for fut in running:
+                if not fut.cancelled():
+                    on_result(fut.result())
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from digitalmeve import cache as cache_mod
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path: Path, monkeypatch):
+    """Cache d'empreintes propre à chaque test (jamais ~/.cache du développeur)."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.delenv("DIGITALMEVE_NO_CACHE", raising=False)
+    monkeypatch.setattr(cache_mod, "_default", None)
+    monkeypatch.setattr(cache_mod, "_disabled", False)
+    yield
+    if cache_mod._default is not None:
+        cache_mod._default.close()
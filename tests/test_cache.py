@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from digitalmeve import cache as cache_mod
+from digitalmeve import generator
+from digitalmeve.cache import DigestCache
+
+
+def _old_file(tmp_path: Path, name: str, data: bytes) -> Path:
+    f = tmp_path / name
+    f.write_bytes(data)
+    os.utime(f, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+    return f
+
+
+def test_cache_roundtrip_and_racy_skip(tmp_path: Path) -> None:
+    c = DigestCache(tmp_path / "c.sqlite3")
+    f = _old_file(tmp_path, "a.bin", b"abc")
+    st = f.stat()
+    assert c.get(st, "sha256") is None
+    assert c.put(st, "sha256", "ff" * 32, b"abc") is True
+    assert c.get(st, "sha256") == ("ff" * 32, b"abc")
+    assert c.get(st, "blake2b") is None
+
+    fresh = tmp_path / "fresh.bin"
+    fresh.write_bytes(b"new")
+    assert c.put(fresh.stat(), "sha256", "00" * 32, b"") is False
+    c.close()
+
+
+def test_cache_lru_eviction(tmp_path: Path) -> None:
+    c = DigestCache(tmp_path / "c.sqlite3", max_entries=2)
+    stats = [_old_file(tmp_path, f"f{i}", b"x" * i).stat() for i in range(3)]
+    for i, st in enumerate(stats):
+        c.put(st, "sha256", f"{i:064x}", b"")
+    c.get(stats[0], "sha256")  # f0 redevient récent
+    c.evict()
+    assert len(c) == 2
+    assert c.get(stats[1], "sha256") is None
+    assert c.get(stats[0], "sha256") is not None
+    c.close()
+
+
+def test_generate_meve_uses_cache(tmp_path: Path, monkeypatch):
+    f = _old_file(tmp_path, "doc.txt", b"hello cache")
+    first = generator.generate_meve(f)
+
+    def _fail(*a, **k):
+        raise AssertionError("file should not be re-read")
+
+    monkeypatch.setattr(generator, "digest_file", _fail)
+    second = generator.generate_meve(f)
+    assert second["hash"] == first["hash"]
+    assert second["preview_b64"] == first["preview_b64"]
+
+    with pytest.raises(AssertionError):
+        generator.generate_meve(f, use_cache=False)
+
+
+def test_cache_stays_in_test_tmpdir(tmp_path: Path) -> None:
+    f = _old_file(tmp_path, "doc.txt", b"isolated")
+    generator.generate_meve(f)
+    assert cache_mod.default_cache().path.is_relative_to(tmp_path)
+    assert len(cache_mod.default_cache()) == 1
+
+
+def test_cached_batch_verifies_content(tmp_path: Path) -> None:
+    from digitalmeve.verifier import verify_many
+
+    docs = [_old_file(tmp_path, f"doc{i}.txt", b"doc %d" % i) for i in range(4)]
+    for _ in range(2):  # second passage : empreintes servies par le cache
+        results = list(generator.generate_many(docs, workers=2))
+        assert all(r["ok"] for r in results)
+    assert len(cache_mod.default_cache()) == 4
+
+    summary = list(verify_many(docs, content=True))[-1]["summary"]
+    assert summary == {"total": 4, "ok": 4, "failed": 0}
+
+
+def test_tree_mode_cache_hit_keeps_tree_fields(tmp_path: Path, monkeypatch) -> None:
+    from digitalmeve.verifier import verify_file
+
+    f = _old_file(tmp_path, "big.bin", b"chunked " * 4096)
+    first = generator.generate_meve(f, hash_mode="tree", chunk_size=4096)
+
+    def _fail(*a, **k):
+        raise AssertionError("file should not be re-read")
+
+    monkeypatch.setattr(generator, "tree_digest", _fail)
+    second = generator.generate_meve(
+        f, hash_mode="tree", chunk_size=4096, also_json=True
+    )
+    assert second["subject"] == first["subject"]
+    assert second["subject"]["hash_mode"] == "tree"
+    assert second["subject"]["chunk_size"] == 4096
+
+    ok, info = verify_file(f, content=True)
+    assert ok, info
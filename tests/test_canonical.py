@@ -0,0 +1,17 @@
+import json
+
+import pytest
+
+from digitalmeve.canonical import canonical_bytes, canonical_json
+
+
+def test_canonical_sorted_compact_utf8():
+    obj = {"b": [1, 2.5, None, True], "a": {"é": "ü", "c": "x"}}
+    assert canonical_json(obj) == '{"a":{"c":"x","é":"ü"},"b":[1,2.5,null,true]}'
+    assert canonical_bytes(obj) == canonical_json(obj).encode("utf-8")
+    assert canonical_json(json.loads(canonical_json(obj))) == canonical_json(obj)
+
+
+def test_canonical_rejects_nan():
+    with pytest.raises(ValueError):
+        canonical_json({"x": float("nan")})
@@ -1,6 +1,7 @@
 # tests/test_cli.py
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import pathlib
@@ -62,3 +63,121 @@ def test_generate_then_inspect(tmp_path: pathlib.Path):
     assert r_ins.returncode == 0, r_ins.stderr
     summary = json.loads(r_ins.stdout)
     assert {"level", "issuer", "hash_prefix"}.issubset(summary.keys())
+
+
+def test_generate_batch_recursive_jsonl(tmp_path: pathlib.Path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    (tmp_path / "sub" / "b.txt").write_text("b", encoding="utf-8")
+    (tmp_path / "skip.bin").write_bytes(b"x")
+
+    r = run_cli("generate", str(tmp_path), "--glob", "*.txt", "-r", "--workers", "2")
+    assert r.returncode == 0, r.stderr
+    lines = [json.loads(line) for line in r.stdout.splitlines()]
+    names = sorted(pathlib.Path(x["file"]).name for x in lines)
+    assert names == ["a.txt", "b.txt"]
+    assert all(x["ok"] for x in lines)
+    assert (tmp_path / "sub" / "b.txt.meve.json").exists()
+
+
+def test_generate_from_stdin(tmp_path: pathlib.Path):
+    env = os.environ.copy()
+    env["PYTHONPATH"] = SRC_DIR
+    args = ["generate", "-", "--name", "in.txt", "--outdir", str(tmp_path)]
+    r = subprocess.run(
+        [sys.executable, "-m", "digitalmeve.cli", *args],
+        input=b"hello world",
+        capture_output=True,
+        env=env,
+    )
+    assert r.returncode == 0, r.stderr
+    proof = json.loads(r.stdout)
+    assert proof["subject"] == {
+        "filename": "in.txt",
+        "size": 11,
+        "hash_sha256": hashlib.sha256(b"hello world").hexdigest(),
+    }
+    assert r.stdout == (tmp_path / "in.txt.meve.json").read_bytes()
+
+
+def test_generate_stdin_rejects_file_options_and_unsafe_names(tmp_path):
+    from click.testing import CliRunner
+
+    from digitalmeve.cli import cli
+
+    runner = CliRunner()
+    r = runner.invoke(cli, ["generate", "-", "--hash-mode", "tree"], input=b"x")
+    assert r.exit_code == 2
+    assert "--hash-mode" in r.output
+
+    out = tmp_path / "out"
+    args = ["generate", "-", "--name", "../../escape.txt", "--outdir", str(out)]
+    r = runner.invoke(cli, args, input=b"x")
+    assert r.exit_code == 0, r.output
+    assert (out / "escape.txt.meve.json").exists()
+    assert not list(tmp_path.glob("*.meve.json"))
+
+
+def test_verify_detects_tampered_document(tmp_path: pathlib.Path):
+    doc = tmp_path / "note.txt"
+    doc.write_text("original", encoding="utf-8")
+    assert run_cli("generate", str(doc)).returncode == 0
+
+    assert run_cli("verify", str(doc)).returncode == 0
+    doc.write_text("tampered", encoding="utf-8")
+    r = run_cli("verify", str(doc))
+    assert r.returncode == 1
+    assert "Content mismatch" in r.stderr
+    assert run_cli("verify", str(doc), "--no-content").returncode == 0
+
+
+def test_verify_batch_glob_jsonl(tmp_path: pathlib.Path):
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(name, encoding="utf-8")
+    assert run_cli("generate", str(tmp_path), "--glob", "*.txt").returncode == 0
+
+    r = run_cli("verify", str(tmp_path), "--glob", "*.txt", "--workers", "2")
+    assert r.returncode == 0, r.stderr
+    lines = [json.loads(line) for line in r.stdout.splitlines()]
+    assert lines[-1] == {"summary": {"total": 2, "ok": 2, "failed": 0}}
+    assert all(x["ok"] for x in lines[:-1])
+
+
+def test_watch_help_ok():
+    r = run_cli("watch", "--help")
+    assert r.returncode == 0
+    assert "--debounce" in r.stdout
+
+
+def test_generate_delta_middle_edit_then_verify(tmp_path: pathlib.Path):
+    img = tmp_path / "disk.img"
+    img.write_bytes(b"x" * 10 * 4096)
+    args = ["generate", str(img), "--delta", "--chunk-size", "4096", "--no-cache"]
+    assert run_cli(*args).returncode == 0
+
+    with img.open("r+b") as f:  # bloc 5 modifié en place, puis ajout
+        f.seek(5 * 4096 + 7)
+        f.write(b"Y")
+    with img.open("ab") as f:
+        f.write(b"z" * 1000)
+    r = run_cli(*args)
+    assert r.returncode == 0, r.stderr
+
+    r = run_cli("verify", str(img))
+    assert r.returncode == 0, r.stdout + r.stderr
+
+    r = run_cli("generate", str(img), "--append-only")
+    assert r.returncode == 2
+    assert "--append-only requires --delta" in r.stderr
+
+
+def test_generate_single_file_prints_sidecar_bytes(tmp_path: pathlib.Path):
+    from click.testing import CliRunner
+
+    from digitalmeve.cli import cli
+
+    doc = tmp_path / "café.txt"
+    doc.write_text("hello world", encoding="utf-8")
+    r = CliRunner().invoke(cli, ["generate", str(doc), "--issuer", "Zoé"])
+    assert r.exit_code == 0, r.output
+    assert r.stdout_bytes == (tmp_path / "café.txt.meve.json").read_bytes()
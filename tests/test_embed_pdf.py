@@ -47,3 +47,17 @@ def test_png_embed_and_extract(tmp_path: Path) -> None:
     assert extracted is not None
     assert extracted.get("issuer") == "Personal"
     assert extracted.get("subject", {}).get("filename") == "sample.png"
+
+
+def test_png_bytes_variant_roundtrip(tmp_path: Path) -> None:
+    import io
+
+    from digitalmeve.embedding_png import embed_proof_png_bytes
+
+    buf = io.BytesIO()
+    Image.new("RGB", (2, 2), (0, 0, 255)).save(buf, format="PNG")
+    out = embed_proof_png_bytes(buf.getvalue(), {"issuer": "Bytes"})
+
+    dst = tmp_path / "mem.png"
+    dst.write_bytes(out)
+    assert extract_proof_png(dst) == {"issuer": "Bytes"}
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PIL import Image
+
+from digitalmeve.embedding_jpeg import (
+    embed_proof_jpeg,
+    embed_proof_jpeg_bytes,
+    extract_proof_jpeg,
+)
+from digitalmeve.generator import prove_file
+from digitalmeve.verifier import verify_file
+
+
+def _jpeg(path: Path) -> bytes:
+    exif = Image.Exif()
+    exif[0x010F] = "CameraMaker"
+    Image.effect_noise((128, 96), 40).convert("RGB").save(path, "JPEG", exif=exif)
+    return path.read_bytes()
+
+
+def test_jpeg_splice_keeps_scan_data(tmp_path: Path) -> None:
+    src = tmp_path / "photo.jpg"
+    original = _jpeg(src)
+
+    out = embed_proof_jpeg(src, {"issuer": "Été"})
+    assert out == tmp_path / "photo.meve.jpg"
+    data = out.read_bytes()
+
+    sos = original.index(b"\xff\xda")
+    assert data.endswith(original[sos:])  # données compressées intactes
+    assert data[2:4] == original[2:4]  # JFIF/Exif restent en tête
+    assert extract_proof_jpeg(out) == {"issuer": "Été"}
+    with Image.open(out) as im:
+        im.load()
+        assert im.getexif()[0x010F] == "CameraMaker"
+
+
+def test_jpeg_multi_segment_and_replace(tmp_path: Path) -> None:
+    src = tmp_path / "big.jpeg"
+    original = _jpeg(src)
+    proof = {"metadata": {"notes": "x" * 200_000}}
+
+    once = embed_proof_jpeg_bytes(original, proof)
+    assert once.count(b"DigitalMeve\x00") == 4
+    twice = embed_proof_jpeg_bytes(once, {"n": 2})
+    assert twice.count(b"DigitalMeve\x00") == 1
+
+    (tmp_path / "twice.jpeg").write_bytes(twice)
+    assert extract_proof_jpeg(tmp_path / "twice.jpeg") == {"n": 2}
+    (tmp_path / "once.jpeg").write_bytes(once)
+    assert extract_proof_jpeg(tmp_path / "once.jpeg") == proof
+    assert extract_proof_jpeg(src) is None
+
+
+def test_prove_and_verify_jpeg(tmp_path: Path) -> None:
+    src = tmp_path / "photo.jpg"
+    _jpeg(src)
+
+    res = prove_file(src, use_cache=False)
+    assert res["ok"] and res["embedded"] == str(tmp_path / "photo.meve.jpg")
+    ok, info = verify_file(res["embedded"])
+    assert ok and info["subject"]["filename"] == "photo.jpg"
+
+
+def test_prove_fake_jpeg_falls_back_to_sidecar(tmp_path: Path) -> None:
+    src = tmp_path / "fake.jpg"
+    src.write_bytes(b"not really a jpeg")
+
+    res = prove_file(src, use_cache=False)
+    assert res["ok"] and res["embedded"] is None
+    assert verify_file(src, content=True)[0] is True
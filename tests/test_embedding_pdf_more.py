@@ -41,3 +41,64 @@ def test_pdf_embed_with_out_path_and_extract(tmp_path: Path):
     assert isinstance(extracted, dict)
     assert extracted.get("issuer") == "Personal"
     assert extracted.get("subject", {}).get("filename") == "doc.pdf"
+
+
+def test_pdf_incremental_update_keeps_original_bytes(tmp_path: Path):
+    for mode in (pikepdf.ObjectStreamMode.disable, pikepdf.ObjectStreamMode.generate):
+        src = tmp_path / f"{mode.name}.pdf"
+        with pikepdf.Pdf.new() as pdf:
+            pdf.add_blank_page()
+            pdf.docinfo["/Title"] = "Rapport"
+            pdf.save(str(src), object_stream_mode=mode)
+        original = src.read_bytes()
+
+        out = embed_proof_pdf(src, _proof_for(src.name), tmp_path / "out.pdf")
+        data = out.read_bytes()
+        assert data.startswith(original)
+        assert b"/Prev" in data[len(original) :]  # noqa: E203
+        assert extract_proof_pdf(out)["subject"]["filename"] == src.name
+
+        # ré-embarquement sur place : nouvelle révision, Info préservé
+        embed_proof_pdf(out, _proof_for("second.pdf"), out)
+        assert out.read_bytes().startswith(data)
+        assert extract_proof_pdf(out)["subject"]["filename"] == "second.pdf"
+        with pikepdf.Pdf.open(out) as pdf:
+            assert not pdf.get_warnings()
+            assert str(pdf.docinfo["/Title"]) == "Rapport"
+            assert len(pdf.pages) == 1
+
+
+def test_pdf_full_rewrite_still_available(tmp_path: Path):
+    src = tmp_path / "doc.pdf"
+    with pikepdf.Pdf.new() as pdf:
+        pdf.add_blank_page()
+        pdf.save(str(src))
+
+    out = embed_proof_pdf(src, _proof_for("doc.pdf"), incremental=False)
+    assert out == tmp_path / "doc.meve.pdf"
+    assert extract_proof_pdf(out)["issuer"] == "Personal"
+
+
+def test_pdf_bytes_and_stream_variants(tmp_path: Path):
+    import io
+
+    from digitalmeve.embedding_pdf import embed_proof_pdf_bytes, embed_proof_pdf_stream
+
+    src = tmp_path / "doc.pdf"
+    with pikepdf.Pdf.new() as pdf:
+        pdf.add_blank_page()
+        pdf.save(str(src))
+    data = src.read_bytes()
+
+    out = embed_proof_pdf_bytes(data, _proof_for("doc.pdf"))
+    assert out.startswith(data)
+    (tmp_path / "a.pdf").write_bytes(out)
+    assert extract_proof_pdf(tmp_path / "a.pdf")["issuer"] == "Personal"
+
+    dst = io.BytesIO()
+    embed_proof_pdf_stream(io.BytesIO(data), _proof_for("doc.pdf"), dst)
+    assert dst.getvalue() == out
+
+    rewritten = embed_proof_pdf_bytes(data, _proof_for("doc.pdf"), incremental=False)
+    (tmp_path / "b.pdf").write_bytes(rewritten)
+    assert extract_proof_pdf(tmp_path / "b.pdf")["subject"]["filename"] == "doc.pdf"
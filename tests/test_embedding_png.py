@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import io
+import zlib
+from pathlib import Path
+
+import pytest
+from PIL import Image, PngImagePlugin
+
+from digitalmeve.embedding_png import (
+    embed_proof_png,
+    embed_proof_png_bytes,
+    extract_proof_png,
+    extract_proof_png_stream,
+    read_png_text,
+)
+
+
+def _png_with_icc(path: Path) -> bytes:
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Author", "Alice")
+    im = Image.new("RGB", (64, 64), (10, 20, 30))
+    im.save(path, pnginfo=info, icc_profile=b"fake-icc-profile" * 4)
+    return path.read_bytes()
+
+
+def _chunk_types(data: bytes) -> list[bytes]:
+    types, pos = [], 8
+    while pos < len(data):
+        length = int.from_bytes(data[pos : pos + 4], "big")  # noqa: E203
+        types.append(data[pos + 4 : pos + 8])  # noqa: E203
+        pos += 12 + length
+    return types
+
+
+def test_png_chunk_splice_keeps_original_chunks(tmp_path: Path) -> None:
+    src = tmp_path / "scan.png"
+    original = _png_with_icc(src)
+
+    out = embed_proof_png(src, {"issuer": "Été"}, tmp_path / "scan.meve.png")
+    data = out.read_bytes()
+
+    # IDAT, iCCP, tEXt recopiés octet pour octet ; preuve juste après IHDR
+    assert _chunk_types(data) == [
+        b"IHDR",
+        b"iTXt",
+        *_chunk_types(original)[1:],
+    ]
+    assert original[33:] in data  # tout ce qui suit IHDR est inchangé
+    with Image.open(out) as im:
+        im.load()  # CRC et données valides
+        assert im.info["icc_profile"] == b"fake-icc-profile" * 4
+        assert im.info["Author"] == "Alice"
+    assert extract_proof_png(out) == {"issuer": "Été"}
+
+
+def test_png_reembed_replaces_previous_proof(tmp_path: Path) -> None:
+    src = tmp_path / "a.png"
+    _png_with_icc(src)
+    embed_proof_png(src, {"n": 1}, src)
+    embed_proof_png(src, {"n": 2}, src)
+
+    assert extract_proof_png(src) == {"n": 2}
+    assert _chunk_types(src.read_bytes()).count(b"iTXt") == 1
+
+
+def test_png_embed_rejects_non_png() -> None:
+    with pytest.raises(ValueError):
+        embed_proof_png_bytes(b"GIF89a" + bytes(20), {"n": 1})
+    buf = io.BytesIO()
+    Image.new("L", (1, 1)).save(buf, format="PNG")
+    assert embed_proof_png_bytes(buf.getvalue(), {"n": 1}).endswith(b"IEND\xaeB`\x82")
+
+
+class _CountingReader(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, n: int = -1) -> bytes:
+        chunk = super().read(n)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize(
+    "add",
+    [
+        lambda info, text: info.add_text("meve_proof", text),
+        lambda info, text: info.add_text("meve_proof", text, zip=True),
+        lambda info, text: info.add_itxt("meve_proof", text, zip=True),
+    ],
+)
+def test_png_scanner_reads_text_chunks_only(add) -> None:
+    info = PngImagePlugin.PngInfo()
+    add(info, '{"issuer":"scan"}')
+    buf = io.BytesIO()
+    Image.effect_noise((512, 512), 64).save(buf, format="PNG", pnginfo=info)
+
+    # chunk texte déplacé après les IDAT : le scanner saute les données
+    data = buf.getvalue()
+    types = _chunk_types(data)
+    pos, parts = 8, []
+    for ctype in types:
+        length = int.from_bytes(data[pos : pos + 4], "big")  # noqa: E203
+        parts.append((ctype, data[pos : pos + 12 + length]))  # noqa: E203
+        pos += 12 + length
+    text = [p for t, p in parts if t in (b"tEXt", b"zTXt", b"iTXt")]
+    rest = [p for t, p in parts if t not in (b"tEXt", b"zTXt", b"iTXt")]
+    moved = data[:8] + b"".join(rest[:-1] + text + rest[-1:])
+
+    reader = _CountingReader(moved)
+    assert read_png_text(reader) == '{"issuer":"scan"}'
+    assert reader.bytes_read < 200 < len(moved)
+
+
+@pytest.mark.parametrize(
+    "ctype, body",
+    [
+        (b"iTXt", b"meve_proof\x00"),
+        (b"iTXt", b"meve_proof\x00\x00"),
+        (b"iTXt", b"meve_proof\x00\x01\x00\x00\x00garbage"),
+        (b"zTXt", b"meve_proof\x00"),
+    ],
+)
+def test_png_malformed_text_chunk_is_ignored(ctype: bytes, body: bytes) -> None:
+    buf = io.BytesIO()
+    Image.new("L", (1, 1)).save(buf, format="PNG")
+    data = buf.getvalue()
+    crc = zlib.crc32(ctype + body).to_bytes(4, "big")
+    chunk = len(body).to_bytes(4, "big") + ctype + body + crc
+    bad = data[:-12] + chunk + data[-12:]  # juste avant IEND
+
+    assert extract_proof_png_stream(io.BytesIO(bad)) is None
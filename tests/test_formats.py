@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pikepdf
+from PIL import Image
+
+from digitalmeve import formats
+from digitalmeve.formats import FormatHandler, extract_embedded, sniff
+from digitalmeve.generator import prove_file
+from digitalmeve.verifier import verify_file
+
+
+def test_sniff_by_magic_bytes() -> None:
+    assert sniff(b"%PDF-1.7\n").name == "PDF"
+    assert sniff(b"\x1b%-12345X@PJL\r\n%PDF-1.4\n").name == "PDF"
+    assert sniff(b"  \n%PDF-2.0\n").name == "PDF"
+    assert sniff(b"the %PDF-1.7 header comes first") is None
+    assert sniff(b"\x89PNG\r\n\x1a\n\x00\x00").name == "PNG"
+    assert sniff(b"\xff\xd8\xff\xe0\x00\x10JFIF").name == "JPEG"
+    assert sniff(b"hello world") is None
+
+
+def test_mislabeled_files_are_dispatched_by_content(tmp_path: Path) -> None:
+    pdf = tmp_path / "scan.dat"
+    with pikepdf.Pdf.new() as doc:
+        doc.save(pdf)
+    png = tmp_path / "image.pdf"  # PNG nommé .pdf
+    Image.new("RGB", (8, 8)).save(png, "PNG")
+
+    res_pdf = prove_file(pdf, use_cache=False)
+    res_png = prove_file(png, use_cache=False)
+    assert res_pdf["embedded"] == str(tmp_path / "scan.dat.meve.pdf")
+    assert res_png["embedded"] == str(tmp_path / "image.pdf.meve.png")
+
+    proof = extract_embedded(tmp_path / "image.pdf.meve.png")
+    assert proof["subject"]["filename"] == "image.pdf"
+    ok, info = verify_file(tmp_path / "scan.dat.meve.pdf")
+    assert ok, info
+
+
+def test_text_file_named_pdf_never_reaches_pikepdf(tmp_path: Path, monkeypatch) -> None:
+    fake = tmp_path / "notes.pdf"
+    fake.write_text("not a pdf", encoding="utf-8")
+    monkeypatch.delitem(sys.modules, "digitalmeve.embedding_pdf", raising=False)
+
+    res = prove_file(fake, use_cache=False)
+    assert res["ok"] and res["embedded"] is None
+    assert extract_embedded(fake) is None
+    assert "digitalmeve.embedding_pdf" not in sys.modules
+
+
+def test_register_custom_handler(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(formats, "_HANDLERS", list(formats.handlers()))
+    formats.register(
+        FormatHandler(
+            name="MEVETXT",
+            suffixes=(".mtxt",),
+            sniff=lambda head: head.startswith(b"MEVETXT\n"),
+            module="json",
+            embed="dump",
+            extract="load",
+        )
+    )
+    doc = tmp_path / "a.mtxt"
+    doc.write_bytes(b'MEVETXT\n{"k": 1}')
+    assert formats.detect(doc).name == "MEVETXT"
+    assert formats.detect(doc).output_name(doc) == "a.meve.mtxt"
+
+
+def test_text_quoting_pdf_header_gets_sidecar(tmp_path: Path) -> None:
+    notes = tmp_path / "notes.txt"
+    notes.write_text("the %PDF-1.7 header", encoding="utf-8")
+
+    res = prove_file(notes, use_cache=False)
+    assert res["ok"] and res["embedded"] is None
+    assert res["sidecars"] == [str(tmp_path / "notes.txt.meve.json")]
+
+
+def test_unparsable_pdf_falls_back_to_sidecar(tmp_path: Path) -> None:
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"%PDF-1.7\n" + b"\x00garbage" * 50)
+
+    res = prove_file(broken, use_cache=False)
+    assert res["ok"], res
+    assert res["embedded"] is None
+    assert res["sidecars"] == [str(tmp_path / "broken.pdf.meve.json")]
+
+
+def test_extractor_parse_error_falls_back_to_sidecar(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from click.testing import CliRunner
+
+    from digitalmeve.cli import cli
+
+    monkeypatch.setattr(formats, "_HANDLERS", list(formats.handlers()))
+    formats.register(
+        FormatHandler(
+            name="MEVETXT",
+            suffixes=(".mtxt",),
+            sniff=lambda head: head.startswith(b"MEVETXT\n"),
+            module="json",
+            embed="dump",
+            extract="load",  # json.load : ValueError sur ce contenu
+        )
+    )
+    doc = tmp_path / "a.mtxt"
+    doc.write_bytes(b"MEVETXT\nnot json")
+    res = prove_file(doc, use_cache=False)
+    assert res["ok"] and res["embedded"] is None, res
+
+    assert extract_embedded(doc) is None
+    ok, info = verify_file(doc, content=True)
+    assert ok, info
+    r = CliRunner().invoke(cli, ["inspect", str(doc)])
+    assert r.exit_code == 0, r.output
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from digitalmeve.generator import generate_meve
+from digitalmeve.generator import generate_many, generate_meve, prove_file
 
 
 def test_generate_meve_returns_dict(tmp_path: Path):
@@ -17,3 +17,146 @@ def test_generate_meve_returns_dict(tmp_path: Path):
     assert "meve_version" in result
     assert "hash" in result
     assert "preview_b64" in result
+
+
+def test_generate_many_threads(tmp_path: Path):
+    files = []
+    for i in range(6):
+        f = tmp_path / f"doc{i}.txt"
+        f.write_text(f"content {i}")
+        files.append(f)
+
+    results = list(generate_many(files, workers=3))
+
+    assert sorted(r["file"] for r in results) == sorted(str(f) for f in files)
+    assert all(r["ok"] for r in results)
+    for r in results:
+        assert Path(r["file"] + ".meve.json").exists()
+        assert r["proof"]["subject"]["filename"] == Path(r["file"]).name
+
+
+def test_prove_file_reports_errors(tmp_path: Path):
+    res = prove_file(tmp_path / "missing.txt")
+    assert res["ok"] is False
+    assert "FileNotFoundError" in res["error"]
+
+
+def test_delta_reproof_reuses_chunks(tmp_path: Path, monkeypatch):
+    from digitalmeve import hashing
+    from digitalmeve.generator import manifest_path
+
+    log = tmp_path / "app.log"
+    log.write_bytes(b"a" * 40_000)
+    first = generate_meve(log, chunk_size=4096, manifest=True)
+    mpath = manifest_path(log)
+    assert mpath.exists()
+
+    with log.open("ab") as f:
+        f.write(b"b" * 3_000)
+
+    hashed = []
+    real_leaf = hashing._leaf
+
+    def _spy(data, *args):
+        hashed.append(len(data))
+        return real_leaf(data, *args)
+
+    monkeypatch.setattr(hashing, "_leaf", _spy)
+    second = generate_meve(log, manifest=True, previous=mpath, append_only=True)
+
+    # 9 blocs complets : 7 repris, 2 relus par contrôle (bords), plus le
+    # bloc partiel et l'ajout
+    assert len(hashed) == 4
+    full = generate_meve(log, hash_mode="tree", chunk_size=4096, use_cache=False)
+    assert second["hash"] == full["hash"] != first["hash"]
+    assert second["subject"]["size"] == 43_000
+
+
+def test_delta_in_place_edits_stay_correct(tmp_path: Path):
+    img = tmp_path / "disk.img"
+    img.write_bytes(b"x" * 8 * 4096)
+    generate_meve(img, chunk_size=4096, manifest=True)
+    mpath = img.with_name("disk.img.chunks.meve.json")
+
+    def full_hash() -> str:
+        full = generate_meve(img, hash_mode="tree", chunk_size=4096, use_cache=False)
+        return full["hash"]
+
+    for offset in (0, 8 * 4096 - 1):  # bords de la zone reprise : détectés
+        with img.open("r+b") as f:
+            f.seek(offset)
+            f.write(b"Y")
+        delta = generate_meve(img, manifest=True, previous=mpath, append_only=True)
+        assert delta["hash"] == full_hash()
+
+    with img.open("r+b") as f:  # au milieu : signalé via `dirty`
+        f.seek(3 * 4096 + 10)
+        f.write(b"Z")
+    fixed = generate_meve(img, manifest=True, previous=mpath, dirty=[(12298, 12299)])
+    assert fixed["hash"] == full_hash()
+
+    img.write_bytes(b"x" * 100)  # fichier raccourci : tout est relu
+    shrunk = generate_meve(img, manifest=True, previous=mpath, append_only=True)
+    assert shrunk["hash"] == full_hash()
+
+
+def test_delta_without_opt_in_hashes_in_full(tmp_path: Path):
+    from digitalmeve.generator import prove_file
+    from digitalmeve.verifier import verify_file
+
+    img = tmp_path / "disk.img"
+    img.write_bytes(b"x" * 10 * 4096)
+    assert prove_file(img, delta=True, chunk_size=4096, use_cache=False)["ok"]
+
+    # bloc 5 modifié en place puis ajout : ni bord ni `dirty`
+    with img.open("r+b") as f:
+        f.seek(5 * 4096 + 7)
+        f.write(b"Y")
+    with img.open("ab") as f:
+        f.write(b"z" * 1000)
+
+    res = prove_file(img, delta=True, use_cache=False)
+    assert res["ok"], res
+    full = generate_meve(img, hash_mode="tree", chunk_size=4096, use_cache=False)
+    assert res["proof"]["hash"] == full["hash"]
+    ok, info = verify_file(img, content=True)
+    assert ok, info
+
+
+def test_generate_meve_stream_matches_file(tmp_path: Path):
+    import io
+
+    from digitalmeve.generator import generate_meve_stream
+
+    data = b"streamed bytes" * 1000
+    f = tmp_path / "doc.bin"
+    f.write_bytes(data)
+
+    from_stream = generate_meve_stream(io.BytesIO(data), filename="doc.bin")
+    from_file = generate_meve(f, use_cache=False)
+    assert from_stream["subject"] == from_file["subject"]
+    assert from_stream["preview_b64"] == from_file["preview_b64"]
+
+
+def test_generate_many_mirrors_tree_under_outdir(tmp_path: Path):
+    from digitalmeve.utils import iter_files_relative
+
+    src, out = tmp_path / "src", tmp_path / "out"
+    for sub in ("a", "b"):
+        (src / sub).mkdir(parents=True)
+        (src / sub / "x.txt").write_text(sub)
+    loose = tmp_path / "x.txt"
+    loose.write_text("loose")
+
+    items = list(iter_files_relative([src], recursive=True)) + [(loose, Path())]
+    items.append((src / "a" / "x.txt", Path()))  # collision avec `loose`
+    results = list(generate_many(items, workers=2, outdir=out, use_cache=False))
+
+    by_ok = sorted((r["ok"], r["file"]) for r in results)
+    assert [ok for ok, _ in by_ok] == [False, True, True, True]
+    assert (out / "a" / "x.txt.meve.json").exists()
+    assert (out / "b" / "x.txt.meve.json").exists()
+    assert (out / "x.txt.meve.json").exists()
+    failed = next(r for r in results if not r["ok"])
+    assert failed["file"] == str(src / "a" / "x.txt")
+    assert "FileExistsError" in failed["error"]
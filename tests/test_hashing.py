@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from digitalmeve import hashing
+from digitalmeve.hashing import digest_file, tree_digest
+
+
+def test_digest_file_matches_hashlib(tmp_path: Path) -> None:
+    data = bytes(range(256)) * 1000
+    f = tmp_path / "blob.bin"
+    f.write_bytes(data)
+
+    d = digest_file(f, preview_bytes=16)
+    assert d.hexdigest == hashlib.sha256(data).hexdigest()
+    assert d.preview == data[:16]
+    assert d.size == len(data)
+
+
+def test_digest_file_mmap_path(tmp_path: Path, monkeypatch) -> None:
+    data = b"meve" * 50_000
+    f = tmp_path / "big.bin"
+    f.write_bytes(data)
+    monkeypatch.setattr(hashing, "_MMAP_THRESHOLD", 1024)
+
+    d = digest_file(f)
+    assert d.hexdigest == hashlib.sha256(data).hexdigest()
+    assert d.preview == data[:128]
+    assert d.size == len(data)
+
+
+def test_digest_file_empty(tmp_path: Path) -> None:
+    f = tmp_path / "empty.bin"
+    f.write_bytes(b"")
+    d = digest_file(f)
+    assert d.hexdigest == hashlib.sha256(b"").hexdigest()
+    assert (d.preview, d.size) == (b"", 0)
+
+
+def test_tree_digest_matches_definition(tmp_path: Path) -> None:
+    data = bytes(range(256)) * 40  # 10240 octets -> 3 blocs de 4096
+    f = tmp_path / "tree.bin"
+    f.write_bytes(data)
+
+    d = tree_digest(f, chunk_size=4096, workers=2)
+    leaves = [
+        hashlib.sha256(b"\x00" + data[i : i + 4096]).digest()  # noqa: E203
+        for i in range(0, len(data), 4096)
+    ]
+    assert d.leaves == tuple(leaves)
+    assert d.hexdigest == hashlib.sha256(b"\x01" + b"".join(leaves)).hexdigest()
+    assert d.size == len(data)
+    assert d.preview == data[:128]
+
+
+def test_generate_meve_tree_mode(tmp_path: Path) -> None:
+    from digitalmeve.generator import generate_meve
+    from digitalmeve.verifier import verify_meve
+
+    f = tmp_path / "big.bin"
+    f.write_bytes(b"z" * 10000)
+    proof = generate_meve(f, hash_mode="tree", chunk_size=4096, use_cache=False)
+    subject = proof["subject"]
+    assert subject["hash_mode"] == "tree"
+    assert subject["chunk_size"] == 4096
+    assert subject["hash_sha256"] == tree_digest(f, chunk_size=4096).hexdigest
+    assert verify_meve(proof)[0] is True
+
+    subject["hash_mode"] = "merkle-v9"
+    assert verify_meve(proof) == (False, {"error": "Unsupported hash mode"})
+
+
+def test_blake2b_proof_records_algorithm(tmp_path: Path) -> None:
+    from digitalmeve.generator import generate_meve
+    from digitalmeve.verifier import verify_meve
+
+    f = tmp_path / "doc.txt"
+    f.write_bytes(b"fast hash")
+    proof = generate_meve(f, algorithm="blake2b", use_cache=False)
+    subject = proof["subject"]
+    assert "hash_sha256" not in subject
+    assert subject["hash_alg"] == "blake2b"
+    assert subject["digest"] == hashlib.blake2b(b"fast hash").hexdigest()
+    assert proof["hash"] == subject["digest"]
+    assert verify_meve(proof)[0] is True
+
+    subject["hash_alg"] = "md4-ish"
+    assert verify_meve(proof) == (False, {"error": "Unsupported hash algorithm"})
+
+
+def test_unknown_algorithm_rejected(tmp_path: Path) -> None:
+    import pytest
+
+    f = tmp_path / "doc.txt"
+    f.write_bytes(b"x")
+    with pytest.raises(ValueError):
+        digest_file(f, algorithm="nope")
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from digitalmeve.generator import generate_many
+from digitalmeve.ledger import (
+    DEFAULT_LEDGER_NAME,
+    LedgerError,
+    LedgerReader,
+    LedgerWriter,
+    Ledgers,
+    lookup,
+)
+from digitalmeve.verifier import verify_file, verify_many
+
+
+def _proof(name: str, digest: str) -> dict:
+    return {
+        "issuer": "Personal",
+        "subject": {"filename": name, "size": 1, "hash_sha256": digest},
+        "hash": digest,
+    }
+
+
+def test_writer_reader_roundtrip(tmp_path: Path) -> None:
+    seg = tmp_path / "job.meve.ledger"
+    with LedgerWriter(seg) as w:
+        w.append(_proof("a.txt", "aa" * 32), "a.txt")
+        w.append(_proof("b.txt", "bb" * 32), "sub/b.txt")
+        w.append(_proof("a.txt", "cc" * 32), "a.txt")  # nouvelle version
+
+    r = LedgerReader(seg)
+    assert r.complete and len(r) == 2
+    assert r.get("a.txt")["hash"] == "cc" * 32
+    assert r.get("sub/b.txt")["subject"]["filename"] == "b.txt"
+    assert r.find_hash("AA" * 32)["hash"] == "aa" * 32
+    assert r.get("missing.txt") is None
+
+
+def test_reopen_appends_after_clean_close(tmp_path: Path) -> None:
+    seg = tmp_path / "job.meve.ledger"
+    with LedgerWriter(seg) as w:
+        w.append(_proof("a.txt", "aa" * 32), "a.txt")
+    with LedgerWriter(seg) as w:
+        w.append(_proof("b.txt", "bb" * 32), "b.txt")
+
+    r = LedgerReader(seg)
+    assert r.complete
+    assert sorted(r.keys()) == ["a.txt", "b.txt"]
+
+
+def test_recovery_after_crash(tmp_path: Path) -> None:
+    seg = tmp_path / "job.meve.ledger"
+    w = LedgerWriter(seg, fsync_every=1)
+    w.append(_proof("a.txt", "aa" * 32), "a.txt")
+    w.append(_proof("b.txt", "bb" * 32), "b.txt")
+    w._f.flush()
+    size = seg.stat().st_size
+    with open(seg, "ab") as f:  # record à moitié écrit, pas de trailer
+        f.write(b"\x00\x00\x01\x00garbage")
+    w._f.close()  # « panne » : ni index ni trailer
+
+    r = LedgerReader(seg)
+    assert not r.complete
+    assert r.get("b.txt")["hash"] == "bb" * 32
+
+    with LedgerWriter(seg) as w:
+        assert seg.stat().st_size == size  # reliquat tronqué
+        w.append(_proof("c.txt", "cc" * 32), "c.txt")
+    r = LedgerReader(seg)
+    assert r.complete
+    assert sorted(r.keys()) == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_single_writer_per_segment(tmp_path: Path) -> None:
+    seg = tmp_path / "job.meve.ledger"
+    with LedgerWriter(seg):
+        with pytest.raises(LedgerError):
+            LedgerWriter(seg)
+
+
+def test_generate_and_verify_through_ledger(tmp_path: Path) -> None:
+    docs = []
+    for i in range(5):
+        doc = tmp_path / f"doc{i}.txt"
+        doc.write_text(f"content {i}", encoding="utf-8")
+        docs.append(doc)
+
+    with Ledgers() as ledgers:
+        results = list(generate_many(docs, workers=2, ledger=ledgers, use_cache=False))
+    assert all(r["ok"] and r["sidecars"] == [] for r in results)
+    assert {r["ledger"] for r in results} == {str(tmp_path / DEFAULT_LEDGER_NAME)}
+    assert not list(tmp_path.glob("*.meve.json"))
+
+    assert lookup(docs[3])["subject"]["filename"] == "doc3.txt"
+    ok, info = verify_file(docs[0], content=True)
+    assert ok, info
+
+    docs[1].write_text("tampered", encoding="utf-8")
+    summary = list(verify_many(docs, content=True))[-1]["summary"]
+    assert summary == {"total": 5, "ok": 4, "failed": 1}
+
+
+def test_cli_generate_ledger_then_inspect(tmp_path: Path) -> None:
+    from click.testing import CliRunner
+
+    from digitalmeve.cli import cli
+
+    (tmp_path / "in").mkdir()
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / "in" / name).write_text(name, encoding="utf-8")
+    seg = tmp_path / "job.meve.ledger"
+
+    runner = CliRunner()
+    r = runner.invoke(cli, ["generate", str(tmp_path / "in"), "--ledger", str(seg)])
+    assert r.exit_code == 0, r.output
+    assert seg.exists() and not list((tmp_path / "in").glob("*.meve.json"))
+
+    r = runner.invoke(
+        cli, ["inspect", str(tmp_path / "in" / "b.txt"), "--ledger", str(seg)]
+    )
+    assert r.exit_code == 0, r.output
+    assert json.loads(r.output)["filename"] == "b.txt"
+
+    r = runner.invoke(cli, ["verify", str(tmp_path / "in"), "--ledger", str(seg)])
+    assert r.exit_code == 0, r.output
+
+
+def test_ledgers_bound_open_segments(tmp_path: Path) -> None:
+    docs = []
+    for d in range(5):
+        (tmp_path / f"d{d}").mkdir()
+        for i in range(3):
+            doc = tmp_path / f"d{d}" / f"f{i}.txt"
+            doc.write_text(f"{d}-{i}", encoding="utf-8")
+            docs.append(doc)
+
+    with Ledgers(max_open=2) as ledgers:
+        # ordre entrelacé : chaque segment est fermé puis rouvert
+        for doc in sorted(docs, key=lambda p: p.name):
+            ledgers.append(doc, _proof(doc.name, "00" * 32))
+            assert len(ledgers._writers) <= 2
+
+    for d in range(5):
+        r = LedgerReader(tmp_path / f"d{d}" / DEFAULT_LEDGER_NAME)
+        assert r.complete
+        assert sorted(r.keys()) == ["f0.txt", "f1.txt", "f2.txt"]
+
+
+def test_ledger_per_dir_under_low_fd_limit(tmp_path: Path) -> None:
+    resource = pytest.importorskip("resource")
+    root = tmp_path / "tree"
+    for d in range(120):
+        (root / f"d{d:03}").mkdir(parents=True)
+        (root / f"d{d:03}" / "a.txt").write_text(str(d), encoding="utf-8")
+
+    def limit_fds() -> None:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (80, 80))
+
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    args = ["generate", str(root), "-r", "--ledger-per-dir", "--workers", "4"]
+    r = subprocess.run(
+        [sys.executable, "-m", "digitalmeve.cli", *args, "--no-cache"],
+        capture_output=True,
+        env={**os.environ, "PYTHONPATH": src},
+        preexec_fn=limit_fds,
+    )
+    lines = [json.loads(line) for line in r.stdout.splitlines()]
+    assert r.returncode == 0, r.stderr
+    assert len(lines) == 120 and all(x["ok"] for x in lines)
+
+
+def test_corrupted_record_mid_segment_is_not_truncated(tmp_path: Path) -> None:
+    seg = tmp_path / "job.meve.ledger"
+    w = LedgerWriter(seg)
+    offsets = [w.append(_proof(n, n[0] * 64), n) for n in ("a.txt", "b.txt", "c.txt")]
+    w._f.close()  # « panne » : ni index ni trailer
+
+    data = bytearray(seg.read_bytes())
+    data[offsets[1] + 20] ^= 0xFF  # bit pourri dans le record du milieu
+    seg.write_bytes(bytes(data))
+
+    with pytest.raises(LedgerError):
+        LedgerWriter(seg)
+    assert seg.read_bytes() == bytes(data)  # c.txt toujours sur disque
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pikepdf
+import pytest
+
+from digitalmeve.embedding_pdf import embed_proof_pdf, extract_proof_pdf
+from digitalmeve.pdf_trailer import PdfTrailerError, decode_pdf_text, read_info_string
+
+PROOF = {"issuer": "Été — 日本 (x) \\", "hash": "ab"}
+
+
+def _pdf(path: Path, **save_options) -> Path:
+    with pikepdf.Pdf.new() as pdf:
+        for _ in range(3):
+            pdf.add_blank_page()
+        pdf.docinfo["/Title"] = "Rapport"
+        pdf.save(str(path), **save_options)
+    return path
+
+
+@pytest.mark.parametrize("mode", list(pikepdf.ObjectStreamMode))
+@pytest.mark.parametrize("linearize", [False, True])
+def test_trailer_reader_matches_pikepdf(tmp_path: Path, mode, linearize):
+    src = _pdf(tmp_path / "src.pdf", object_stream_mode=mode, linearize=linearize)
+    assert read_info_string(src, "Title") == "Rapport"
+    assert read_info_string(src, "MeveProof") is None
+
+    for incremental in (True, False):
+        out = embed_proof_pdf(src, PROOF, tmp_path / "out.pdf", incremental=incremental)
+        assert extract_proof_pdf(out) == PROOF
+        with pikepdf.Pdf.open(out) as pdf:
+            expected = str(pdf.docinfo["/MeveProof"])
+        assert read_info_string(out, "MeveProof") == expected
+
+
+def test_trailer_reader_refuses_encrypted(tmp_path: Path):
+    src = _pdf(tmp_path / "plain.pdf")
+    with pikepdf.Pdf.open(src) as pdf:
+        pdf.docinfo["/MeveProof"] = '{"issuer":"enc"}'
+        enc = tmp_path / "enc.pdf"
+        pdf.save(str(enc), encryption=pikepdf.Encryption(owner="o", user=""))
+
+    with pytest.raises(PdfTrailerError):
+        read_info_string(enc, "MeveProof")
+    assert extract_proof_pdf(enc) == {"issuer": "enc"}  # repli pikepdf
+
+
+def test_decode_pdf_text():
+    assert decode_pdf_text(b"\xfe\xff\x65\xe5") == "日"
+    assert decode_pdf_text(b"\x84\xa0\xe9") == "—€é"
+
+
+def test_corrupt_xref_stream_falls_back_to_pikepdf(tmp_path: Path, monkeypatch):
+    from digitalmeve import embedding_pdf
+
+    mode = pikepdf.ObjectStreamMode.generate
+    src = _pdf(tmp_path / "src.pdf", object_stream_mode=mode)
+    data = bytearray(src.read_bytes())
+    xref = int(data[data.rindex(b"startxref") + 9 :].split()[0])  # noqa: E203
+    start = data.index(b"stream", xref) + len(b"stream")
+    start += 2 if data[start : start + 2] == b"\r\n" else 1  # noqa: E203
+    data[start : start + 2] = b"\xff\xff"  # noqa: E203  en-tête zlib invalide
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(bytes(data))
+
+    with pytest.raises(PdfTrailerError):
+        read_info_string(bad, "MeveProof")
+    monkeypatch.setattr(embedding_pdf, "_extract_with_pikepdf", lambda f: "repli")
+    assert extract_proof_pdf(bad) == "repli"
@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from digitalmeve.generator import generate_meve, prove_file
+from digitalmeve.proof import Proof, proof_bytes
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"algorithm": "blake2b"}, {"hash_mode": "tree", "chunk_size": 4}]
+)
+def test_proof_dict_roundtrip(tmp_path: Path, kwargs):
+    doc = tmp_path / "doc.txt"
+    doc.write_bytes(b"roundtrip me")
+    d = generate_meve(doc, use_cache=False, **kwargs)
+
+    proof = Proof.from_dict(d)
+    assert proof.to_dict() == d
+    assert list(proof.to_dict()) == list(d)
+    assert json.loads(proof.to_json()) == d
+
+
+def test_proof_is_slotted_and_serialized_once(tmp_path: Path):
+    d = {
+        "meve_version": "1.0",
+        "issuer": "Été",
+        "timestamp": "2024-01-01T00:00:00Z",
+        "subject": {"filename": "a", "size": 1, "hash_sha256": "0" * 64, "x": 1},
+        "hash": "0" * 64,
+        "custom": True,
+    }
+    proof = Proof.from_dict(d)
+    assert not hasattr(proof, "__dict__")
+    assert proof.to_dict() == {**d, "metadata": {}}
+    assert proof.to_bytes() is proof.to_bytes()
+    assert "Été" in proof.to_json()  # UTF-8, non échappé
+    assert proof_bytes(proof) is proof.to_bytes()
+
+
+def test_prove_file_sidecars_match_proof(tmp_path: Path):
+    doc = tmp_path / "doc.bin"
+    doc.write_bytes(b"\x00" * 10)
+    res = prove_file(doc, outdir=tmp_path / "out", use_cache=False)
+
+    expected = Proof.from_dict(res["proof"]).to_bytes()
+    assert all(Path(s).read_bytes() == expected for s in res["sidecars"])
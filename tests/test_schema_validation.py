@@ -0,0 +1,78 @@
+import copy
+from pathlib import Path
+
+import pytest
+
+from digitalmeve.generator import generate_meve
+from digitalmeve.schema import (
+    SchemaError,
+    compile_schema,
+    load_schema,
+    validate_proof,
+)
+from digitalmeve.verifier import verify_meve
+
+
+def _proof(tmp_path: Path, **kwargs) -> dict:
+    doc = tmp_path / "doc.txt"
+    doc.write_bytes(b"hello schema")
+    return generate_meve(doc, use_cache=False, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"algorithm": "blake2b"}, {"hash_mode": "tree", "chunk_size": 4}]
+)
+def test_generated_proofs_are_schema_valid(tmp_path: Path, kwargs):
+    proof = _proof(tmp_path, **kwargs)
+    validate_proof(proof)
+    assert verify_meve(proof, schema=True) == (True, proof)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda p: p.update(meve_version="2.0"),
+        lambda p: p.update(timestamp="yesterday"),
+        lambda p: p["subject"].update(size=-1),
+        lambda p: p.update(hash="ABC") or p["subject"].update(hash_sha256="ABC"),
+        lambda p: p.update(metadata=[]),
+    ],
+)
+def test_invalid_proofs_rejected(tmp_path: Path, mutate):
+    proof = _proof(tmp_path)
+    bad = copy.deepcopy(proof)
+    mutate(bad)
+
+    with pytest.raises(SchemaError):
+        validate_proof(bad)
+    ok, info = verify_meve(bad, schema=True)
+    assert not ok and info["error"].startswith("Schema validation failed:")
+
+
+def test_compiled_validator_agrees_with_fast_path(tmp_path: Path):
+    check = compile_schema(load_schema())
+    proof = _proof(tmp_path)
+    check(proof, "")
+
+    bad = copy.deepcopy(proof)
+    del bad["subject"]["hash_sha256"]
+    with pytest.raises(SchemaError):
+        check(bad, "")
+    with pytest.raises(SchemaError):
+        validate_proof(bad)
+
+
+def test_unsupported_keyword_refused():
+    with pytest.raises(ValueError):
+        compile_schema({"type": "object", "oneOf": []})
+
+
+def test_packaged_schema_matches_repo_copy():
+    # source unique : src/digitalmeve/schemas/ ; schema/ en est le miroir
+    root = Path(__file__).resolve().parents[1]
+    packaged = root / "src" / "digitalmeve" / "schemas" / "meve-1.schema.json"
+    mirror = root / "schema" / "meve-1.schema.json"
+    assert mirror.read_bytes() == packaged.read_bytes(), (
+        "schema/meve-1.schema.json is out of sync: "
+        "copy src/digitalmeve/schemas/meve-1.schema.json over it"
+    )
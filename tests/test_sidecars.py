@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from digitalmeve.generator import prove_file
+from digitalmeve.sidecars import SidecarIndex, find_sidecar, write_sidecars
+from digitalmeve.verifier import verify_many
+
+PROOF = {"issuer": "Personal", "hash": "00" * 32}
+
+
+def test_single_policy_writes_one_file(tmp_path: Path) -> None:
+    doc = tmp_path / "report.txt"
+    doc.write_text("x", encoding="utf-8")
+
+    outs = write_sidecars(doc, PROOF, None)
+    assert outs == [tmp_path / "report.txt.meve.json"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "report.txt",
+        "report.txt.meve.json",
+    ]
+    assert find_sidecar(doc) == outs[0]
+
+
+def test_links_policy_shares_one_inode(tmp_path: Path) -> None:
+    doc = tmp_path / "report.txt"
+    outs = write_sidecars(doc, PROOF, None, policy="links")
+    assert [p.name for p in outs] == ["report.txt.meve.json", "report.meve.json"]
+    assert outs[0].samefile(outs[1])
+
+    # régénération : les deux noms pointent vers le nouveau contenu
+    outs = write_sidecars(doc, {**PROOF, "issuer": "Other"}, None, policy="links")
+    assert outs[0].samefile(outs[1])
+    assert b"Other" in outs[1].read_bytes()
+
+
+def test_copies_policy_and_atomic_overwrite(tmp_path: Path) -> None:
+    doc = tmp_path / "report.txt"
+    (tmp_path / "report.meve.json").write_text("stale", encoding="utf-8")
+
+    outs = write_sidecars(doc, PROOF, tmp_path, policy="copies")
+    assert len(outs) == 2
+    assert not outs[0].samefile(outs[1])
+    assert outs[0].read_bytes() == outs[1].read_bytes()
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_unknown_policy_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        write_sidecars(tmp_path / "a.txt", PROOF, None, policy="many")
+
+
+def test_prove_file_writes_each_sidecar_once(tmp_path: Path) -> None:
+    doc = tmp_path / "a.txt"
+    doc.write_text("hello", encoding="utf-8")
+
+    res = prove_file(doc, also_json=True, use_cache=False)
+    assert res["sidecars"] == [str(tmp_path / "a.txt.meve.json")]
+
+    res = prove_file(doc, outdir=tmp_path / "out", use_cache=False)
+    assert res["sidecars"] == [
+        str(tmp_path / "a.txt.meve.json"),
+        str(tmp_path / "out" / "a.txt.meve.json"),
+    ]
+
+
+def test_sidecar_index_scans_each_directory_once(tmp_path: Path, monkeypatch) -> None:
+    for name in ("a.txt", "b.txt", "c.bin"):
+        (tmp_path / name).write_text(name, encoding="utf-8")
+    (tmp_path / "a.txt.meve.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "b.meve.json").write_text("{}", encoding="utf-8")
+
+    index = SidecarIndex()
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda p: scans.append(p) or real_scandir(p))
+    monkeypatch.setattr(Path, "exists", lambda self: pytest.fail("stat probe"))
+
+    assert find_sidecar(tmp_path / "a.txt", index) == tmp_path / "a.txt.meve.json"
+    assert find_sidecar(tmp_path / "b.txt", index) == tmp_path / "b.meve.json"
+    assert find_sidecar(tmp_path / "c.bin", index) is None
+    assert scans == [str(tmp_path)]
+
+
+def test_verify_many_uses_one_index_per_batch(tmp_path: Path, monkeypatch) -> None:
+    for i in range(6):
+        doc = tmp_path / f"doc{i}.txt"
+        doc.write_text(str(i), encoding="utf-8")
+        prove_file(doc, use_cache=False)
+
+    docs = sorted(tmp_path.glob("doc?.txt"))
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda p: scans.append(p) or real_scandir(p))
+    results = list(verify_many(docs, workers=2, content=True))
+
+    assert results[-1]["summary"] == {"total": 6, "ok": 6, "failed": 0}
+    assert scans == [str(tmp_path)]
+
+
+def test_inspect_single_file_does_not_scan_directory(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from click.testing import CliRunner
+
+    from digitalmeve.cli import cli
+
+    doc = tmp_path / "a.txt"
+    doc.write_text("hello", encoding="utf-8")
+    prove_file(doc)
+    monkeypatch.setattr(os, "scandir", lambda p: pytest.fail("directory scan"))
+
+    r = CliRunner().invoke(cli, ["inspect", str(doc)])
+    assert r.exit_code == 0, r.output
+    assert '"filename":"a.txt"' in r.output
@@ -0,0 +1,77 @@
+# tests/test_startup.py
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[1]
+SRC_DIR = str(REPO_ROOT / "src")
+
+# Backends lourds qui ne doivent pas être chargés au démarrage du CLI
+HEAVY = ("pikepdf", "PIL", "sqlite3", "multiprocessing")
+
+
+def run_py(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = SRC_DIR + (
+        os.pathsep + env["PYTHONPATH"] if "PYTHONPATH" in env else ""
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+
+LOADED = (
+    "import json, sys\n"
+    "print(json.dumps([m for m in %r if m in sys.modules]))\n" % (HEAVY,)
+)
+
+
+def test_cli_import_loads_no_backend():
+    r = run_py("import digitalmeve.cli\n" + LOADED)
+    assert r.returncode == 0, r.stderr
+    assert json.loads(r.stdout) == []
+
+
+def test_verify_sidecar_loads_no_backend(tmp_path: pathlib.Path):
+    from digitalmeve.generator import generate_meve
+
+    doc = tmp_path / "doc.txt"
+    doc.write_text("hello", encoding="utf-8")
+    generate_meve(doc, also_json=True, use_cache=False)
+
+    code = (
+        "import sys\n"
+        "from digitalmeve.cli import cli\n"
+        "try:\n"
+        "    cli(['verify', sys.argv[1]])\n"
+        "except SystemExit as e:\n"
+        "    assert not e.code, e.code\n" + LOADED
+    )
+    r = run_py(code, str(doc))
+    assert r.returncode == 0, r.stderr
+    assert json.loads(r.stdout.strip().splitlines()[-1]) == []
+
+
+# Borne large (≈ 100 ms mesurés en local) : détecte le retour d'un backend
+# lourd à l'import sans être sensible au bruit d'une machine de CI.
+IMPORT_BUDGET_US = 1_000_000
+
+
+def test_cli_import_time_within_budget(monkeypatch):
+    monkeypatch.setenv("PYTHONPROFILEIMPORTTIME", "1")  # = python -X importtime
+    cumulative = []
+    for _ in range(3):  # meilleur de trois : écarte un démarrage à froid
+        r = run_py("import digitalmeve.cli")
+        assert r.returncode == 0, r.stderr
+        line = next(
+            x for x in r.stderr.splitlines() if x.rstrip().endswith("digitalmeve.cli")
+        )
+        cumulative.append(int(line.split("|")[1]))
+    assert min(cumulative) < IMPORT_BUDGET_US, cumulative
@@ -1,4 +1,8 @@
-from digitalmeve.verifier import verify_identity
+from pathlib import Path
+
+from digitalmeve import verifier
+from digitalmeve.generator import generate_meve
+from digitalmeve.verifier import verify_file, verify_identity
 
 
 def test_verify_identity_valid():
@@ -7,3 +11,89 @@ def test_verify_identity_valid():
 
 def test_verify_identity_invalid():
     assert not verify_identity("")
+
+
+def _doc_with_sidecar(tmp_path: Path) -> Path:
+    doc = tmp_path / "contract.txt"
+    doc.write_bytes(b"pay 100 EUR")
+    generate_meve(doc, also_json=True, use_cache=False)
+    return doc
+
+
+def test_verify_file_content_binding(tmp_path: Path):
+    doc = _doc_with_sidecar(tmp_path)
+    sidecar = tmp_path / "contract.txt.meve.json"
+
+    assert verify_file(doc, content=True)[0] is True
+    assert verify_file(sidecar, content=True)[0] is True
+
+    doc.write_bytes(b"pay 900 EUR")  # même taille, contenu falsifié
+    assert verify_file(doc)[0] is True  # structure seule
+    assert verify_file(doc, content=True) == (False, {"error": "Content mismatch"})
+    assert verify_file(sidecar, content=None) == (
+        False,
+        {"error": "Content mismatch"},
+    )
+
+
+def test_verify_content_size_mismatch_reads_nothing(tmp_path: Path, monkeypatch):
+    doc = _doc_with_sidecar(tmp_path)
+    doc.write_bytes(b"pay 1000 EUR")
+
+    def _fail(*a, **k):
+        raise AssertionError("document must not be read")
+
+    monkeypatch.setattr(verifier, "digest_file", _fail)
+    assert verify_file(doc, content=True) == (False, {"error": "Size mismatch"})
+
+
+def test_verify_file_required_document_missing(tmp_path: Path):
+    doc = _doc_with_sidecar(tmp_path)
+    sidecar = tmp_path / "contract.txt.meve.json"
+    doc.unlink()
+    assert verify_file(sidecar, content=None)[0] is True
+    assert verify_file(sidecar, content=True) == (
+        False,
+        {"error": "Document not found"},
+    )
+
+
+def test_verify_many_streams_results_and_summary(tmp_path: Path):
+    from digitalmeve.verifier import verify_many
+
+    good = _doc_with_sidecar(tmp_path)
+    orphan = tmp_path / "orphan.txt"
+    orphan.write_text("no proof")
+
+    results = list(verify_many([good, orphan], workers=2, content=True))
+    assert results[-1] == {"summary": {"total": 2, "ok": 1, "failed": 1}}
+    by_file = {r["file"]: r for r in results[:-1]}
+    assert by_file[str(good)]["ok"] is True
+    assert by_file[str(orphan)]["ok"] is False
+    assert "No proof found" in by_file[str(orphan)]["error"]
+
+
+def test_verify_meve_typed_inputs_never_probe_filesystem(tmp_path: Path, monkeypatch):
+    doc = _doc_with_sidecar(tmp_path)
+    sidecar = tmp_path / "contract.txt.meve.json"
+    raw = sidecar.read_bytes()
+
+    def _no_probe(*args, **kwargs):
+        raise AssertionError("filesystem probe")
+
+    monkeypatch.setattr(Path, "exists", _no_probe)
+    monkeypatch.setattr(Path, "is_file", _no_probe)
+
+    for payload in (raw, bytearray(raw), memoryview(raw), raw.decode("utf-8")):
+        ok, info = verifier.verify_meve(payload)
+        assert ok is True
+        assert info["subject"]["filename"] == doc.name
+
+    assert verifier.load_proof(sidecar) == verifier.parse_proof_bytes(raw)
+    assert verifier.verify_meve(str(sidecar))[0] is True
+    assert verifier.verify_meve(str(tmp_path / "missing.json")) == (
+        False,
+        {"error": "Invalid proof"},
+    )
+    assert verifier.parse_proof_text("[1, 2]") is None
+    assert verifier.parse_proof_bytes(b"\xff") is None
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import errno
+import threading
+from pathlib import Path
+
+import pytest
+
+from digitalmeve import watch as watch_mod
+from digitalmeve.watch import watch
+
+
+class _Results:
+    """Résultats reçus du watcher ; `wait_for` bloque sans fenêtre de temps."""
+
+    def __init__(self) -> None:
+        self.items: list[dict] = []
+        self._cond = threading.Condition()
+
+    def append(self, res: dict) -> None:
+        with self._cond:
+            self.items.append(res)
+            self._cond.notify_all()
+
+    def wait_for(self, name: str, timeout: float = 30.0) -> None:
+        with self._cond:
+            found = self._cond.wait_for(
+                lambda: any(Path(r["file"]).name == name for r in self.items),
+                timeout,
+            )
+        assert found, f"{name} was never proved"
+
+    def names(self) -> list[str]:
+        return sorted(Path(r["file"]).name for r in self.items)
+
+
+def _start(tmp_path: Path, **kwargs):
+    results = _Results()
+    stop, ready = threading.Event(), threading.Event()
+    t = threading.Thread(
+        target=watch,
+        args=([tmp_path],),
+        kwargs={
+            "debounce": 0.1,
+            "poll_interval": 0.1,
+            "workers": 1,
+            "on_result": results.append,
+            "stop": stop,
+            "ready": ready,
+            "use_cache": False,
+            **kwargs,
+        },
+        daemon=True,
+    )
+    t.start()
+    assert ready.wait(10)  # watches posés
+    return results, stop, t
+
+
+def _finish(stop: threading.Event, t: threading.Thread) -> None:
+    # les preuves déjà lancées sont remises à on_result avant le retour
+    stop.set()
+    t.join(10)
+    assert not t.is_alive()
+
+
+@pytest.mark.parametrize("backend", ["auto", "poll"])
+def test_watch_proves_new_files_once(tmp_path: Path, backend: str) -> None:
+    results, stop, t = _start(tmp_path, backend=backend)
+    try:
+        with open(tmp_path / "in.txt", "w", encoding="utf-8") as f:
+            f.write("first part ")
+            f.flush()
+            f.write("second part")
+        results.wait_for("in.txt")
+        # témoin créé après l'écriture des sidecars : une fois prouvé, toute
+        # preuve (à tort) d'un sidecar est déjà partie
+        (tmp_path / "z.txt").write_text("sentinel", encoding="utf-8")
+        results.wait_for("z.txt")
+    finally:
+        _finish(stop, t)
+
+    assert results.names() == ["in.txt", "z.txt"]
+    first = next(r for r in results.items if r["file"].endswith("in.txt"))
+    assert first["ok"]
+    assert first["proof"]["subject"]["size"] == len("first part second part")
+    assert (tmp_path / "in.txt.meve.json").exists()
+
+
+def test_watch_existing_and_new_subdirectories(tmp_path: Path) -> None:
+    (tmp_path / "old.txt").write_text("old", encoding="utf-8")
+    (tmp_path / "done.txt").write_text("done", encoding="utf-8")
+    (tmp_path / "done.txt.meve.json").write_text("{}", encoding="utf-8")
+
+    results, stop, t = _start(tmp_path, existing=True, recursive=True)
+    try:
+        results.wait_for("old.txt")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "new.txt").write_text("new", encoding="utf-8")
+        results.wait_for("new.txt")
+    finally:
+        _finish(stop, t)
+
+    assert results.names() == ["new.txt", "old.txt"]
+    assert (tmp_path / "sub" / "new.txt.meve.json").exists()
+
+
+def test_directory_refused_by_inotify_is_polled(tmp_path: Path, monkeypatch) -> None:
+    try:
+        watch_mod._Inotify().close()
+    except (AttributeError, OSError):
+        pytest.skip("inotify unavailable")
+
+    (tmp_path / "full").mkdir()
+    real_add = watch_mod._Inotify.add
+
+    def add(self, directory: str) -> None:
+        if directory.endswith("full"):  # limite de watches atteinte
+            raise OSError(errno.ENOSPC, "No space left on device", directory)
+        real_add(self, directory)
+
+    monkeypatch.setattr(watch_mod._Inotify, "add", add)
+    results, stop, t = _start(tmp_path, recursive=True)
+    try:
+        (tmp_path / "full" / "polled.txt").write_text("p", encoding="utf-8")
+        results.wait_for("polled.txt")
+    finally:
+        _finish(stop, t)
+    assert (tmp_path / "full" / "polled.txt.meve.json").exists()
+
+    with pytest.raises(OSError):
+        watch([tmp_path], recursive=True, backend="inotify")
+
+
+def test_unknown_backend_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        watch([tmp_path], backend="kqueue")